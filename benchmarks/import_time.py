@@ -0,0 +1,94 @@
+"""Checks that importing the PyDoxyUML command line stays within a time budget
+
+The entry point is imported with 'python -X importtime' several times and the
+fastest run is compared with the budget. Modules which are only needed by a
+subcommand must not be imported at all, so 'pydoxyuml --help' and the parsing of
+arguments stay fast when the CLI is called hundreds of times by hooks.
+
+python benchmarks/import_time.py --budget-ms 60
+"""
+
+from argparse import ArgumentParser
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""str: root of the working tree whose entry point is measured"""
+ENTRY_POINT = "pydoxyuml.__main__"
+"""str: module imported by the 'pydoxyuml' console script"""
+FORBIDDEN = [
+    "pkg_resources",
+    "ast",
+    "concurrent.futures",
+    "subprocess",
+    "pickle",
+    "hashlib",
+    "xml.etree.ElementTree",
+    "pydoxyuml.documenter",
+    "pydoxyuml.generate_uml",
+    "pydoxyuml.genreate_doxy_doc",
+    "pydoxyuml.merge_docs",
+    "pydoxyuml.generate_all",
+    "pydoxyuml.generate_graph",
+    "pydoxyuml.watch",
+    "pydoxyuml.check_docs",
+]
+"""List[str]: modules the entry point must not import before a command runs"""
+
+
+def measure() -> Dict[str, Tuple[int, int]]:
+    """imports the entry point in a fresh interpreter
+
+    Returns:
+        Dict[str, Tuple[int, int]]: self and cumulative import time in
+            microseconds per imported module
+    """
+    environment = dict(os.environ, PYTHONPATH=REPOSITORY)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_POINT}"],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_time), int(cumulative))
+    return times
+
+
+def main():
+    """measures the import time and exits with 1 if the budget is exceeded"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    fastest = min(runs, key=lambda x: x[ENTRY_POINT][1])
+    total = fastest[ENTRY_POINT][1] / 1000
+    print(f"import {ENTRY_POINT}: {total:.1f}ms (budget {args.budget_ms:.1f}ms)")
+    print(f"slowest imports of the fastest of {args.repeat} runs:")
+    for name, (self_time, _) in sorted(
+        fastest.items(), key=lambda x: x[1][0], reverse=True
+    )[: args.top]:
+        print(f"  {self_time / 1000:>7.1f}ms  {name}")
+
+    failures: List[str] = [
+        f"{name} is imported by {ENTRY_POINT}" for name in FORBIDDEN if name in fastest
+    ]
+    if total > args.budget_ms:
+        failures.append(f"import time {total:.1f}ms exceeds {args.budget_ms:.1f}ms")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if len(failures) > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""Runs the PyDoxyUML benchmarks on a synthetic project and stores the results
+
+The external tools are replaced by the stub executables in benchmarks/stubs, so
+the benchmarks run offline and measure the overhead of PyDoxyUML itself.
+
+python benchmarks/run.py --modules 500 --jobs 4
+python benchmarks/run.py --compare benchmarks/results/<commit>.json
+"""
+
+from argparse import ArgumentParser
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+# benchmark the working tree this script belongs to, not an installed version
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+# pylint: disable=wrong-import-position
+from synthetic import ProjectSpec, generate_project  # noqa: E402
+from pydoxyuml.generate_all import AllDocumenter  # noqa: E402
+from pydoxyuml.generate_uml import UMLDocumenter  # noqa: E402
+from pydoxyuml.genreate_doxy_doc import DoxyDocumenter  # noqa: E402
+from pydoxyuml.merge_docs import DocsMerger  # noqa: E402
+from pydoxyuml.utils.profiling import Profiler  # noqa: E402
+
+STUBS = os.path.join(REPOSITORY, "benchmarks", "stubs")
+"""str: directory with stub executables of doxygen, doxypypy, pyreverse and dot"""
+RESULTS = os.path.join(REPOSITORY, "benchmarks", "results")
+"""str: default directory of the json results"""
+SHARDS = 4
+"""int: number of shards of the sharded docs scenario"""
+
+
+def uml_pyreverse(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """UML diagrams as png with pyreverse"""
+    return UMLDocumenter([project], output, ["png"], engine="pyreverse", **options)
+
+
+def uml_batched(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """UML diagrams as png with pyreverse calls of at most 50 files"""
+    return UMLDocumenter(
+        [project], output, ["png"], engine="pyreverse", batch_size=50, **options
+    )
+
+
+def uml_native(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """UML diagrams as puml and mmd with the native engine"""
+    return UMLDocumenter([project], output, ["puml", "mmd"], engine="native", **options)
+
+
+def uml_update(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """native UML diagrams updated after an import was added to one module"""
+    # the first run builds the import graph and is not measured
+    documenter = UMLDocumenter([project], output, ["puml"], engine="native", **options)
+    documenter()
+    graph = documenter.graph
+    modules = sorted(x for x, y in graph.files.items() if not y.endswith("__init__.py"))
+    module = next(x for x in modules if len(graph.edges.get(x, [])) > 0)
+    target = next(x for x in modules if x != module and x not in graph.edges[module])
+    # relative like the inputs, as watch mode reports changed files
+    path = graph.files[module]
+
+    def run():
+        with open(path, "r", encoding="UTF-8") as file:
+            source = file.read()
+        try:
+            with open(path, "w", encoding="UTF-8") as file:
+                file.write(f"{source}\nimport {target}\n")
+            documenter.update([path])
+        finally:
+            with open(path, "w", encoding="UTF-8") as file:
+                file.write(source)
+        if target not in graph.edges.get(module, []):
+            raise RuntimeError(f"update missed the import of {target} in {module}")
+
+    return run
+
+
+def docs_tmp(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """doxygen docs with all files converted into tmp/"""
+    return DoxyDocumenter(
+        [project], output, None, "Benchmark", None, engine="subprocess", **options
+    )
+
+
+def docs_filter(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """doxygen docs with doxypypy as input filter"""
+    return DoxyDocumenter(
+        [project], output, None, "Benchmark", None, preprocess="filter", **options
+    )
+
+
+def docs_incremental(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """second incremental doxygen run on an unchanged project"""
+    # the first run fills tmp/ and the manifest and is not measured
+    DoxyDocumenter(
+        [project],
+        output,
+        None,
+        "Benchmark",
+        None,
+        engine="subprocess",
+        incremental=True,
+        jobs=options["jobs"],
+    )()
+    return DoxyDocumenter(
+        [project],
+        output,
+        None,
+        "Benchmark",
+        None,
+        engine="subprocess",
+        incremental=True,
+        **options,
+    )
+
+
+def docs_sharded(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """doxygen docs in shards run as separate processes and merged afterwards"""
+    shards = [os.path.join(output, f"shard_{x}") for x in range(1, SHARDS + 1)]
+    environment = dict(os.environ, PYTHONPATH=REPOSITORY)
+    merger = DocsMerger(
+        shards, os.path.join(output, "docs"), profiler=options["profiler"]
+    )
+
+    def run():
+        processes = [
+            subprocess.Popen(
+                [
+                    *(sys.executable, "-m", "pydoxyuml", "generate-docs"),
+                    *("--input", project, "--output", shard, "--title", "Benchmark"),
+                    *("--engine", "subprocess", "--jobs", str(options["jobs"])),
+                    *("--shard", f"{index}/{SHARDS}"),
+                ],
+                env=environment,
+            )
+            for index, shard in enumerate(shards, 1)
+        ]
+        for process in processes:
+            if process.wait() != 0:
+                raise RuntimeError(f"shard failed: {process.args}")
+        merger()
+
+    return run
+
+
+def generate_all(project: str, output: str, options: Dict[str, Any]) -> Callable:
+    """doxygen docs and native UML diagrams concurrently"""
+    return AllDocumenter(
+        [project],
+        os.path.join(output, "docs"),
+        os.path.join(output, "uml"),
+        docs_engine="subprocess",
+        format=["puml"],
+        uml_engine="native",
+        **options,
+    )
+
+
+SCENARIOS = {
+    "uml-pyreverse": uml_pyreverse,
+    "uml-pyreverse-batched": uml_batched,
+    "uml-native": uml_native,
+    "uml-update": uml_update,
+    "docs-tmp": docs_tmp,
+    "docs-filter": docs_filter,
+    "docs-incremental-noop": docs_incremental,
+    "docs-sharded": docs_sharded,
+    "generate-all": generate_all,
+}
+"""Dict[str, Callable]: factory of the documenter per scenario. Every factory gets
+the project, the output directory and the keyword arguments jobs and profiler"""
+
+
+def run_scenario(
+    name: str, project: str, work_dir: str, jobs: int, repeat: int
+) -> Dict[str, Any]:
+    """runs a scenario several times in fresh output directories
+
+    Args:
+        name (str): key of SCENARIOS
+        project (str): relative path to the synthetic top level package
+        work_dir (str): directory for outputs
+        jobs (int): number of jobs passed to the documenter
+        repeat (int): number of runs
+
+    Returns:
+        Dict[str, Any]: wall times of all runs with their minimum and median, stages
+            and counters of the fastest run
+    """
+    runs = []
+    for run in range(repeat):
+        output = os.path.join(work_dir, f"{name}_{run}")
+        profiler = Profiler(enabled=True)
+        options = {"jobs": jobs, "profiler": profiler}
+        documenter = SCENARIOS[name](project, output, options)
+        profiler.start()
+        start = time.perf_counter()
+        documenter()
+        wall_time = time.perf_counter() - start
+        report = profiler.report()
+        runs.append((wall_time, report))
+        logging.info(f"{name} run {run}: {wall_time:.3f}s")
+
+    wall_times = [wall_time for wall_time, _ in runs]
+    _, fastest = min(runs, key=lambda x: x[0])
+    stages: Dict[str, float] = {}
+    for stage in fastest["stages"]:
+        stages[stage["name"]] = stages.get(stage["name"], 0.0) + stage["wall_time"]
+    return {
+        "wall_time": {
+            "min": min(wall_times),
+            "median": statistics.median(wall_times),
+            "runs": wall_times,
+        },
+        "stages": stages,
+        "counters": fastest["counters"],
+        "commands": fastest["commands"],
+    }
+
+
+def git_commit() -> str:
+    """commit of the benchmarked working tree
+
+    Returns:
+        str: short hash with '-dirty' suffix for uncommitted changes. 'unknown'
+            outside of a git repository
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "-C", REPOSITORY, "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "-C", REPOSITORY, "status", "--porcelain", "pydoxyuml"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if status else "")
+
+
+def compare(results: Dict[str, Any], baseline_path: str):
+    """prints the minimum wall time of every scenario next to a baseline
+
+    Args:
+        results (Dict[str, Any]): results of this run
+        baseline_path (str): path to json results of an earlier run
+    """
+    with open(baseline_path, "r", encoding="UTF-8") as file:
+        baseline = json.load(file)
+    print(f"{'scenario':<24}{baseline['commit']:>12}{results['commit']:>12}  ratio")
+    for name, scenario in results["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            continue
+        before = baseline["scenarios"][name]["wall_time"]["min"]
+        after = scenario["wall_time"]["min"]
+        print(f"{name:<24}{before:>11.3f}s{after:>11.3f}s  {after / before:.2f}x")
+
+
+def main():
+    """generates the synthetic project, runs all scenarios and writes the results"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = ProjectSpec()
+    for field, value in defaults.to_dict().items():
+        parser.add_argument(f"--{field}", type=type(value), default=value)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", type=str, help="path of the json results")
+    parser.add_argument("--compare", type=str, help="json results to compare with")
+    parser.add_argument("--log-level", type=str, default="warning")
+    args = vars(parser.parse_args())
+    logging.basicConfig(level=args.pop("log_level").upper())
+
+    spec = ProjectSpec(**{x: args[x] for x in defaults.to_dict()})
+    os.environ["PATH"] = STUBS + os.pathsep + os.environ.get("PATH", "")
+    cwd = os.getcwd()
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "spec": spec.to_dict(),
+        "jobs": args["jobs"],
+        "repeat": args["repeat"],
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="pydoxyuml_benchmark_") as directory:
+        # documenters resolve inputs and outputs relative to the working directory
+        os.chdir(directory)
+        try:
+            generate_project(directory, spec)
+            for name in args["scenarios"]:
+                results["scenarios"][name] = run_scenario(
+                    name, spec.name, "out", args["jobs"], args["repeat"]
+                )
+                wall_time = results["scenarios"][name]["wall_time"]
+                print(
+                    f"{name:<24}min {wall_time['min']:.3f}s  "
+                    + f"median {wall_time['median']:.3f}s"
+                )
+        finally:
+            os.chdir(cwd)
+
+    output = args["output"] or os.path.join(RESULTS, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="UTF-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"wrote {output}")
+    if args["compare"] is not None:
+        compare(results, args["compare"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Module provides a generator for synthetic python projects used by the benchmarks"""
+
+from dataclasses import asdict, dataclass
+import json
+import os
+import random
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class ProjectSpec:
+    """size and shape of a synthetic project"""
+
+    modules: int = 200
+    """int: number of python modules without '__init__.py' files"""
+    packages: int = 20
+    """int: number of packages the modules are distributed over"""
+    depth: int = 3
+    """int: maximum nesting depth of packages"""
+    classes: int = 5
+    """int: classes per module"""
+    methods: int = 4
+    """int: methods per class"""
+    fanout: int = 4
+    """int: imports of other local modules per module"""
+    cycles: int = 5
+    """int: additional imports closing an import cycle"""
+    seed: int = 0
+    """int: seed of the random generator. Equal specs generate equal projects"""
+    name: str = "synth"
+    """str: name of the top level package"""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """json serializable representation
+
+        Returns:
+            Dict[str, Any]: all fields of the spec
+        """
+        return asdict(self)
+
+
+def _package_paths(spec: ProjectSpec, rng: random.Random) -> List[Tuple[str, ...]]:
+    """builds a tree of packages below the top level package
+
+    Args:
+        spec (ProjectSpec): project to generate
+        rng (random.Random): random generator
+
+    Returns:
+        List[Tuple[str, ...]]: package paths like ('synth', 'pkg_3', 'pkg_7'). The
+            top level package comes first
+    """
+    packages = [(spec.name,)]
+    for index in range(max(0, spec.packages - 1)):
+        parents = [x for x in packages if len(x) <= spec.depth]
+        packages.append((*rng.choice(parents), f"pkg_{index}"))
+    return packages
+
+
+def _import_statement(module: Tuple[str, ...], target: Tuple[str, ...]) -> str:
+    """import statement of a target module in one of the supported styles
+
+    Args:
+        module (Tuple[str, ...]): importing module
+        target (Tuple[str, ...]): imported module
+
+    Returns:
+        str: relative import within a package, alternating absolute imports else
+    """
+    if module[:-1] == target[:-1]:
+        return f"from . import {target[-1]}"
+    if len(target) % 2 == 0:
+        return f"import {'.'.join(target)}"
+    return f"from {'.'.join(target[:-1])} import {target[-1]}"
+
+
+def _reference(module: Tuple[str, ...], target: Tuple[str, ...]) -> str:
+    """expression referring to a target module after it was imported
+
+    Args:
+        module (Tuple[str, ...]): importing module
+        target (Tuple[str, ...]): imported module
+
+    Returns:
+        str: name or dotted path the import statement binds
+    """
+    if module[:-1] != target[:-1] and len(target) % 2 == 0:
+        return ".".join(target)
+    return target[-1]
+
+
+def _module_source(
+    spec: ProjectSpec,
+    module: Tuple[str, ...],
+    imports: List[Tuple[str, ...]],
+    rng: random.Random,
+) -> str:
+    """source code of a module with classes documented in the google style
+
+    Args:
+        spec (ProjectSpec): project to generate
+        module (Tuple[str, ...]): module path
+        imports (List[Tuple[str, ...]]): local modules imported by this module
+        rng (random.Random): random generator
+
+    Returns:
+        str: python source code
+    """
+    lines = [f'"""Module {".".join(module)} generated for benchmarks"""', ""]
+    lines.extend(_import_statement(module, target) for target in imports)
+    lines.append("")
+    for class_index in range(spec.classes):
+        if len(imports) > 0 and rng.random() < 0.5:
+            target = rng.choice(imports)
+            base = f"{_reference(module, target)}.Class{rng.randrange(spec.classes)}"
+        else:
+            base = "object"
+        lines.extend(
+            [
+                "",
+                f"class Class{class_index}({base}):",
+                f'    """class {class_index} of {module[-1]}"""',
+                "",
+                "    def __init__(self, value: int = 0) -> None:",
+                "        self.value = value",
+                '        """int: stored value"""',
+                "        self.items = []",
+            ]
+        )
+        for method_index in range(spec.methods):
+            lines.extend(
+                [
+                    "",
+                    f"    def method_{method_index}(self, factor: int) -> int:",
+                    f'        """multiplies the value by {method_index}',
+                    "",
+                    "        Args:",
+                    "            factor (int): additional factor",
+                    "",
+                    "        Returns:",
+                    "            int: product",
+                    '        """',
+                    f"        return self.value * factor * {method_index}",
+                ]
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_project(directory: str, spec: ProjectSpec) -> str:
+    """writes a synthetic project into a directory
+
+    Modules only import modules created before them, so the import graph is
+    acyclic apart from the spec.cycles imports added on top.
+
+    Args:
+        directory (str): directory the top level package is created in
+        spec (ProjectSpec): size and shape of the project
+
+    Returns:
+        str: path to the top level package
+    """
+    rng = random.Random(spec.seed)
+    packages = _package_paths(spec, rng)
+    modules = [
+        (*packages[index % len(packages)], f"mod_{index}")
+        for index in range(spec.modules)
+    ]
+    imports: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+    for index, module in enumerate(modules):
+        candidates = modules[:index]
+        imports[module] = rng.sample(candidates, min(spec.fanout, len(candidates)))
+    for _ in range(spec.cycles if len(modules) > 1 else 0):
+        first, second = sorted(rng.sample(range(len(modules)), 2))
+        imports[modules[second]].append(modules[first])
+        imports[modules[first]].append(modules[second])
+
+    for package in packages:
+        path = os.path.join(directory, *package)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "__init__.py"), "w", encoding="UTF-8") as file:
+            file.write(f'"""Package {".".join(package)}"""\n')
+    for module in modules:
+        source = _module_source(spec, module, list(dict.fromkeys(imports[module])), rng)
+        path = os.path.join(directory, *module) + ".py"
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(source)
+
+    with open(
+        os.path.join(directory, "project.json"), "w", encoding="UTF-8"
+    ) as file:
+        json.dump(spec.to_dict(), file, indent=2)
+    return os.path.join(directory, spec.name)
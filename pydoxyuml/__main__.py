@@ -3,24 +3,53 @@
 Either to create doxygen documentation
 pydoxyuml generate-docs --input ./my_project --output ./docs
 
+Or to split the doxygen documentation into shards and merge them afterwards
+pydoxyuml generate-docs --input ./my_project --output ./shard_1 --shard 1/2
+pydoxyuml generate-docs --input ./my_project --output ./shard_2 --shard 2/2
+pydoxyuml merge --input ./shard_1 ./shard_2 --output ./docs
+
 Or to create UML diagrams
 pydoxyuml generate-uml --input ./my_project --output ./uml_diagrams
 
+Or to create both at once
+pydoxyuml generate-all --input ./my_project --docs-output ./docs --uml-output ./uml
+
+Or to regenerate both whenever a file changes
+pydoxyuml watch --input ./my_project --docs-output ./docs --uml-output ./uml
+
+Or to export the import graph with metrics
+pydoxyuml graph --input ./my_project --output ./graph --format json graphml
+
+Or to check the docstrings before generating docs
+pydoxyuml check-docs --input ./my_project --fail-under 80
+
 """
 
 from argparse import ArgumentParser
+import importlib
 import sys
 
-from pydoxyuml.generate_uml import UMLDocumenter
-from pydoxyuml.genreate_doxy_doc import DoxyDocumenter
 from pydoxyuml.utils.logging import set_log_level
 from pydoxyuml.utils.parser import setup_parser
 
 
+COMMANDS = {
+    "generate-docs": ("pydoxyuml.genreate_doxy_doc", "DoxyDocumenter"),
+    "merge": ("pydoxyuml.merge_docs", "DocsMerger"),
+    "generate-uml": ("pydoxyuml.generate_uml", "UMLDocumenter"),
+    "generate-all": ("pydoxyuml.generate_all", "AllDocumenter"),
+    "watch": ("pydoxyuml.watch", "Watcher"),
+    "graph": ("pydoxyuml.generate_graph", "GraphDocumenter"),
+    "check-docs": ("pydoxyuml.check_docs", "DocChecker"),
+}
+"""Dict[str, Tuple[str, str]]: module and class implementing every command. Only
+the module of the called command is imported, which keeps '--help' fast"""
+
+
 def main():
     """main function
 
-    Calls either DoxygenDocumenter or UMLDocumenter
+    Calls the documenter of the given command
     """
     parser = ArgumentParser(
         description="PyDoxyUML - Collect Python code documentation and generate\
@@ -29,17 +58,39 @@ def main():
     parser = setup_parser(parser)
 
     args_dict = vars(parser.parse_args())
-    set_log_level(args_dict.pop("log_level"))
     command = args_dict.pop("command")
-    if command == "generate-docs":
-        generator = DoxyDocumenter(**args_dict)
-    elif command == "generate-uml":
-        generator = UMLDocumenter(**args_dict)
-    else:
+    if command not in COMMANDS:
         parser.print_help()
         sys.exit()
+    if command == "watch":
+        if args_dict["docs_output"] is None and args_dict["uml_output"] is None:
+            parser.error("watch requires --docs-output and/or --uml-output")
+
+    # pylint: disable=import-outside-toplevel
+    from pydoxyuml.utils.profiling import Profiler
+
+    set_log_level(args_dict.pop("log_level"))
+    profile = args_dict.pop("profile")
+    profile_path = args_dict.pop("profile_output")
+    profiler = Profiler(profile, args_dict.pop("cprofile"))
+    module_name, class_name = COMMANDS[command]
+    documenter_class = getattr(importlib.import_module(module_name), class_name)
+    generator = documenter_class(**args_dict, profiler=profiler)
 
-    generator()
+    profiler.start()
+    try:
+        generator()
+        if command == "graph":
+            print(generator.report())
+        elif command == "check-docs":
+            if generator.report_path is None:
+                print(generator.report(), end="")
+            if not generator.passed:
+                sys.exit(1)
+    finally:
+        profiler.stop()
+        if profile:
+            profiler.write_report(profile_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+"""Module provides a python API to generate documentation without the command line
+
+from pydoxyuml.api import Session
+
+session = Session(base_dir="/path/to/project")
+result = session.generate_uml(["my_package"], "uml", format=["puml"])
+print(result.files, result.errors, result.cycles)
+"""
+
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from pydoxyuml.documenter import Documenter
+from pydoxyuml.generate_uml import UMLDocumenter
+from pydoxyuml.genreate_doxy_doc import DoxyDocumenter
+from pydoxyuml.utils.cache import SourceCache, file_signature
+from pydoxyuml.utils.profiling import Profiler
+
+
+@dataclass
+class Result:
+    """outcome of a documenter call"""
+
+    output: str
+    """str: absolute path to the output directory"""
+    files: List[str] = field(default_factory=list)
+    """List[str]: files written or updated in the output directory"""
+    errors: List[str] = field(default_factory=list)
+    """List[str]: failed conversions, commands or diagrams"""
+    wall_time: float = 0.0
+    """float: duration of the call in seconds"""
+    stages: Dict[str, float] = field(default_factory=dict)
+    """Dict[str, float]: accumulated wall time per stage"""
+    counters: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: counted items like python files or parsed files"""
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if nothing failed"""
+        return len(self.errors) == 0
+
+
+@dataclass
+class DocsResult(Result):
+    """outcome of generating doxygen documentation"""
+
+
+@dataclass
+class UMLResult(Result):
+    """outcome of generating UML diagrams"""
+
+    modules: Dict[str, str] = field(default_factory=dict)
+    """Dict[str, str]: file path per module of the import graph"""
+    imports: Dict[str, List[str]] = field(default_factory=dict)
+    """Dict[str, List[str]]: imported local modules per module"""
+    cycles: List[List[str]] = field(default_factory=list)
+    """List[List[str]]: groups of modules importing each other"""
+
+
+class Session:
+    """generates documentation in a long-running process
+
+    A session keeps the parsed sources between calls, so a later call on a
+    partly changed project only parses the changed files. Calls are independent
+    of the working directory of the process and can run concurrently from several
+    threads as long as they write to different output directories.
+    """
+
+    def __init__(
+        self, base_dir: Union[None, str] = None, cache_dir: Union[None, str] = None
+    ) -> None:
+        self._base_dir = os.path.abspath(os.getcwd() if base_dir is None else base_dir)
+        """str: directory relative inputs and outputs are resolved against"""
+        self._cache = SourceCache(cache_dir)
+        """SourceCache: parsed files shared by all calls of this session"""
+        self._outputs: Dict[str, threading.Lock] = {}
+        """Dict[str, threading.Lock]: serializes calls writing into the same output"""
+        self._lock = threading.Lock()
+
+    def generate_docs(
+        self, input: Iterable[str], output: str, **options: Any
+    ) -> DocsResult:
+        """generates doxygen documentation
+
+        Args:
+            input (Iterable[str]): input root directories
+            output (str): output directory
+            **options: further arguments of DoxyDocumenter like doxyfile, title,
+                style_sheet, jobs, incremental or preprocess
+
+        Returns:
+            DocsResult: written files, errors and timings
+        """
+        options.setdefault("doxyfile", None)
+        options.setdefault("title", "Example Project")
+        options.setdefault("style_sheet", None)
+        documenter = DoxyDocumenter(
+            list(input),
+            output,
+            profiler=Profiler(enabled=True),
+            base_dir=self._base_dir,
+            **options,
+        )
+        return self._run(documenter, DocsResult)
+
+    def generate_uml(
+        self,
+        input: Iterable[str],
+        output: str,
+        format: Union[str, List[str]] = "png",
+        **options: Any,
+    ) -> UMLResult:
+        """generates UML diagrams
+
+        Args:
+            input (Iterable[str]): input root directories
+            output (str): output directory
+            format (Union[str, List[str]], optional): output formats.
+                Defaults to "png".
+            **options: further arguments of UMLDocumenter like engine, colorized,
+                recursion_depth or jobs
+
+        Returns:
+            UMLResult: written files, errors, timings and the import graph
+        """
+        documenter = UMLDocumenter(
+            list(input),
+            output,
+            format,
+            profiler=Profiler(enabled=True),
+            cache=self._cache,
+            base_dir=self._base_dir,
+            **options,
+        )
+        result = self._run(documenter, UMLResult)
+        graph = documenter.graph
+        result.modules = dict(graph.files)
+        result.imports = {module: list(edges) for module, edges in graph.edges.items()}
+        result.cycles = graph.cycles()
+        return result
+
+    def save(self):
+        """persists the parsed sources if the session has a cache directory"""
+        self._cache.save()
+
+    def _run(self, documenter: Documenter, result_type: type) -> Any:
+        """calls a documenter and collects its result
+
+        Args:
+            documenter (Documenter): documenter to call
+            result_type (type): Result subclass to create
+
+        Returns:
+            Any: instance of result_type
+        """
+        output = documenter.output
+        profiler = documenter.profiler
+        with self._lock:
+            lock = self._outputs.setdefault(output, threading.Lock())
+
+        with lock:
+            before = file_times(output)
+            profiler.start()
+            start = time.perf_counter()
+            errors = []
+            try:
+                documenter()
+            except Exception as exception:  # pylint: disable=broad-except
+                errors.append(f"{type(exception).__name__}: {exception}")
+            finally:
+                profiler.stop()
+            wall_time = time.perf_counter() - start
+            after = file_times(output)
+
+        report = profiler.report()
+        stages: Dict[str, float] = {}
+        for stage in report["stages"]:
+            stages[stage["name"]] = stages.get(stage["name"], 0.0) + stage["wall_time"]
+        return result_type(
+            output=output,
+            files=sorted(x for x, y in after.items() if before.get(x) != y),
+            errors=[*documenter.errors, *errors],
+            wall_time=wall_time,
+            stages=stages,
+            counters=report["counters"],
+        )
+
+
+def file_times(directory: str) -> Dict[str, Tuple[int, int]]:
+    """signatures of all files in a directory
+
+    Args:
+        directory (str): directory to search recursively
+
+    Returns:
+        Dict[str, Tuple[int, int]]: modification time and size per file path
+    """
+    times = {}
+    for path, _, names in os.walk(directory):
+        for name in names:
+            file = os.path.join(path, name)
+            try:
+                times[file] = file_signature(file)
+            except OSError:
+                continue
+    return times
+
+
+def generate_docs(
+    input: Iterable[str], output: str, base_dir: Union[None, str] = None, **options
+) -> DocsResult:
+    """generates doxygen documentation in a new session
+
+    Args:
+        input (Iterable[str]): input root directories
+        output (str): output directory
+        base_dir (Union[None, str], optional): directory relative paths are
+            resolved against. Defaults to the working directory.
+        **options: further arguments of DoxyDocumenter
+
+    Returns:
+        DocsResult: written files, errors and timings
+    """
+    return Session(base_dir).generate_docs(input, output, **options)
+
+
+def generate_uml(
+    input: Iterable[str], output: str, base_dir: Union[None, str] = None, **options
+) -> UMLResult:
+    """generates UML diagrams in a new session
+
+    Args:
+        input (Iterable[str]): input root directories
+        output (str): output directory
+        base_dir (Union[None, str], optional): directory relative paths are
+            resolved against. Defaults to the working directory.
+        **options: further arguments of UMLDocumenter like format or engine
+
+    Returns:
+        UMLResult: written files, errors, timings and the import graph
+    """
+    return Session(base_dir).generate_uml(input, output, **options)
@@ -0,0 +1,397 @@
+"""Module provides a docstring coverage and validation check based on the syntax tree"""
+
+import ast
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from pydoxyuml.documenter import Documenter
+from pydoxyuml.native_uml import dotted_name
+from pydoxyuml.utils.cache import SourceCache
+from pydoxyuml.utils.discovery import SourceIndex
+from pydoxyuml.utils.profiling import Profiler
+
+
+EXTRACTOR_NAME = "docstrings"
+"""str: cache key of the results of collect_docstrings"""
+PLACEHOLDERS = ["_description_", "_summary_"]
+"""List[str]: texts editor templates insert for the author to replace"""
+SECTION = re.compile(
+    r"^(\s*)(Args|Arguments|Attributes|Example|Examples|Note|Notes|Raises|"
+    + r"References|Returns|Return|See Also|Todo|Warning|Warnings|Yields|Yield):\s*$"
+)
+"""Pattern: header of a section of a google style docstring"""
+ARGUMENT = re.compile(r"^\s*(\*{0,2}\w+)\s*(\(.*\))?\s*:")
+"""Pattern: 'name (type): description' entry of an Args section"""
+REPORT_FORMATS = ["text", "json"]
+"""List[str]: formats of the coverage report"""
+
+
+def documented_arguments(docstring: str) -> Union[None, List[str]]:
+    """names listed in the Args section of a google style docstring
+
+    Args:
+        docstring (str): cleaned docstring
+
+    Returns:
+        Union[None, List[str]]: argument names without leading '*'. None if the
+            docstring has no Args section
+    """
+    lines = docstring.splitlines()
+    for start, line in enumerate(lines):
+        header = SECTION.match(line)
+        if header is not None and header.group(2) in ("Args", "Arguments"):
+            break
+    else:
+        return None
+
+    names = []
+    entry_indent = None
+    for line in lines[start + 1 :]:
+        if len(line.strip()) == 0:
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent <= len(header.group(1)):
+            break
+        if entry_indent is None:
+            entry_indent = indent
+        entry = ARGUMENT.match(line)
+        # deeper indented lines continue the description of an entry
+        if indent == entry_indent and entry is not None:
+            names.append(entry.group(1).lstrip("*"))
+    return names
+
+
+def signature_arguments(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef], method: bool
+) -> List[str]:
+    """argument names of a function which have to be documented
+
+    Args:
+        node (Union[ast.FunctionDef, ast.AsyncFunctionDef]): function definition
+        method (bool): function is defined in a class body
+
+    Returns:
+        List[str]: argument names without 'self' and 'cls'
+    """
+    arguments = node.args
+    # positional-only arguments exist since python 3.8
+    positional = getattr(arguments, "posonlyargs", [])
+    names = [x.arg for x in [*positional, *arguments.args]]
+    decorators = {dotted_name(x) for x in node.decorator_list}
+    if method and "staticmethod" not in decorators and len(names) > 0:
+        names = names[1:]
+    names.extend(x.arg for x in arguments.kwonlyargs)
+    names.extend(x.arg for x in [arguments.vararg, arguments.kwarg] if x is not None)
+    return names
+
+
+def _docstring_issues(
+    docstring: Union[None, str],
+    node: Union[None, ast.FunctionDef, ast.AsyncFunctionDef],
+    method: bool,
+) -> List[str]:
+    """problems of a docstring
+
+    Args:
+        docstring (Union[None, str]): cleaned docstring
+        node (Union[None, ast.FunctionDef, ast.AsyncFunctionDef]): function the
+            docstring belongs to. None for modules and classes
+        method (bool): function is defined in a class body
+
+    Returns:
+        List[str]: human readable issues
+    """
+    if docstring is None:
+        return ["missing docstring"]
+    issues = [f"placeholder '{x}'" for x in PLACEHOLDERS if x in docstring]
+    if node is None:
+        return issues
+    decorators = {
+        (dotted_name(x) or "").split(".")[-1] for x in node.decorator_list
+    }
+    if decorators & {"property", "setter", "deleter", "overload"}:
+        return issues
+    expected = signature_arguments(node, method)
+    documented = documented_arguments(docstring) or []
+    undocumented = [x for x in expected if x not in documented]
+    unknown = [x for x in documented if x not in expected]
+    if len(undocumented) > 0:
+        issues.append(f"arguments not documented: {', '.join(undocumented)}")
+    if len(unknown) > 0:
+        issues.append(f"documented arguments not in signature: {', '.join(unknown)}")
+    return issues
+
+
+def collect_docstrings(tree: ast.Module) -> List[Dict[str, Any]]:
+    """checks the docstrings of a module, its classes, functions and methods
+
+    Nested functions and dunder methods other than '__init__' are skipped.
+    '__init__' is public if its class is, as it documents the constructor
+    arguments.
+
+    Args:
+        tree (ast.Module): parsed python file
+
+    Returns:
+        List[Dict[str, Any]]: one entry per definition with kind, qualified name,
+            line, whether it is public and its issues. The module comes first
+    """
+    definitions = [
+        {
+            "kind": "module",
+            "name": "",
+            "line": 1,
+            "public": True,
+            "issues": _docstring_issues(ast.get_docstring(tree), None, False),
+        }
+    ]
+    pending: List[Tuple[ast.AST, str, bool]] = [(tree, "", True)]
+    while len(pending) > 0:
+        parent, prefix, public = pending.pop()
+        for node in ast.iter_child_nodes(parent):
+            if not isinstance(
+                node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                continue
+            constructor = node.name == "__init__"
+            if node.name.startswith("__") and node.name.endswith("__"):
+                if not constructor:
+                    continue
+            method = isinstance(parent, ast.ClassDef)
+            is_class = isinstance(node, ast.ClassDef)
+            definitions.append(
+                {
+                    "kind": "class" if is_class else "method" if method else "function",
+                    "name": prefix + node.name,
+                    "line": node.lineno,
+                    "public": public
+                    and (constructor or not node.name.startswith("_")),
+                    "issues": _docstring_issues(
+                        ast.get_docstring(node), None if is_class else node, method
+                    ),
+                }
+            )
+            if is_class:
+                pending.append(
+                    (node, f"{prefix}{node.name}.", definitions[-1]["public"])
+                )
+    return sorted(definitions, key=lambda x: x["line"])
+
+
+def check_file(path: str) -> Tuple[Union[None, List[Dict[str, Any]]], str]:
+    """parses and checks a file, executed in worker processes
+
+    Args:
+        path (str): path to python file
+
+    Returns:
+        Tuple[Union[None, List[Dict[str, Any]]], str]: result of
+            collect_docstrings and an empty string or None and the reason the
+            file could not be parsed
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            tree = ast.parse(file.read(), path)
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as error:
+        return None, f"{type(error).__name__}: {error}"
+    return collect_docstrings(tree), ""
+
+
+class DocChecker(Documenter):
+    """computes docstring coverage and validates google style docstrings on call
+
+    A definition counts as documented if it has a docstring without placeholders
+    whose Args section lists exactly the arguments of the signature.
+    """
+
+    def __init__(
+        self,
+        input: Iterable[str],
+        output: Union[None, str] = None,
+        format: str = "text",
+        fail_under: Union[None, float] = None,
+        include_private: bool = False,
+        cache_dir: Union[None, str] = None,
+        jobs: int = 1,
+        profiler: Union[None, Profiler] = None,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        index: Union[None, SourceIndex] = None,
+        cache: Union[None, SourceCache] = None,
+        base_dir: Union[None, str] = None,
+    ) -> None:
+        super().__init__(
+            input,
+            os.curdir if output is None else os.path.dirname(output) or os.curdir,
+            jobs,
+            profiler=profiler,
+            exclude=exclude,
+            gitignore=gitignore,
+            index=index,
+            base_dir=base_dir,
+        )
+        self._report_path = (
+            None if output is None else os.path.join(self._current_dir, output)
+        )
+        """Union[None, str]: file the report is written to. None -> not written"""
+        self._format = format
+        """str: format of the report, one of REPORT_FORMATS"""
+        self._fail_under = fail_under
+        """Union[None, float]: minimum coverage in percent"""
+        self._include_private = include_private
+        """bool: also check definitions starting with '_'"""
+        self._cache = SourceCache(cache_dir) if cache is None else cache
+        """SourceCache: check results per file content"""
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+        """Dict[str, List[Dict[str, Any]]]: checked definitions per file"""
+
+    def __call__(self, *args: Any, **kwds: Any) -> None:
+        """checks all files of the inputs and writes the report"""
+        self._errors = []
+        files = self._source_index().all_files()
+        with self._profiler.stage("docstring check"):
+            self._results = self._check(files)
+        self._cache.save()
+        self._profiler.count("checked_files", len(self._results))
+        summary = self.summary()
+        logging.info(
+            f"docstring coverage {summary['coverage']:.1f}% of "
+            + f"{summary['total']} definitions"
+        )
+        if self._report_path is not None:
+            self._create_directory(os.path.dirname(self._report_path))
+            with open(self._report_path, "w", encoding="UTF-8") as file:
+                file.write(self.report())
+            logging.info(f"wrote {self._report_path}")
+
+    @property
+    def passed(self) -> bool:
+        """bool: True if the coverage reaches fail_under"""
+        return self.summary()["passed"]
+
+    @property
+    def report_path(self) -> Union[None, str]:
+        """Union[None, str]: file the report is written to"""
+        return self._report_path
+
+    def summary(self) -> Dict[str, Any]:
+        """counts of the last call
+
+        Returns:
+            Dict[str, Any]: total, documented, missing and incomplete definitions,
+                coverage in percent and the checked definitions with issues per file
+        """
+        total = missing = incomplete = 0
+        files: Dict[str, List[Dict[str, Any]]] = {}
+        for path, definitions in self._results.items():
+            for definition in definitions:
+                if not self._checked(path, definition):
+                    continue
+                total += 1
+                if len(definition["issues"]) == 0:
+                    continue
+                if definition["issues"] == ["missing docstring"]:
+                    missing += 1
+                else:
+                    incomplete += 1
+                files.setdefault(path, []).append(definition)
+        documented = total - missing - incomplete
+        coverage = 100.0 if total == 0 else 100.0 * documented / total
+        return {
+            "coverage": coverage,
+            "total": total,
+            "documented": documented,
+            "missing": missing,
+            "incomplete": incomplete,
+            "fail_under": self._fail_under,
+            "passed": self._fail_under is None or coverage >= self._fail_under,
+            "errors": self._errors,
+            "files": files,
+        }
+
+    def report(self) -> str:
+        """formats the report of the last call
+
+        Returns:
+            str: issues per definition and the coverage as text or json
+        """
+        summary = self.summary()
+        if self._format == "json":
+            return json.dumps(summary, indent=2) + "\n"
+        lines = []
+        for path, definitions in summary["files"].items():
+            for definition in definitions:
+                name = definition["name"] or os.path.basename(path)
+                for issue in definition["issues"]:
+                    lines.append(
+                        f"{path}:{definition['line']}: {definition['kind']} "
+                        + f"{name}: {issue}"
+                    )
+        lines.extend(f"error: {x}" for x in summary["errors"])
+        lines.append(
+            f"docstring coverage: {summary['coverage']:.1f}% "
+            + f"({summary['documented']}/{summary['total']} documented, "
+            + f"{summary['missing']} missing, {summary['incomplete']} incomplete)"
+        )
+        if self._fail_under is not None:
+            status = "passed" if summary["passed"] else "failed"
+            lines.append(f"required coverage {self._fail_under:.1f}%: {status}")
+        return "\n".join(lines) + "\n"
+
+    def _checked(self, path: str, definition: Dict[str, Any]) -> bool:
+        """decides if a definition counts towards the coverage
+
+        Args:
+            path (str): file the definition belongs to
+            definition (Dict[str, Any]): entry of collect_docstrings
+
+        Returns:
+            bool: True for public definitions of public modules or if private
+                definitions are included
+        """
+        if self._include_private:
+            return True
+        name = os.path.basename(path)
+        private_module = name.startswith("_") and name not in (
+            "__init__.py",
+            "__main__.py",
+        )
+        return definition["public"] and not private_module
+
+    def _check(self, files: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """checks files, parsing only those whose content is not cached
+
+        Args:
+            files (List[str]): python files
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: checked definitions per file
+        """
+        results = {}
+        misses = []
+        for path in files:
+            found, result = self._cache.lookup(path, EXTRACTOR_NAME)
+            if found:
+                results[path] = result
+            else:
+                misses.append(path)
+        self._profiler.count("parsed_files", len(misses))
+
+        if self._jobs > 1 and len(misses) > 1:
+            with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+                chunksize = max(1, len(misses) // (4 * self._jobs))
+                checked = list(executor.map(check_file, misses, chunksize=chunksize))
+        else:
+            checked = list(map(check_file, misses))
+
+        for path, (result, error) in zip(misses, checked):
+            if result is None:
+                self._error(f"cannot check {path}: {error}")
+                continue
+            self._cache.store(path, EXTRACTOR_NAME, result)
+            results[path] = result
+        return {path: results[path] for path in files if path in results}
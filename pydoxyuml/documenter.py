@@ -1,9 +1,209 @@
 """Module provides a base abstract class for a documenter"""
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import logging
 import os
-from typing import Any, List
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+from typing import Any, Iterable, List, Union
 
+from pydoxyuml.doxyfile import Doxyfile
+from pydoxyuml.utils.discovery import SourceIndex, discover_sources
+from pydoxyuml.utils.profiling import Profiler
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on windows
+    resource = None
+
+
+@dataclass
+class CommandResult:
+    """outcome of a command executed by the CommandRunner"""
+
+    command: List[str]
+    """List[str]: executed command as argument list"""
+    returncode: int
+    """int: exit code. Negative if killed by a signal, -1 if it could not start"""
+    stdout: str = ""
+    """str: captured standard output. Empty if redirected into a file"""
+    stderr: str = ""
+    """str: captured standard error"""
+    wall_time: float = 0.0
+    """float: elapsed time in seconds"""
+    cpu_time: float = 0.0
+    """float: user + system time of child processes in seconds. Approximate if
+    several commands run concurrently"""
+    timed_out: bool = False
+    """bool: command was killed because it exceeded its timeout"""
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the command exited with code 0"""
+        return self.returncode == 0 and not self.timed_out
+
+    def error_message(self) -> str:
+        """short description why the command failed
+
+        Returns:
+            str: last line of stderr, timeout or exit code
+        """
+        if self.timed_out:
+            return f"timed out after {self.wall_time:.1f}s"
+        lines = self.stderr.strip().splitlines()
+        if len(lines) > 0:
+            return lines[-1]
+        return f"exit code {self.returncode}"
+
+
+class CommandError(RuntimeError):
+    """raised by CommandRunner.run if a checked command fails"""
+
+    def __init__(self, result: CommandResult) -> None:
+        super().__init__(f"'{result.command[0]}' failed: {result.error_message()}")
+        self.result = result
+        """CommandResult: result of the failed command"""
+
+
+@dataclass
+class CommandRunner:
+    """executes commands without a shell and records their resource usage"""
+
+    timeout: Union[None, float] = None
+    """Union[None, float]: default timeout in seconds. None -> wait forever"""
+    max_workers: int = 1
+    """int: number of submitted commands running concurrently"""
+    history: List[CommandResult] = field(default_factory=list)
+    """List[CommandResult]: results of all executed commands"""
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Union[None, ThreadPoolExecutor] = None
+
+    def run(
+        self,
+        command: List[str],
+        timeout: Union[None, float] = None,
+        stdout_path: Union[None, str] = None,
+        check: bool = False,
+    ) -> CommandResult:
+        """executes a command and waits for it
+
+        Args:
+            command (List[str]): executable and its arguments
+            timeout (Union[None, float], optional): timeout in seconds. Defaults to
+                the timeout of the runner.
+            stdout_path (Union[None, str], optional): write stdout into this file
+                instead of capturing it. Defaults to None.
+            check (bool, optional): raise CommandError if the command failed.
+                Defaults to False.
+
+        Raises:
+            CommandError: command failed and check is set
+
+        Returns:
+            CommandResult: exit code, output and timings
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            # quoting every argument is only worth it if the command is logged
+            logging.debug(
+                "%s%s",
+                " ".join(map(shlex.quote, command)),
+                "" if stdout_path is None else f" > {stdout_path}",
+            )
+        cpu_start = self._children_cpu_time()
+        start = time.perf_counter()
+        result = CommandResult(command, -1)
+        try:
+            if stdout_path is None:
+                result = self._communicate(command, subprocess.PIPE, timeout)
+            else:
+                with open(stdout_path, "w", encoding="UTF-8") as file:
+                    result = self._communicate(command, file, timeout)
+        except OSError as error:
+            result.stderr = str(error)
+        result.wall_time = time.perf_counter() - start
+        result.cpu_time = self._children_cpu_time() - cpu_start
+
+        with self._lock:
+            self.history.append(result)
+        logging.debug(
+            f"{command[0]} finished with {result.returncode} after "
+            + f"{result.wall_time:.3f}s wall / {result.cpu_time:.3f}s cpu"
+        )
+        if check and not result.ok:
+            raise CommandError(result)
+        return result
+
+    def submit(self, command: List[str], **kwargs: Any) -> "Future[CommandResult]":
+        """executes a command in the background
+
+        At most max_workers submitted commands run at the same time.
+
+        Args:
+            command (List[str]): executable and its arguments
+            **kwargs: keyword arguments of run
+
+        Returns:
+            Future[CommandResult]: future of the command result
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            executor = self._executor
+        return executor.submit(self.run, command, **kwargs)
+
+    def shutdown(self):
+        """waits for all submitted commands and releases the worker threads"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _communicate(
+        command: List[str], stdout: Any, timeout: Union[None, float]
+    ) -> CommandResult:
+        """starts a process and collects its output
+
+        Args:
+            command (List[str]): executable and its arguments
+            stdout (Any): subprocess.PIPE or an open file
+            timeout (Union[None, float]): timeout in seconds
+
+        Returns:
+            CommandResult: exit code and output without timings
+        """
+        with subprocess.Popen(
+            command, stdout=stdout, stderr=subprocess.PIPE, universal_newlines=True
+        ) as process:
+            try:
+                out, err = process.communicate(timeout=timeout)
+                timed_out = False
+            except subprocess.TimeoutExpired:
+                process.kill()
+                out, err = process.communicate()
+                timed_out = True
+        return CommandResult(
+            command, process.returncode, out or "", err or "", timed_out=timed_out
+        )
+
+    @staticmethod
+    def _children_cpu_time() -> float:
+        """user + system time of all terminated child processes
+
+        Returns:
+            float: cpu time in seconds. 0 if not available on this platform
+        """
+        if resource is None:
+            return 0.0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
 
 
 class Documenter(ABC):
@@ -12,39 +212,110 @@ class Documenter(ABC):
     provides common functionalities such as:
      - _create_directory
      - _create_directories
+     - _remove_directory
+     - _copy
      - _execute_command
+     - _source_index
 
     """
 
-    def __init__(self, input: List[str], output: str) -> None:
+    def __init__(
+        self,
+        input: List[str],
+        output: str,
+        jobs: int = 1,
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        index: Union[None, SourceIndex] = None,
+        base_dir: Union[None, str] = None,
+    ) -> None:
         super().__init__()
 
-        self._current_dir = os.getcwd().rstrip("/") + "/"
-        """str: absolute path to where the module was called"""
-        self._input = input
+        self._current_dir = (
+            os.path.abspath(os.getcwd() if base_dir is None else base_dir).rstrip("/")
+            + "/"
+        )
+        """str: absolute path inputs and output are relative to. Defaults to where
+        the module was called"""
+        self._input = (
+            input
+            if base_dir is None
+            else [os.path.join(self._current_dir, path) for path in input]
+        )
         """List[str]: list of input module root directories"""
-        self._output = self._current_dir + output.rstrip("/") + "/"
+        self._output = os.path.join(self._current_dir, output).rstrip("/") + "/"
         """str: absolute path to directory where to store documentation.
         Format <path_to_directory>/"""
+        self._jobs = max(1, jobs)
+        """int: number of tasks running concurrently"""
+        self._runner = CommandRunner(timeout=timeout, max_workers=self._jobs)
+        """CommandRunner: executes all external commands"""
+        self._profiler = Profiler() if profiler is None else profiler
+        """Profiler: records duration of stages and counters"""
+        self._profiler.add_runner(self._runner)
+        self._exclude = list(exclude)
+        """List[str]: globs of files and directories to skip during discovery"""
+        self._gitignore = gitignore
+        """bool: skip files and directories ignored by .gitignore files"""
+        self._index = index
+        """Union[None, SourceIndex]: python sources of all inputs. None -> not
+        discovered yet"""
+        self._errors: List[str] = []
+        """List[str]: errors of the last call"""
 
     @abstractmethod
     def __call__(self, *args: Any, **kwds: Any) -> Any:
         pass
 
+    @property
+    def output(self) -> str:
+        """str: absolute path to the output directory ending with '/'"""
+        return self._output
+
+    @property
+    def profiler(self) -> Profiler:
+        """Profiler: records duration of stages and counters"""
+        return self._profiler
+
+    @property
+    def errors(self) -> List[str]:
+        """List[str]: errors of the last call like failed conversions or commands"""
+        return list(self._errors)
+
+    def _error(self, message: str):
+        """logs an error and keeps it for the errors of this call
+
+        Args:
+            message (str): description of the error
+        """
+        logging.error(message)
+        self._errors.append(message)
+
     def _create_directory(self, directory: str):
         """creates output directory"""
-        command = f"mkdir -p {directory}"
-        self._execute_command(command)
+        logging.debug(f"create directory {directory}")
+        os.makedirs(directory, exist_ok=True)
 
     def _create_directories(self, directories: List[str]):
         """creates a bunch of given directories
 
         Args:
-            directories (List[str]): _description_
+            directories (List[str]): paths of the directories to create
         """
         for directory in directories:
             self._create_directory(directory)
 
+    def _remove_directory(self, directory: str):
+        """removes a directory with all its content
+
+        Args:
+            directory (str): path to directory
+        """
+        logging.debug(f"remove directory {directory}")
+        shutil.rmtree(directory, ignore_errors=True)
+
     def _copy(self, source: str, destination: str):
         """copies file form source to destination
 
@@ -52,15 +323,77 @@ class Documenter(ABC):
             source (str): path to source file
             destination (str): path to destination
         """
-        command = f"cp {source} {destination}"
-        self._execute_command(command)
+        logging.debug(f"copy {source} to {destination}")
+        shutil.copy(source, destination)
 
-    @staticmethod
-    def _execute_command(command: str):
+    def _execute_command(
+        self, command: Union[str, List[str]], check: bool = False
+    ) -> CommandResult:
         """executes given command on hostsystem
 
         Args:
-            command (str): command in string format like: 'cd ~'
+            command (Union[str, List[str]]): command as argument list like
+                ['doxygen', 'Doxyfile']. Strings are split like a shell would.
+            check (bool, optional): raise CommandError if the command failed.
+                Defaults to False.
+
+        Returns:
+            CommandResult: exit code, output and timings of the command
         """
-        logging.debug(command)
-        os.system(command)
+        if isinstance(command, str):
+            command = shlex.split(command)
+        return self._runner.run(command, check=check)
+
+    def _run_doxygen(self, doxyfile: Doxyfile) -> CommandResult:
+        """writes the Doxyfile into the output directory and runs doxygen on it
+
+        A failed run is recorded as error. The warnings of doxygen are logged on
+        debug level.
+
+        Args:
+            doxyfile (Doxyfile): configuration doxygen runs with
+
+        Returns:
+            CommandResult: result of the doxygen run
+        """
+        doxyfile.write(self._output + "Doxyfile")
+        result = self._execute_command(["doxygen", self._output + "Doxyfile"])
+        if not result.ok:
+            self._error(f"doxygen failed: {result.error_message()}")
+        for line in result.stderr.splitlines():
+            logging.debug(line)
+        return result
+
+    def refresh(self):
+        """forgets the discovered sources, so the next call walks the inputs again"""
+        self._index = None
+
+    def _source_index(self) -> SourceIndex:
+        """discovers the python sources of all inputs once per documenter
+
+        Returns:
+            SourceIndex: python files, packages and module names of all inputs
+        """
+        if self._index is None:
+            with self._profiler.stage("file discovery"):
+                self._index = discover_sources(
+                    self._input, self._exclude, self._gitignore
+                )
+            self._profiler.count("python_files", len(self._index.modules))
+        return self._index
+
+    def _log_command_summary(self):
+        """logs number and accumulated time of executed commands per executable"""
+        summary = {}
+        for result in self._runner.history:
+            count, wall_time, cpu_time = summary.get(result.command[0], (0, 0.0, 0.0))
+            summary[result.command[0]] = (
+                count + 1,
+                wall_time + result.wall_time,
+                cpu_time + result.cpu_time,
+            )
+        for executable, (count, wall_time, cpu_time) in summary.items():
+            logging.info(
+                f"{executable}: {count} commands, {wall_time:.2f}s wall, "
+                + f"{cpu_time:.2f}s cpu"
+            )
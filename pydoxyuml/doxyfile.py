@@ -0,0 +1,275 @@
+"""Module provides a key value model of a Doxyfile"""
+
+from functools import lru_cache
+import logging
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+TEMPLATE_NAME = "Doxyfile"
+"""str: name of the Doxyfile template shipped with this package"""
+OUTPUT_GENERATORS = {
+    "html": "GENERATE_HTML",
+    "latex": "GENERATE_LATEX",
+    "xml": "GENERATE_XML",
+    "rtf": "GENERATE_RTF",
+    "man": "GENERATE_MAN",
+    "docbook": "GENERATE_DOCBOOK",
+}
+"""Dict[str, str]: Doxyfile key enabling an output format"""
+PRESETS = {
+    "fast": {
+        "GENERATE_LATEX": "NO",
+        "GENERATE_RTF": "NO",
+        "GENERATE_MAN": "NO",
+        "GENERATE_DOCBOOK": "NO",
+        "CALL_GRAPH": "NO",
+        "CALLER_GRAPH": "NO",
+        "INCLUDE_GRAPH": "NO",
+        "INCLUDED_BY_GRAPH": "NO",
+        "DIRECTORY_GRAPH": "NO",
+        "REFERENCED_BY_RELATION": "NO",
+        "REFERENCES_RELATION": "NO",
+        "NUM_PROC_THREADS": "0",
+        "DOT_NUM_THREADS": "0",
+    },
+}
+"""Dict[str, Dict[str, str]]: named sets of Doxyfile keys. 'fast' only writes html
+without call and include graphs and uses all cores"""
+
+
+def quote(value: str) -> str:
+    """quotes a value if doxygen would split it at whitespace
+
+    Args:
+        value (str): single value like a title or a path
+
+    Returns:
+        str: value in double quotes if it contains whitespace
+    """
+    if any(char.isspace() for char in value) and not value.startswith('"'):
+        return '"' + value.replace('"', '\\"') + '"'
+    return value
+
+
+def parse_assignment(assignment: str) -> Tuple[str, str, str]:
+    """splits an assignment like 'KEY=VALUE' or 'KEY+=VALUE'
+
+    Args:
+        assignment (str): assignment as given on the command line
+
+    Raises:
+        ValueError: assignment contains no '=' or no key
+
+    Returns:
+        Tuple[str, str, str]: key, operator ('=' or '+=') and value
+    """
+    key, separator, value = assignment.partition("=")
+    operator = "="
+    if key.endswith("+"):
+        key, operator = key[:-1], "+="
+    key = key.strip()
+    if len(separator) == 0 or len(key) == 0 or any(x.isspace() for x in key):
+        raise ValueError(f"expected KEY=VALUE or KEY+=VALUE, got '{assignment}'")
+    return key, operator, value.strip()
+
+
+class Doxyfile:
+    """ordered mapping of Doxyfile keys to their raw values
+
+    Values are kept as written after the '=', including quotes. Keys which are not
+    set keep the defaults of the doxygen version processing the file.
+    """
+
+    def __init__(self, entries: Union[None, Dict[str, str]] = None) -> None:
+        self._entries: Dict[str, str] = dict(entries or {})
+        """Dict[str, str]: raw value per key in order of appearance"""
+        self._appends: Dict[str, str] = {}
+        """Dict[str, str]: values appended to keys which are not set in this file.
+        Rendered with '+=' so doxygen appends them to its defaults"""
+        self._includes: List[Tuple[str, str]] = []
+        """List[Tuple[str, str]]: '@INCLUDE' and '@INCLUDE_PATH' directives"""
+
+    @classmethod
+    def parse(cls, text: str) -> "Doxyfile":
+        """parses the content of a Doxyfile
+
+        Handles comments, '+=' assignments and lines continued with '\\'.
+
+        Args:
+            text (str): content of a Doxyfile
+
+        Returns:
+            Doxyfile: parsed Doxyfile
+        """
+        doxyfile = cls()
+        for line in cls._logical_lines(text):
+            key, separator, value = line.partition("=")
+            if len(separator) == 0:
+                logging.debug(f"ignore Doxyfile line without '=': {line}")
+                continue
+            append = key.endswith("+")
+            key = key.rstrip("+").strip()
+            value = value.strip()
+            if key.startswith("@"):
+                doxyfile._includes.append((key, value))
+            elif append:
+                doxyfile.append(key, value)
+            else:
+                doxyfile[key] = value
+        return doxyfile
+
+    @classmethod
+    def load(cls, path: str) -> "Doxyfile":
+        """reads and parses a Doxyfile
+
+        Args:
+            path (str): path to Doxyfile
+
+        Returns:
+            Doxyfile: parsed Doxyfile
+        """
+        with open(path, "r", encoding="UTF-8") as file:
+            return cls.parse(file.read())
+
+    @classmethod
+    def template(cls) -> "Doxyfile":
+        """Doxyfile template shipped with this package
+
+        Returns:
+            Doxyfile: fresh copy of the parsed template
+        """
+        template = _parsed_template()
+        doxyfile = cls(template._entries)
+        doxyfile._appends = dict(template._appends)
+        doxyfile._includes = list(template._includes)
+        return doxyfile
+
+    def __getitem__(self, key: str) -> str:
+        return self._entries[key]
+
+    def __setitem__(self, key: str, value: str):
+        self._appends.pop(key, None)
+        self._entries[key] = value
+
+    def __delitem__(self, key: str):
+        del self._entries[key]
+        self._appends.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def get(self, key: str, default: str = "") -> str:
+        """raw value of a key
+
+        Args:
+            key (str): Doxyfile key like 'INPUT'
+            default (str, optional): value if key is not set. Defaults to "".
+
+        Returns:
+            str: raw value
+        """
+        return self._entries.get(key, default)
+
+    def append(self, key: str, value: str):
+        """appends a value to a list like key as '+=' does
+
+        Values appended to keys which are not set are kept as '+=' assignment, so
+        they extend the defaults of doxygen.
+
+        Args:
+            key (str): Doxyfile key like 'INPUT'
+            value (str): value to append
+        """
+        entries = self._entries if key in self._entries else self._appends
+        entries[key] = f"{entries.get(key, '')} {value}".strip()
+
+    def remove(self, key: str):
+        """unsets a key, so doxygen falls back to its default
+
+        Args:
+            key (str): Doxyfile key like 'HTML_EXTRA_STYLESHEET'
+        """
+        self._entries.pop(key, None)
+        self._appends.pop(key, None)
+
+    def assign(self, assignment: str):
+        """applies an assignment like 'KEY=VALUE' or 'KEY+=VALUE'
+
+        Args:
+            assignment (str): assignment as given on the command line
+        """
+        key, operator, value = parse_assignment(assignment)
+        if operator == "+=":
+            self.append(key, value)
+        else:
+            self[key] = value
+
+    def update(self, entries: Dict[str, str]):
+        """sets several keys at once
+
+        Args:
+            entries (Dict[str, str]): value per key
+        """
+        for key, value in entries.items():
+            self[key] = value
+
+    def render(self) -> str:
+        """formats the Doxyfile like doxygen does
+
+        Returns:
+            str: content of the Doxyfile
+        """
+        lines = [f"{key} = {value}".rstrip() for key, value in self._includes]
+        lines.extend(
+            f"{key:<23}= {value}".rstrip() for key, value in self._entries.items()
+        )
+        lines.extend(f"{key:<22}+= {value}" for key, value in self._appends.items())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """writes the rendered Doxyfile
+
+        Args:
+            path (str): path to Doxyfile
+        """
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(self.render())
+
+    @staticmethod
+    def _logical_lines(text: str) -> Iterator[str]:
+        """joins continued lines and skips comments and empty lines
+
+        Args:
+            text (str): content of a Doxyfile
+
+        Yields:
+            Iterator[str]: one line per assignment
+        """
+        pending = ""
+        for line in text.splitlines():
+            stripped = line.strip()
+            if len(pending) == 0 and (len(stripped) == 0 or stripped.startswith("#")):
+                continue
+            if stripped.endswith("\\"):
+                pending += stripped[:-1].rstrip() + " "
+                continue
+            yield pending + stripped
+            pending = ""
+        if len(pending) > 0:
+            yield pending
+
+
+@lru_cache(maxsize=1)
+def _parsed_template() -> Doxyfile:
+    """parses the shipped template once per process
+
+    Returns:
+        Doxyfile: parsed template. Must not be modified
+    """
+    # pylint: disable=import-outside-toplevel
+    import pkgutil
+
+    return Doxyfile.parse(pkgutil.get_data("pydoxyuml", TEMPLATE_NAME).decode("UTF-8"))
@@ -0,0 +1,128 @@
+"""Module provides a documenter generating doxygen docs and UML diagrams at once"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from typing import Iterable, List, Union
+
+from pydoxyuml.generate_uml import UMLDocumenter
+from pydoxyuml.genreate_doxy_doc import DoxyDocumenter
+from pydoxyuml.utils.cache import SourceCache
+from pydoxyuml.utils.discovery import discover_sources
+from pydoxyuml.utils.profiling import Profiler
+
+
+class AllDocumenter:
+    """runs the doxygen and the UML pipeline concurrently on the same sources
+
+    The inputs are discovered once and both documenters share the resulting
+    source index and the source cache.
+    """
+
+    def __init__(
+        self,
+        input: List[str],
+        docs_output: str,
+        uml_output: str,
+        doxyfile: Union[None, str] = None,
+        title: str = "Example Project",
+        style_sheet: Union[None, str] = None,
+        docs_engine: str = "inprocess",
+        incremental: bool = False,
+        doxy_set: Iterable[str] = (),
+        threads: Union[None, int] = None,
+        outputs: Union[None, List[str]] = None,
+        preset: Union[None, str] = None,
+        preprocess: str = "tmp",
+        format: Union[str, List[str]] = "png",
+        colorized: bool = False,
+        recursion_depth: int = 1,
+        source_roots: Iterable[str] = (),
+        batch_size: Union[None, int] = None,
+        per_package: bool = False,
+        cache_dir: Union[None, str] = None,
+        uml_engine: str = "pyreverse",
+        jobs: int = 1,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+    ) -> None:
+        self._input = input
+        """List[str]: list of input module root directories"""
+        self._profiler = Profiler() if profiler is None else profiler
+        """Profiler: records duration of stages and counters"""
+        self._exclude = list(exclude)
+        self._gitignore = gitignore
+        self._cache = SourceCache(cache_dir)
+        """SourceCache: parsed files shared by both pipelines"""
+        self._docs_output = docs_output
+        self._uml_output = uml_output
+        self._docs_options = {
+            "doxyfile": doxyfile,
+            "title": title,
+            "style_sheet": style_sheet,
+            "engine": docs_engine,
+            "incremental": incremental,
+            "doxy_set": doxy_set,
+            "threads": threads,
+            "outputs": outputs,
+            "preset": preset,
+            "preprocess": preprocess,
+        }
+        """Dict[str, Any]: arguments only used by the DoxyDocumenter"""
+        self._uml_options = {
+            "format": format,
+            "colorized": colorized,
+            "recursion_depth": recursion_depth,
+            "source_roots": source_roots,
+            "batch_size": batch_size,
+            "per_package": per_package,
+            "engine": uml_engine,
+        }
+        """Dict[str, Any]: arguments only used by the UMLDocumenter"""
+        self._common_options = {
+            "jobs": jobs,
+            "timeout": timeout,
+            "profiler": self._profiler,
+            "exclude": self._exclude,
+            "gitignore": gitignore,
+        }
+        """Dict[str, Any]: arguments of both documenters"""
+
+    def __call__(self) -> None:
+        """discovers the inputs once and generates docs and diagrams concurrently
+
+        Raises:
+            Exception: first error of a failed pipeline after both finished
+        """
+        with self._profiler.stage("file discovery"):
+            index = discover_sources(self._input, self._exclude, self._gitignore)
+        self._profiler.count("python_files", len(index.modules))
+
+        docs = DoxyDocumenter(
+            self._input,
+            self._docs_output,
+            **self._docs_options,
+            **self._common_options,
+            index=index,
+        )
+        uml = UMLDocumenter(
+            self._input,
+            self._uml_output,
+            **self._uml_options,
+            **self._common_options,
+            index=index,
+            cache=self._cache,
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {"docs": executor.submit(docs), "uml": executor.submit(uml)}
+
+        errors = []
+        for name, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                logging.error(f"{name} failed: {type(error).__name__}: {error}")
+                errors.append(error)
+        if len(errors) > 0:
+            raise errors[0]
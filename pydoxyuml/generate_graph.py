@@ -0,0 +1,371 @@
+"""Module provides an export of the local import graph with metrics"""
+
+from collections import deque
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+from xml.etree import ElementTree
+
+from pydoxyuml.documenter import Documenter
+from pydoxyuml.import_graph import ImportGraph, strongly_connected_components
+from pydoxyuml.utils.cache import SourceCache
+from pydoxyuml.utils.discovery import SourceIndex, root_base
+from pydoxyuml.utils.profiling import Profiler
+
+
+GRAPH_FORMATS = ["json", "graphml", "dot"]
+"""List[str]: formats the import graph can be exported in"""
+GRAPH_FILE_NAME = "imports"
+"""str: file name of the exported graph without extension"""
+
+
+@dataclass
+class ImportMetrics:
+    """metrics of every module of an import graph"""
+
+    fan_in: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: number of local modules importing a module"""
+    fan_out: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: number of local modules a module imports"""
+    closure: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: number of local modules a module imports transitively"""
+    depth: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: length of the longest import chain starting at a module.
+    Modules of a cycle count as one link"""
+    cycle: Dict[str, int] = field(default_factory=dict)
+    """Dict[str, int]: index into cycles for modules which are part of a cycle"""
+    cycles: List[List[str]] = field(default_factory=list)
+    """List[List[str]]: groups of modules importing each other"""
+    longest_chain: List[List[str]] = field(default_factory=list)
+    """List[List[str]]: modules along the longest import chain, cycles as one
+    group"""
+
+    def top(self, metric: str, count: int) -> List[Tuple[str, int]]:
+        """modules with the highest value of a metric
+
+        Args:
+            metric (str): 'fan_in', 'fan_out', 'closure' or 'depth'
+            count (int): number of modules
+
+        Returns:
+            List[Tuple[str, int]]: module and value, highest first
+        """
+        values: Dict[str, int] = getattr(self, metric)
+        return sorted(values.items(), key=lambda x: (-x[1], x[0]))[:count]
+
+
+def compute_metrics(nodes: List[str], edges: Dict[str, List[str]]) -> ImportMetrics:
+    """computes fan-in/out, cycles, longest chains and transitive closure sizes
+
+    The graph is condensed into its strongly connected components, which Tarjan's
+    algorithm returns in reverse topological order. A single pass over the
+    components then propagates the reachable modules as bitsets and the longest
+    chain, so the cost is linear in the number of imports apart from the bitset
+    unions.
+
+    Args:
+        nodes (List[str]): modules of the graph
+        edges (Dict[str, List[str]]): imported modules per module
+
+    Returns:
+        ImportMetrics: metrics of every module
+    """
+    metrics = ImportMetrics()
+    contained = set(nodes)
+    for node in nodes:
+        targets = [x for x in edges.get(node, []) if x in contained]
+        metrics.fan_out[node] = len(targets)
+        metrics.fan_in.setdefault(node, 0)
+        for target in targets:
+            metrics.fan_in[target] = metrics.fan_in.get(target, 0) + 1
+
+    components = strongly_connected_components(nodes, edges)
+    component_of = {
+        node: index for index, component in enumerate(components) for node in component
+    }
+    bit = {node: index for index, node in enumerate(nodes)}
+    reach = [0] * len(components)
+    depth = [0] * len(components)
+    following: List[Union[None, int]] = [None] * len(components)
+    for index, component in enumerate(components):
+        mask = 0
+        successors = set()
+        for node in component:
+            mask |= 1 << bit[node]
+            successors.update(
+                component_of[x] for x in edges.get(node, []) if x in contained
+            )
+        successors.discard(index)
+        longest = 0
+        # successors were emitted before, their results are complete
+        for successor in successors:
+            mask |= reach[successor]
+            if depth[successor] > longest:
+                longest, following[index] = depth[successor], successor
+        reach[index] = mask
+        depth[index] = longest + 1
+
+    for node in nodes:
+        index = component_of[node]
+        metrics.closure[node] = bin(reach[index]).count("1") - 1
+        metrics.depth[node] = depth[index]
+
+    metrics.cycles = sorted(
+        (sorted(x) for x in components if len(x) > 1), key=lambda x: (-len(x), x)
+    )
+    for index, cycle in enumerate(metrics.cycles):
+        for node in cycle:
+            metrics.cycle[node] = index
+
+    if len(components) > 0:
+        current: Union[None, int] = max(
+            range(len(components)), key=lambda x: (depth[x], len(components[x]))
+        )
+        while current is not None:
+            metrics.longest_chain.append(sorted(components[current]))
+            current = following[current]
+    return metrics
+
+
+class GraphDocumenter(Documenter):
+    """exports the import graph of the local modules with metrics on call"""
+
+    def __init__(
+        self,
+        input: Iterable[str],
+        output: str,
+        format: Union[str, List[str]] = "json",
+        top: int = 20,
+        cache_dir: Union[None, str] = None,
+        profiler: Union[None, Profiler] = None,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        index: Union[None, SourceIndex] = None,
+        cache: Union[None, SourceCache] = None,
+        base_dir: Union[None, str] = None,
+        source_roots: Iterable[str] = (),
+    ) -> None:
+        super().__init__(
+            input,
+            output,
+            profiler=profiler,
+            exclude=exclude,
+            gitignore=gitignore,
+            index=index,
+            base_dir=base_dir,
+        )
+        self._formats = list(
+            dict.fromkeys([format] if isinstance(format, str) else format)
+        )
+        """List[str]: export formats, subset of GRAPH_FORMATS"""
+        self._top = top
+        """int: number of modules listed per metric in the summary"""
+        self._cache = SourceCache(cache_dir) if cache is None else cache
+        """SourceCache: extracted imports. May be shared with other documenters"""
+        source_roots = [os.path.join(self._current_dir, x) for x in source_roots]
+        self._graph = ImportGraph(
+            [*map(root_base, self._input), *source_roots, self._current_dir],
+            self._cache,
+            exclude,
+            gitignore,
+        )
+        """ImportGraph: local modules of all input roots and their imports"""
+        self._inputs: Set[str] = set()
+        """Set[str]: modules located below the input roots"""
+        self._metrics = ImportMetrics()
+        """ImportMetrics: metrics of the last call"""
+
+    def __call__(self, *args: Any, **kwds: Any) -> None:
+        """expands the import graph, computes its metrics and exports it"""
+        self._errors = []
+        self._create_directory(self._output)
+        with self._profiler.stage("import scan"):
+            modules = self._expand()
+        self._profiler.count("modules", len(modules))
+        with self._profiler.stage("graph metrics"):
+            self._metrics = compute_metrics(modules, self._graph.edges)
+        with self._profiler.stage("graph export"):
+            for output_format in self._formats:
+                path = f"{self._output}{GRAPH_FILE_NAME}.{output_format}"
+                getattr(self, f"_write_{output_format}")(path)
+                logging.info(f"wrote {path}")
+        self._profiler.count("parsed_files", self._cache.parsed)
+        self._profiler.count("cache_hits", self._cache.hits)
+        self._cache.save()
+
+    @property
+    def graph(self) -> ImportGraph:
+        """ImportGraph: local modules of all input roots and their imports"""
+        return self._graph
+
+    @property
+    def metrics(self) -> ImportMetrics:
+        """ImportMetrics: metrics of the last call"""
+        return self._metrics
+
+    def report(self) -> str:
+        """human readable summary of the last call
+
+        Returns:
+            str: sizes, cycles, longest chain and the top modules per metric
+        """
+        edges = sum(self._metrics.fan_out.values())
+        lines = [
+            f"{len(self._metrics.fan_out)} modules, {edges} imports, "
+            + f"{len(self._metrics.cycles)} import cycles",
+            f"longest import chain: {len(self._metrics.longest_chain)} links",
+        ]
+        for link in self._metrics.longest_chain:
+            cycle = f" (+{len(link) - 1} modules of a cycle)" if len(link) > 1 else ""
+            lines.append(f"  {link[0]}{cycle}")
+        for metric, title in [
+            ("closure", "transitive imports"),
+            ("fan_in", "imported by"),
+            ("fan_out", "imports"),
+        ]:
+            lines.append(f"top {self._top} by {title}:")
+            lines.extend(
+                f"  {value:>6}  {module}"
+                for module, value in self._metrics.top(metric, self._top)
+            )
+        return "\n".join(lines)
+
+    def _expand(self) -> List[str]:
+        """follows the imports of all input modules until no new module is found
+
+        Returns:
+            List[str]: all reached modules, input modules first
+        """
+        files = self._source_index().all_files()
+        modules = list(dict.fromkeys(map(self._graph.add_file, files)))
+        self._inputs = set(modules)
+        visited = set(modules)
+        pending = deque(modules)
+        reached = []
+        while len(pending) > 0:
+            module = pending.popleft()
+            reached.append(module)
+            try:
+                targets = self._graph.imports(module)
+            except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as error:
+                self._error(f"cannot parse {self._graph.files[module]}: {error}")
+                self._graph.edges[module] = []
+                continue
+            for target in targets:
+                if target not in visited:
+                    visited.add(target)
+                    pending.append(target)
+        return reached
+
+    def _module_attributes(self, module: str) -> Dict[str, Any]:
+        """file and metrics of a module
+
+        Args:
+            module (str): module name
+
+        Returns:
+            Dict[str, Any]: json serializable attributes
+        """
+        return {
+            "file": self._graph.files[module],
+            "input": module in self._inputs,
+            "fan_in": self._metrics.fan_in[module],
+            "fan_out": self._metrics.fan_out[module],
+            "closure": self._metrics.closure[module],
+            "depth": self._metrics.depth[module],
+            "cycle": self._metrics.cycle.get(module),
+        }
+
+    def _write_json(self, path: str):
+        """writes modules with metrics, imports, cycles and top lists as json
+
+        Args:
+            path (str): path to json file
+        """
+        modules = {x: self._module_attributes(x) for x in self._metrics.fan_out}
+        content = {
+            "roots": self._input,
+            "modules": modules,
+            "imports": {x: self._graph.edges.get(x, []) for x in modules},
+            "cycles": self._metrics.cycles,
+            "longest_chain": self._metrics.longest_chain,
+            "top": {
+                metric: self._metrics.top(metric, self._top)
+                for metric in ["closure", "depth", "fan_in", "fan_out"]
+            },
+        }
+        with open(path, "w", encoding="UTF-8") as file:
+            json.dump(content, file, indent=2)
+
+    def _write_graphml(self, path: str):
+        """writes the graph with metrics as node attributes as GraphML
+
+        Args:
+            path (str): path to graphml file
+        """
+        keys = [
+            ("file", "string"),
+            ("input", "boolean"),
+            ("fan_in", "int"),
+            ("fan_out", "int"),
+            ("closure", "int"),
+            ("depth", "int"),
+            ("cycle", "int"),
+        ]
+        root = ElementTree.Element(
+            "graphml", xmlns="http://graphml.graphdrawing.org/xmlns"
+        )
+        for name, kind in keys:
+            ElementTree.SubElement(
+                root, "key", id=name, attrib={"for": "node", "attr.name": name}
+            ).set("attr.type", kind)
+        graph = ElementTree.SubElement(
+            root, "graph", id="imports", edgedefault="directed"
+        )
+        for module in self._metrics.fan_out:
+            node = ElementTree.SubElement(graph, "node", id=module)
+            attributes = self._module_attributes(module)
+            for name, _ in keys:
+                value = attributes[name]
+                if name == "cycle" and value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = str(value).lower()
+                ElementTree.SubElement(node, "data", key=name).text = str(value)
+        for module in self._metrics.fan_out:
+            for target in self._graph.edges.get(module, []):
+                ElementTree.SubElement(graph, "edge", source=module, target=target)
+        ElementTree.ElementTree(root).write(
+            path, encoding="UTF-8", xml_declaration=True
+        )
+
+    def _write_dot(self, path: str):
+        """writes the graph as Graphviz dot. Modules of cycles are filled red
+
+        Args:
+            path (str): path to dot file
+        """
+        lines = ['digraph "imports" {', "rankdir=LR", 'node [shape="box"]']
+        for module in self._metrics.fan_out:
+            tooltip = (
+                f"fan in {self._metrics.fan_in[module]}, "
+                + f"fan out {self._metrics.fan_out[module]}, "
+                + f"closure {self._metrics.closure[module]}"
+            )
+            style = ""
+            if module in self._metrics.cycle:
+                style = ', style="filled", fillcolor="lightcoral"'
+            lines.append(f'"{module}" [tooltip="{tooltip}"{style}];')
+        for module in self._metrics.fan_out:
+            cycle = self._metrics.cycle.get(module)
+            for target in self._graph.edges.get(module, []):
+                color = ""
+                if cycle is not None and self._metrics.cycle.get(target) == cycle:
+                    color = ' [color="red"]'
+                lines.append(f'"{module}" -> "{target}"{color};')
+        lines.append("}")
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write("\n".join(lines) + "\n")
+
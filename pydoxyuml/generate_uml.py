@@ -1,10 +1,36 @@
 """Module Provides functions and classes for a UML diagram documenter"""
-import ast
-import glob
+from concurrent.futures import ThreadPoolExecutor
+import html
+import logging
 import os
-from typing import Any, Iterable, List
+import re
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
 
 from pydoxyuml.documenter import Documenter
+from pydoxyuml.import_graph import ImportGraph, package_of
+from pydoxyuml.native_uml import (
+    NATIVE_FORMATS,
+    PackageOverview,
+    write_diagrams,
+    write_overview,
+)
+from pydoxyuml.utils.cache import SourceCache
+from pydoxyuml.utils.discovery import SourceIndex, root_base
+from pydoxyuml.utils.profiling import Profiler
+
+
+RASTER_FORMATS = ["png", "jpg"]
+"""List[str]: formats rendered from dot files with graphviz"""
+DOT_FORMATS = ["dot", "gv", *RASTER_FORMATS]
+"""List[str]: formats pyreverse derives from a single dot file"""
+DOT_EDGE = re.compile(r'^"(?:[^"\\]|\\.)*"\s*->')
+"""Pattern: start of an edge statement in a dot file written by pyreverse"""
+DOT_NODE = re.compile(r'^"((?:[^"\\]|\\.)*)"')
+"""Pattern: quoted id at the start of a node statement"""
+DIAGRAMS = ("classes", "packages")
+"""Tuple[str, ...]: diagrams written per project by pyreverse and the native engine"""
 
 
 
@@ -20,32 +46,93 @@ def unpack(str_list: Iterable[str]) -> str:
     return " ".join(map(str, str_list))
 
 
-def find_submodules(root_directory: str) -> List[str]:
-    """find all submodules in root directory and have and '__init__.py' file inside
+def merge_dot_files(paths: Iterable[str], target: str, title: str):
+    """merges partial diagrams written by pyreverse into one dot file
 
-    Args:
-        root_directory (str): directory to check for submodule
+    Graph attributes are taken from the first file. Nodes are kept once per id,
+    the first definition wins, and equal edges are kept once.
 
-    Returns:
-        List[str]: all subdirectories with '__init__.py' inside
+    Args:
+        paths (Iterable[str]): dot files of the partial diagrams
+        target (str): path to the merged dot file
+        title (str): name of the merged graph
     """
-    result_dirs = []
-    for dir_path, _, file_names in os.walk(root_directory):
-        if "__init__.py" in file_names:
-            result_dirs.append(dir_path)
-    return result_dirs
-
-
-def convert_to_file_path(import_str: str) -> str:
-    """converts an import statement into a file path
+    attributes: List[str] = []
+    nodes: Dict[str, str] = {}
+    edges: Dict[str, None] = {}
+    for index, path in enumerate(paths):
+        with open(path, "r", encoding="UTF-8") as file:
+            lines = file.read().splitlines()
+        statement = ""
+        for line in lines[1:]:
+            statement = f"{statement}\n{line}" if statement else line
+            if statement.startswith('"') and not statement.rstrip().endswith(";"):
+                continue
+            if DOT_EDGE.match(statement):
+                edges.setdefault(statement)
+            elif DOT_NODE.match(statement):
+                nodes.setdefault(DOT_NODE.match(statement).group(1), statement)
+            elif index == 0 and statement.strip() not in ("", "}"):
+                attributes.append(statement)
+            statement = ""
+
+    with open(target, "w", encoding="UTF-8") as file:
+        file.write(f'digraph "{title}" {{\n')
+        file.writelines(f"{line}\n" for line in [*attributes, *nodes.values()])
+        file.writelines(f"{line}\n" for line in edges)
+        file.write("}\n")
+
+
+def render_index(
+    output: str, sections: Iterable[Tuple[str, List[str]]], extensions: List[str]
+) -> str:
+    """renders an html page linking the overview and the diagrams of every package
 
     Args:
-        import_str (str): import statement
+        output (str): output directory containing the diagrams
+        sections (Iterable[Tuple[str, List[str]]]): project name and its package
+            names. The overview of every project is named 'overview_<project>'
+        extensions (List[str]): file extensions of the written diagrams
 
     Returns:
-        str: file path
+        str: content of index.html
     """
-    return import_str.replace(".", "/").rstrip(".") + ".py"
+
+    def links(name: str) -> str:
+        files = [f"{name}.{x}" for x in extensions]
+        return " ".join(
+            f'<a href="{html.escape(x)}">{html.escape(x.rpartition(".")[2])}</a>'
+            for x in files
+            if os.path.isfile(os.path.join(output, x))
+        )
+
+    lines = [
+        "<!DOCTYPE html>",
+        "<html>",
+        '<head><meta charset="utf-8"><title>UML diagrams</title></head>',
+        "<body>",
+        "<h1>UML diagrams</h1>",
+    ]
+    for project_name, packages in sections:
+        overview = f"overview_{project_name}"
+        lines.append(f"<h2>{html.escape(project_name)}</h2>")
+        lines.append(f"<p>package overview: {links(overview)}</p>")
+        for extension in RASTER_FORMATS:
+            if os.path.isfile(os.path.join(output, f"{overview}.{extension}")):
+                source = html.escape(f"{overview}.{extension}")
+                alternative = html.escape(overview)
+                lines.append(f'<p><img src="{source}" alt="{alternative}"></p>')
+                break
+        if len(packages) == 0:
+            continue
+        lines.append("<table>")
+        lines.append("<tr><th>package</th><th>classes</th><th>packages</th></tr>")
+        for package in packages:
+            cells = "".join(f"<td>{links(f'{x}_{package}')}</td>" for x in DIAGRAMS)
+            lines.append(f"<tr><td>{html.escape(package)}</td>{cells}</tr>")
+        lines.append("</table>")
+    lines.extend(["</body>", "</html>"])
+    return "\n".join(lines) + "\n"
 
 
 # BASE IMPORT COLLECTOR
@@ -67,42 +154,6 @@ def convert_to_file_path(import_str: str) -> str:
 #     return imports
 
 
-class LocalImportFilter:
-    """filter determine if a given directory path is a local directory"""
-
-    def __init__(self) -> None:
-        self._local_directories = list(filter(self._is_directory, os.listdir()))
-        """List[str]: path to local directories"""
-
-    def __call__(self, import_str: str) -> bool:
-        """decides if a given import string imports from a local directory or not
-
-        Args:
-            import_str (str): import string from python file like 'numpy' from 'import numpy'
-
-        Returns:
-            bool: True if first element of import string is local
-        """
-        dir = import_str.split(".")[0]
-        return dir in self._local_directories
-
-    def __str__(self) -> str:
-        """returns all local directories"""
-        return unpack(self._local_directories)
-
-    @staticmethod
-    def _is_directory(name: str) -> bool:
-        """given name is a directory and not a file
-
-        Args:
-            name (str): path to either a directory or a file.
-
-        Returns:
-            bool: true if there is no '.' and therefor no file ending inside name. False otherwise
-        """
-        return "." not in name
-
-
 class UMLDocumenter(Documenter):
     """Generates UML Diagrams on call"""
 
@@ -110,115 +161,492 @@ class UMLDocumenter(Documenter):
         self,
         input: Iterable[str],
         output: str,
-        format: str,
+        format: Union[str, List[str]],
         colorized: bool = True,
         recursion_depth: int = 1,
+        cache_dir: Union[None, str] = None,
+        engine: str = "pyreverse",
+        jobs: int = 1,
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        index: Union[None, SourceIndex] = None,
+        cache: Union[None, SourceCache] = None,
+        base_dir: Union[None, str] = None,
+        source_roots: Iterable[str] = (),
+        batch_size: Union[None, int] = None,
+        per_package: bool = False,
     ) -> None:
-        super().__init__(input, output)
-        self._local_dir_filter = LocalImportFilter()
-        self._format = format
+        super().__init__(
+            input, output, jobs, timeout, profiler, exclude, gitignore, index, base_dir
+        )
+        self._formats = list(
+            dict.fromkeys([format] if isinstance(format, str) else format)
+        )
+        """List[str]: output formats. All formats are rendered from one analysis"""
         self._colorized = colorized
         self._recursion_depth = recursion_depth
         self._imports = []
+        self._job_files: Dict[str, Set[str]] = {}
+        """Dict[str, Set[str]]: absolute paths of the files of every diagram"""
+        self._cache = SourceCache(cache_dir) if cache is None else cache
+        """SourceCache: parsed files and extracted imports. May be shared with
+        other documenters"""
+        self._source_roots = [os.path.join(self._current_dir, x) for x in source_roots]
+        """List[str]: additional directories imports are resolved against"""
+        self._graph = ImportGraph(
+            [*map(root_base, self._input), *self._source_roots, self._current_dir],
+            self._cache,
+            exclude,
+            gitignore,
+        )
+        """ImportGraph: local modules of all input roots and their imports"""
+        self._engine = engine
+        """str: 'native' to write diagrams from the syntax trees or 'pyreverse'"""
+        self._batch_size = batch_size
+        """Union[None, int]: maximum number of files per pyreverse call. None -> all
+        files of a diagram in one call"""
+        self._per_package = per_package
+        """bool: one diagram per package plus an overview instead of one diagram
+        per input"""
+        self._package_jobs: Dict[str, List[Tuple[str, List[str]]]] = {}
+        """Dict[str, List[Tuple[str, List[str]]]]: package name and files per
+        project of the last run with per_package"""
+        unsupported = [
+            output_format
+            for output_format in self._formats
+            if output_format not in NATIVE_FORMATS
+            and output_format not in RASTER_FORMATS
+        ]
+        if self._engine == "native" and len(unsupported) > 0:
+            logging.warning(
+                "formats %s are not supported by the native engine. They are "
+                "generated with pyreverse.",
+                unpack(unsupported),
+            )
+        unbatched = [
+            output_format
+            for output_format in self._formats
+            if output_format not in DOT_FORMATS
+            and (self._engine != "native" or output_format not in NATIVE_FORMATS)
+        ]
+        if self._batch_size is not None and len(unbatched) > 0:
+            logging.warning(
+                "formats %s are not batched. Only dot based formats are merged from "
+                "several pyreverse calls.",
+                unpack(unbatched),
+            )
 
     def __call__(self, *args: Any, **kwds: Any) -> None:
         """generates UML diagrams"""
+        self._errors = []
         self._create_directory(self._output)
-        for module_path in self._input:
-            imports = self._get_imports_from_submodules(module_path)
-            self._imports.extend(imports)
-            project_name = module_path.rstrip("/").replace("/", "_")
-            command = self._generate_pyreverse_command(project_name, imports)
-            self._execute_command(command)
+        self._run_jobs(self._collect_jobs())
+        if self._per_package:
+            self._write_overviews()
+        self._finish()
 
-        # if there are multiple modules given -> create a complete UML diagram
-        if len(self._input) > 1:
-            command = self._generate_pyreverse_command("complete", self._imports)
-            self._execute_command(command)
+    @property
+    def graph(self) -> ImportGraph:
+        """ImportGraph: local modules of all input roots and their imports"""
+        return self._graph
 
-    def _generate_pyreverse_command(
-        self, project_name: str, imports: Iterable[str]
-    ) -> str:
-        """generates pyreverse command and fills arguments into command
+    def update(self, changed_files: Iterable[str], structural: bool = False) -> int:
+        """regenerates the diagrams whose files contain a changed file
+
+        A diagram is regenerated if a changed file is part of its import closure
+        before or after the change.
 
         Args:
-            project_name (str): hoy the project is called
-            imports (Iterable[str]): which files to include into UML diagram
+            changed_files (Iterable[str]): modified, added or removed python files
+            structural (bool, optional): files were added or removed.
+                Defaults to False.
 
         Returns:
-            str: build pyreverse command
+            int: number of regenerated diagrams
         """
-        command = f"pyreverse -o {self._format} -p {project_name} -d {self._output} \
-            {unpack(imports)}"
-        if self._colorized:
-            command += " --colorized"
-        return command
+        self._errors = []
+        changed = set(map(os.path.abspath, changed_files))
+        self._graph.invalidate(changed, structural)
+        self.refresh()
+        previous = self._job_files
+        jobs = [
+            job
+            for job in self._collect_jobs()
+            if not changed.isdisjoint(self._job_files[job[0]])
+            or not changed.isdisjoint(previous.get(job[0], ()))
+        ]
+        self._create_directory(self._output)
+        self._run_jobs(jobs)
+        if self._per_package:
+            self._write_overviews()
+        self._finish()
+        return len(jobs)
 
-    def _get_imports_from_submodules(self, module_path: str) -> Iterable[str]:
-        """iterates through all python files in all subdirectories
+    def _collect_jobs(self) -> List[Tuple[str, List[str]]]:
+        """scans the imports of all inputs and assembles one job per diagram
 
-        Args:
-            module_path (str): root directory
+        Returns:
+            List[Tuple[str, List[str]]]: project name and files per diagram
+        """
+        if self._per_package:
+            jobs = self._collect_package_jobs()
+        else:
+            jobs = []
+            self._imports = []
+            for module_path in self._input:
+                with self._profiler.stage(f"import scan {module_path}"):
+                    imports = self._get_imports_from_submodules(module_path)
+                self._profiler.count("diagram_files", len(imports))
+                self._imports.extend(imports)
+                jobs.append((self._project_name(module_path), imports))
+
+            # if there are multiple modules given -> create a complete UML diagram.
+            # It is the largest job, therefore it is scheduled first.
+            if len(self._input) > 1:
+                jobs.insert(0, ("complete", list(dict.fromkeys(self._imports))))
+        self._job_files = {
+            project_name: set(map(os.path.abspath, imports))
+            for project_name, imports in jobs
+        }
+        return jobs
+
+    def _collect_package_jobs(self) -> List[Tuple[str, List[str]]]:
+        """assembles one job per package of every input
+
+        A diagram contains the modules located directly in its package, so the
+        layout cost of every diagram only depends on the size of one package.
 
         Returns:
-            Iterable[str]: all files imported by the root directory until
-                recursion depth is reached
+            List[Tuple[str, List[str]]]: package name and files per diagram, the
+                largest first
         """
-        imports = []
-        for sub_module_path in find_submodules(module_path):
-            for python_file_name in glob.glob(sub_module_path + "/*.py"):
-                imports.append(python_file_name)
-                imports.extend(
-                    self._get_recursive_imports(python_file_name, self._recursion_depth)
-                )
-        return imports
+        jobs = []
+        self._package_jobs = {}
+        for module_path in self._input:
+            project_name = self._project_name(module_path)
+            files = self._source_index().package_files(module_path)
+            self._profiler.count("diagram_files", len(files))
+            packages: Dict[str, List[str]] = {}
+            for file in files:
+                self._graph.add_file(file)
+                packages.setdefault(os.path.dirname(file), []).append(file)
+            project_jobs = []
+            for directory, package_files in packages.items():
+                relative = os.path.relpath(directory, module_path)
+                package = project_name
+                if relative != os.curdir:
+                    package += "." + relative.replace(os.sep, ".")
+                project_jobs.append((package, package_files))
+            self._package_jobs[project_name] = project_jobs
+            jobs.extend(project_jobs)
+        self._profiler.count("package_diagrams", len(jobs))
+        return sorted(jobs, key=lambda x: len(x[1]), reverse=True)
+
+    def _write_overviews(self):
+        """writes a package overview per input and an index.html of all diagrams
+
+        The overviews are written in the formats the native engine and graphviz
+        support. With multiple inputs a 'complete' overview spans all of them.
+        """
+        text_formats = [x for x in self._formats if x in NATIVE_FORMATS]
+        raster_formats = [x for x in self._formats if x in RASTER_FORMATS]
+        if len(raster_formats) > 0 and "dot" not in text_formats:
+            text_formats.append("dot")
+
+        sections = []
+        overviews: Dict[str, Dict[str, List[str]]] = {}
+        for project_name, project_jobs in self._package_jobs.items():
+            overviews[project_name] = {}
+            for _, files in project_jobs:
+                modules = [self._graph.module_of(file) for file in files]
+                package = package_of(modules[0], files[0])
+                overviews[project_name][package] = modules
+            sections.append((project_name, [name for name, _ in project_jobs]))
+        if len(overviews) > 1:
+            complete: Dict[str, List[str]] = {}
+            for packages in overviews.values():
+                for package, modules in packages.items():
+                    complete.setdefault(package, []).extend(modules)
+            overviews["complete"] = complete
+            sections.insert(0, ("complete", []))
+
+        with self._profiler.stage("uml overview"):
+            for project_name, packages in overviews.items():
+                overview = PackageOverview(packages, self._graph)
+                write_overview(project_name, overview, text_formats, self._output)
+                if len(raster_formats) > 0:
+                    self._convert_dot_files(
+                        project_name,
+                        raster_formats,
+                        "dot" in self._formats,
+                        ["overview"],
+                    )
 
-    def _get_recursive_imports(
-        self, python_file_name: str, recursion_level: int
-    ) -> Iterable[str]:
-        """get all local python files imported by python_file_name
+        extensions = list(
+            dict.fromkeys(NATIVE_FORMATS.get(x, x) for x in self._formats)
+        )
+        with open(self._output + "index.html", "w", encoding="UTF-8") as file:
+            file.write(render_index(self._output, sections, extensions))
+        logging.info(f"wrote {self._output}index.html")
 
-        stops if recursion_level == 0 is reached
+    def _project_name(self, module_path: str) -> str:
+        """name of the diagrams of an input root
 
         Args:
-            python_file_name (str): python file to inspect
-            recursion_level (int): how many levels deeper to go
+            module_path (str): input root directory
 
         Returns:
-            Iterable[str]: list of local python files imported from python_file_name
+            str: path relative to the working directory with '_' as separator
+        """
+        return (
+            os.path.relpath(module_path, self._current_dir)
+            .rstrip("/")
+            .replace("/", "_")
+        )
+
+    def _finish(self):
+        """logs statistics of the run and persists the source cache"""
+        self._log_command_summary()
+
+        for cycle in self._graph.cycles():
+            logging.info(f"import cycle between: {unpack(cycle)}")
+        logging.debug(
+            f"parsed {self._cache.parsed} files, {self._cache.hits} cache hits"
+        )
+        self._profiler.count("parsed_files", self._cache.parsed)
+        self._profiler.count("cache_hits", self._cache.hits)
+        self._profiler.count("modules", len(self._graph.files))
+        self._cache.save()
+
+    def _run_jobs(self, jobs: List[Tuple[str, List[str]]]):
+        """generates the diagrams of all jobs in a pool of self._jobs workers
+
+        Logs the duration of every job and all failed jobs at the end.
+
+        Args:
+            jobs (List[Tuple[str, List[str]]]): project name and files per diagram
         """
-        # end condition
-        if recursion_level <= 0:
-            return []
 
-        with open(python_file_name, "r", encoding="utf-8") as file:
-            tree = ast.parse(file.read(), python_file_name)
+        def run(job: Tuple[str, List[str]]) -> Tuple[str, float, Union[None, str]]:
+            project_name, imports = job
+            start = time.perf_counter()
+            try:
+                with self._profiler.stage(f"uml job {project_name}"):
+                    self._generate_diagrams(project_name, imports)
+                error = None
+            except Exception as exception:  # pylint: disable=broad-except
+                error = f"{type(exception).__name__}: {exception}"
+            return project_name, time.perf_counter() - start, error
+
+        with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            results = list(executor.map(run, jobs))
+
+        for project_name, duration, error in results:
+            status = "ok" if error is None else "failed"
+            logging.info(f"uml job {project_name}: {status} after {duration:.2f}s")
+        failures = [result for result in results if result[2] is not None]
+        for project_name, _, error in failures:
+            self._error(f"uml job {project_name} failed: {error}")
+        if len(failures) > 0:
+            logging.warning(f"{len(failures)} of {len(results)} uml jobs failed")
+
+    def _generate_diagrams(self, project_name: str, imports: Iterable[str]):
+        """generates class and package diagram in all formats with the selected engine
+
+        The project is analysed once. Graphviz based formats are rendered from a
+        single dot file and every other format from the same model.
 
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
+        Args:
+            project_name (str): how the project is called
+            imports (Iterable[str]): which files to include into UML diagram
+        """
+        formats = self._formats
+        if self._engine == "native":
+            native_formats = [
+                output_format
+                for output_format in formats
+                if output_format in NATIVE_FORMATS or output_format in RASTER_FORMATS
+            ]
+            raster_formats = [x for x in native_formats if x in RASTER_FORMATS]
+            text_formats = [x for x in native_formats if x in NATIVE_FORMATS]
+            if len(raster_formats) > 0 and "dot" not in text_formats:
+                text_formats.append("dot")
+            write_diagrams(
+                project_name,
+                imports,
+                self._graph,
+                self._cache,
+                text_formats,
+                self._output,
+                self._colorized,
+            )
+            if len(raster_formats) > 0:
+                self._convert_dot_files(project_name, raster_formats, "dot" in formats)
+            formats = [x for x in formats if x not in native_formats]
+            if len(formats) == 0:
+                return
+
+        dot_formats = [x for x in formats if x in DOT_FORMATS]
+        other_formats = [x for x in formats if x not in DOT_FORMATS]
+        batched = self._batch_size is not None and len(imports) > self._batch_size
+        if batched and len(dot_formats) > 0:
+            self._generate_batched_dot_files(project_name, imports)
+            self._convert_dot_files(
+                project_name,
+                [x for x in dot_formats if x != "dot"],
+                "dot" in dot_formats,
+            )
+        elif len(dot_formats) == 1:
+            other_formats.insert(0, dot_formats[0])
+        elif len(dot_formats) > 1:
+            command = self._generate_pyreverse_command(project_name, imports, "dot")
+            self._execute_command(command, check=True)
+            self._convert_dot_files(
+                project_name,
+                [x for x in dot_formats if x != "dot"],
+                "dot" in dot_formats,
+            )
+        for output_format in other_formats:
+            command = self._generate_pyreverse_command(
+                project_name, imports, output_format
+            )
+            self._execute_command(command, check=True)
+
+    def _convert_dot_files(
+        self,
+        project_name: str,
+        output_formats: Iterable[str],
+        keep_dot: bool,
+        diagrams: Iterable[str] = DIAGRAMS,
+    ):
+        """converts the dot files of a project into other formats with graphviz
+
+        Args:
+            project_name (str): how the project is called
+            output_formats (Iterable[str]): formats to convert into. 'gv' is a copy
+            keep_dot (bool): whether the dot files were requested or only an
+                intermediate result
+            diagrams (Iterable[str], optional): diagrams to convert.
+                Defaults to DIAGRAMS.
+        """
+        for diagram in diagrams:
+            dot_path = f"{self._output}{diagram}_{project_name}.dot"
+            if not os.path.isfile(dot_path):
                 continue
-                local_imports = filter(
-                    self._local_dir_filter, map(lambda x: x.name, node.names)
+            for output_format in output_formats:
+                target = f"{self._output}{diagram}_{project_name}.{output_format}"
+                if output_format == "gv":
+                    self._copy(dot_path, target)
+                else:
+                    command = ["dot", f"-T{output_format}", dot_path, "-o", target]
+                    self._execute_command(command, check=True)
+            if not keep_dot:
+                os.remove(dot_path)
+
+    def _generate_batched_dot_files(self, project_name: str, imports: Iterable[str]):
+        """generates the dot files of a diagram with one pyreverse call per batch
+
+        Files are grouped by directory, so the modules of a package end up in the
+        same batch. Every batch also analyses the diagram files its modules import
+        directly, so inheritance and import edges between batches are kept. The
+        partial diagrams are merged into the dot files of the project.
+
+        Args:
+            project_name (str): how the project is called
+            imports (Iterable[str]): which files to include into UML diagram
+        """
+        files = list(dict.fromkeys(map(os.path.normpath, imports)))
+        files.sort(key=os.path.dirname)
+        batches = [
+            files[start : start + self._batch_size]
+            for start in range(0, len(files), self._batch_size)
+        ]
+        self._profiler.count("pyreverse_batches", len(batches))
+        members = set(files)
+        with tempfile.TemporaryDirectory(prefix="pydoxyuml_") as directory:
+            partials: Dict[str, List[str]] = {x: [] for x in DIAGRAMS}
+            for index, batch in enumerate(batches):
+                name = f"{project_name}_{index}"
+                context = [
+                    file
+                    for file in self._imported_files(batch)
+                    if file in members and file not in batch
+                ]
+                command = self._generate_pyreverse_command(
+                    name, [*batch, *context], "dot", directory + os.sep
                 )
-                local_files = map(lambda x: convert_to_file_path(x), local_imports)
-                imports.extend(
-                    list(
-                        map(
-                            lambda x: self._get_recursive_imports(
-                                x, recursion_level - 1
-                            ),
-                            local_files,
-                        )
+                self._execute_command(command, check=True)
+                for diagram, paths in partials.items():
+                    path = os.path.join(directory, f"{diagram}_{name}.dot")
+                    if os.path.isfile(path):
+                        paths.append(path)
+            for diagram, paths in partials.items():
+                if len(paths) > 0:
+                    merge_dot_files(
+                        paths,
+                        f"{self._output}{diagram}_{project_name}.dot",
+                        f"{diagram}_{project_name}",
                     )
-                )
-            if isinstance(node, ast.ImportFrom) and self._local_dir_filter(node.module):
-                file_path = convert_to_file_path(node.module)
-                imports.append(file_path)
-                imports.extend(
-                    self._get_recursive_imports(file_path, recursion_level - 1)
-                )
 
-        # filter for empty lists
-        imports = list(filter(lambda x: len(x) > 0, imports))
-        return imports
+    def _imported_files(self, files: Iterable[str]) -> List[str]:
+        """files of the local modules imported directly by given files
+
+        Args:
+            files (Iterable[str]): python files known to the import graph
+
+        Returns:
+            List[str]: imported files without duplicates
+        """
+        imported = []
+        for file in files:
+            try:
+                module = self._graph.module_of(file)
+            except KeyError:
+                continue
+            imported.extend(self._graph.files[x] for x in self._graph.imports(module))
+        return list(dict.fromkeys(map(os.path.normpath, imported)))
+
+    def _generate_pyreverse_command(
+        self,
+        project_name: str,
+        imports: Iterable[str],
+        output_format: str,
+        directory: Union[None, str] = None,
+    ) -> List[str]:
+        """generates pyreverse command and fills arguments into command
+
+        Args:
+            project_name (str): hoy the project is called
+            imports (Iterable[str]): which files to include into UML diagram
+            output_format (str): format pyreverse writes
+            directory (Union[None, str], optional): directory pyreverse writes
+                into. Defaults to the output directory.
+
+        Returns:
+            List[str]: build pyreverse command as argument list
+        """
+        directory = self._output if directory is None else directory
+        command = ["pyreverse", "-o", output_format, "-p", project_name]
+        command += ["-d", directory, *imports]
+        if self._colorized:
+            command.append("--colorized")
+        return command
+
+    def _get_imports_from_submodules(self, module_path: str) -> Iterable[str]:
+        """iterates through all python files in all subdirectories
+
+        Args:
+            module_path (str): root directory
+
+        Returns:
+            Iterable[str]: all files of the root directory followed by all local
+                files imported from them until recursion depth is reached. Every
+                file is contained once.
+        """
+        python_files = self._source_index().package_files(module_path)
+        modules = [self._graph.add_file(python_file) for python_file in python_files]
+        imported = self._graph.closure(modules, self._recursion_depth)
+        imported_files = map(lambda x: self._graph.files[x], imported)
+        return list(dict.fromkeys([*python_files, *imported_files]))
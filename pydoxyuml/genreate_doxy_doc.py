@@ -1,204 +1,587 @@
 """Module provides a class to generate Doxygen documentation
 based on google templated python code"""
 
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import hashlib
+import io
+import json
 import logging
-from typing import Any, List, Union
-import pkg_resources
-from pydoxyuml.documenter import Documenter
+import os
+import shutil
+import sys
+from typing import Any, Dict, Iterable, List, Tuple, Union
+from pydoxyuml.documenter import CommandResult, Documenter
+from pydoxyuml.doxyfile import (
+    OUTPUT_GENERATORS,
+    PRESETS,
+    Doxyfile,
+    parse_assignment,
+    quote,
+)
+from pydoxyuml.utils.cache import file_digest
+from pydoxyuml.utils.discovery import SourceIndex
+from pydoxyuml.utils.profiling import Profiler
+
+
+DOXYPYPY_ARGUMENTS = ["-a", "-c"]
+"""List[str]: arguments passed to doxypypy in front of the file to convert"""
+
+MANIFEST_NAME = ".pydoxyuml_manifest.json"
+"""str: file name of the incremental build manifest inside the output directory"""
+MANIFEST_VERSION = 2
+"""int: bumped whenever the manifest layout, the tmp/ layout or the conversion
+changes"""
+PARENT_DIRECTORY = "__parent__"
+"""str: stands for '..' in tmp/ for sources outside of the working directory"""
+SHARD_MANIFEST_NAME = "shard.json"
+"""str: file name of the description of a shard inside its output directory"""
+SHARD_TAGFILE_NAME = "shard.tag"
+"""str: file name of the doxygen tag file of a shard inside its output directory"""
+SHARD_VERSION = 1
+"""int: bumped whenever the layout of the shard description changes"""
+
+
+def doxypypy_importable() -> bool:
+    """checks if doxypypy can be used as a library from this interpreter
+
+    Returns:
+        bool: True if the doxypypy module is importable
+    """
+    try:
+        # pylint: disable-next=import-outside-toplevel,unused-import
+        from doxypypy import doxypypy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def doxypypy_filter_command() -> Union[None, str]:
+    """command doxygen can run as input filter to convert a python file
+
+    Returns:
+        Union[None, str]: doxypypy executable or module with its arguments. None if
+            doxypypy is neither on the PATH nor importable
+    """
+    executable = shutil.which("doxypypy")
+    if executable is not None:
+        command = [executable]
+    elif doxypypy_importable():
+        command = [sys.executable, "-m", "doxypypy.doxypypy"]
+    else:
+        return None
+    return " ".join([*command, *DOXYPYPY_ARGUMENTS])
+
+
+def text_digest(text: str) -> str:
+    """computes hash of a string
+
+    Args:
+        text (str): string to hash
+
+    Returns:
+        str: hex digest of the string
+    """
+    return hashlib.sha256(text.encode("UTF-8")).hexdigest()
+
+
+def shard_files(files: Iterable[str], index: int, count: int) -> List[str]:
+    """deterministic subset of files documented by one of several shards
+
+    The files are sorted by path and split into count contiguous slices of
+    nearly equal length, so every shard gets whole packages where possible and
+    the slices do not depend on the order in which the inputs were walked.
+
+    Args:
+        files (Iterable[str]): python files of all inputs
+        index (int): shard to select, starting at 1
+        count (int): total number of shards
+
+    Returns:
+        List[str]: sorted files of the shard
+    """
+    files = sorted(set(files))
+    return files[(index - 1) * len(files) // count : index * len(files) // count]
+
+
+def convert_in_process(python_file: str, destination: str) -> Union[None, str]:
+    """runs the doxypypy filter as a library and writes the result to destination
+
+    doxypypy only exposes its command line entry point, so its arguments and
+    its output are routed through sys.argv and sys.stdout of this interpreter.
+    Both are global to the process, so this function only runs in the worker
+    processes of DoxyDocumenter, where no other thread reads or prints.
+
+    Args:
+        python_file (str): python file to convert
+        destination (str): path of the converted file
+
+    Returns:
+        Union[None, str]: error message or None if the conversion succeeded
+    """
+    from doxypypy import doxypypy  # pylint: disable=import-outside-toplevel
+
+    logging.debug(f"doxypypy (in-process) {python_file} > {destination}")
+    buffer = io.StringIO()
+    argv = sys.argv
+    sys.argv = ["doxypypy", *DOXYPYPY_ARGUMENTS, python_file]
+    try:
+        with redirect_stdout(buffer):
+            doxypypy.main()
+    except SystemExit as error:
+        if error.code not in (None, 0):
+            return f"exit code {error.code}"
+    except Exception as error:  # pylint: disable=broad-except
+        return f"{type(error).__name__}: {error}"
+    finally:
+        sys.argv = argv
+
+    try:
+        with open(destination, "w", encoding="UTF-8") as file:
+            file.write(buffer.getvalue())
+    except OSError as error:
+        return str(error)
+    return None
 
 
 class DoxyDocumenter(Documenter):
     """Class to document code in doxygen"""
 
     def __init__(
-        self, input: List[str], output: str, doxyfile: str, title: str, style_sheet: str
+        self,
+        input: List[str],
+        output: str,
+        doxyfile: Union[None, str],
+        title: str,
+        style_sheet: str,
+        jobs: int = 1,
+        engine: str = "inprocess",
+        incremental: bool = False,
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        index: Union[None, SourceIndex] = None,
+        doxy_set: Iterable[str] = (),
+        threads: Union[None, int] = None,
+        outputs: Union[None, List[str]] = None,
+        preset: Union[None, str] = None,
+        preprocess: str = "tmp",
+        base_dir: Union[None, str] = None,
+        shard: Union[None, Tuple[int, int]] = None,
     ) -> None:
-        super().__init__(input, output)
-        self._doxy_path: str = doxyfile
-        """str: path to doxyfile"""
-        self._doxyfile: List[str]
-        """List[str]: variable contains content of doxyfile"""
+        super().__init__(
+            input, output, jobs, timeout, profiler, exclude, gitignore, index, base_dir
+        )
+        self._doxy_path: Union[None, str] = doxyfile
+        """Union[None, str]: path to doxyfile. None -> use the bundled template"""
+        self._doxyfile: Doxyfile
+        """Doxyfile: keys and values of the doxyfile"""
+        self._doxy_set = list(doxy_set)
+        """List[str]: assignments like 'KEY=VALUE' applied to the Doxyfile last"""
+        self._threads = threads
+        """Union[None, int]: doxygen worker threads for parsing and dot. 0 -> all
+        cores, None -> as in the Doxyfile"""
+        self._outputs = outputs
+        """Union[None, List[str]]: output formats like 'html'. None -> as in the
+        Doxyfile"""
+        self._preset = preset
+        """Union[None, str]: name of a set of Doxyfile keys from PRESETS"""
+        if preset is not None and preset not in PRESETS:
+            raise ValueError(f"unknown preset '{preset}'")
+        self._shard = None if shard is None else tuple(shard)
+        """Union[None, Tuple[int, int]]: index starting at 1 and total number of
+        shards. Only the files of this shard are documented. None -> all files"""
+        if self._shard is not None and not 1 <= self._shard[0] <= self._shard[1]:
+            raise ValueError(f"invalid shard {self._shard[0]}/{self._shard[1]}")
+        unknown = set(outputs or []) - set(OUTPUT_GENERATORS)
+        if len(unknown) > 0:
+            raise ValueError(f"unknown outputs {' '.join(sorted(unknown))}")
+        # fail before any work is done if an assignment is malformed
+        for assignment in self._doxy_set:
+            parse_assignment(assignment)
         self._tmp_dir = self._output + "tmp/"
         self._title = title
         self._style_sheet_path = style_sheet
+        self._engine = engine
+        """str: either 'inprocess' to use doxypypy as library or 'subprocess'"""
+        self._incremental = incremental
+        """bool: keep tmp/ between runs and only convert changed files"""
+        self._preprocess = preprocess
+        """str: 'tmp' to convert all files into tmp/ before doxygen runs or 'filter'
+        to let doxygen call doxypypy as input filter"""
+        self._filter_command: Union[None, str] = None
+        """Union[None, str]: doxypypy command doxygen runs as input filter"""
+        self._manifest_path = self._output + MANIFEST_NAME
+        """str: path to manifest with content hashes of the last incremental run"""
 
     def __call__(self, *args: Any, **kwds: Any) -> Any:
+        self._errors = []
         # create output directory
         self._create_directory(self._output)
-        self._doxyfile = self._load_doxyfile(self._doxy_path)
-        # create tmp/ directory
-        self._create_directory(self._tmp_dir)
-
-        # create same folder structure in tmp/ as for given projects
-        for module_path in self._input:
-            python_files = glob.glob(
-                module_path.rstrip("/") + "/**/*.py", recursive=True
+        with self._profiler.stage("load doxyfile"):
+            self._doxyfile = self._load_doxyfile(self._doxy_path)
+        filter_mode = self._preprocess == "filter"
+        if filter_mode:
+            self._filter_command = doxypypy_filter_command()
+            if self._filter_command is None:
+                logging.warning(
+                    "doxypypy is neither on the PATH nor importable. "
+                    + "Fall back to preprocessing into tmp/."
+                )
+                filter_mode = False
+        if not filter_mode:
+            # create tmp/ directory
+            self._create_directory(self._tmp_dir)
+
+        python_files = self._python_files()
+        shard = list(python_files)
+        if self._shard is not None:
+            logging.info(
+                f"shard {self._shard[0]}/{self._shard[1]} documents "
+                + f"{len(shard)} files"
             )
-            directories = set(
-                map(
-                    lambda x: self._tmp_dir
-                    + ("/".join(x.split("/")[:-1]).lstrip("../")),
-                    python_files,
+
+        manifest = {"files": {}, "doxyfile": None}
+        file_hashes = {}
+        removed_files = []
+        if self._incremental:
+            with self._profiler.stage("change detection"):
+                manifest = self._load_manifest()
+                file_hashes = {file: file_digest(file) for file in python_files}
+                removed_files = self._remove_stale_files(
+                    manifest["files"], file_hashes
                 )
+                python_files = [
+                    file
+                    for file in python_files
+                    if manifest["files"].get(file) != file_hashes[file]
+                    or not (filter_mode or os.path.isfile(self._tmp_path(file)))
+                ]
+            logging.info(
+                f"{len(python_files)} files changed, {len(removed_files)} files removed"
             )
-            self._create_directories(directories)
-            self._call_doxypypy(python_files)
 
-        self._alter_doxyfile()
-        self._generate_documentation()
-        self._cleanup()
+        failures = []
+        if not filter_mode:
+            with self._profiler.stage("doxypypy conversion"):
+                # create same folder structure in tmp/ as for given projects
+                directories = set(
+                    map(lambda x: os.path.dirname(self._tmp_path(x)), python_files)
+                )
+                self._create_directories(directories)
+                failures = self._call_doxypypy(python_files)
+            self._profiler.count("converted_files", len(python_files))
+            self._profiler.count("failed_conversions", len(failures))
+
+        with self._profiler.stage("doxyfile rewrite"):
+            self._alter_doxyfile(filter_mode)
+        if not self._incremental:
+            with self._profiler.stage("doxygen"):
+                self._generate_documentation()
+            with self._profiler.stage("cleanup"):
+                self._cleanup()
+            self._write_shard_manifest(shard)
+            self._log_command_summary()
+            return
+        if filter_mode:
+            # converted files of a previous run in tmp mode are not needed anymore
+            self._cleanup()
+
+        doxyfile_hash = text_digest(self._doxyfile.render())
+        if (
+            len(python_files) == 0
+            and len(removed_files) == 0
+            and doxyfile_hash == manifest["doxyfile"]
+        ):
+            logging.info("sources and Doxyfile are unchanged. Skip doxygen.")
+        else:
+            with self._profiler.stage("doxygen"):
+                result = self._generate_documentation()
+            if not result.ok:
+                # forces doxygen to run again next time
+                doxyfile_hash = None
+        # failed conversions are retried by the next run
+        for python_file in failures:
+            file_hashes.pop(python_file)
+        self._write_manifest(file_hashes, doxyfile_hash)
+        self._write_shard_manifest(shard)
+        self._log_command_summary()
+
+    def _python_files(self) -> List[str]:
+        """python files documented by this run
+
+        Returns:
+            List[str]: files of all inputs or of the shard if one is given
+        """
+        python_files = self._source_index().all_files()
+        if self._shard is None:
+            return python_files
+        return shard_files(python_files, *self._shard)
 
-    def _load_doxyfile(self, doxyfile: Union[None, str]) -> List[str]:
-        """loads Doxyfile form filesystem as txt file
+    def _write_shard_manifest(self, python_files: List[str]):
+        """describes the output of a shard for 'merge'
 
         Args:
-            doxyfile (Union[None, str]): path to Doxyfile.
-                If None -> use the default Doxyfile installed with this package
+            python_files (List[str]): files documented by this shard
+        """
+        if self._shard is None:
+            return
+        index, count = self._shard
+        manifest = {
+            "version": SHARD_VERSION,
+            "index": index,
+            "count": count,
+            "title": self._title,
+            "files": [os.path.relpath(x, self._current_dir) for x in python_files],
+            "tagfile": SHARD_TAGFILE_NAME,
+            "html": self._doxyfile.get("HTML_OUTPUT", "html").strip('"') or "html",
+            "xml": self._doxyfile.get("XML_OUTPUT", "xml").strip('"') or "xml",
+        }
+        with open(self._output + SHARD_MANIFEST_NAME, "w", encoding="UTF-8") as file:
+            json.dump(manifest, file, indent=1)
+
+    def _tmp_path(self, python_file: str) -> str:
+        """path of the doxypypy output for a given python file in the tmp directory
+
+        The tmp directory mirrors the path of the file relative to the working
+        directory. Leading '..' segments are kept as PARENT_DIRECTORY, so files
+        inside and outside of the working directory never share a tmp path.
+
+        Args:
+            python_file (str): path to python source file
 
         Returns:
-            List[str]: lines from Doxyfile
+            str: path inside self._tmp_dir
         """
-        if doxyfile is None:
-            self._generate_doxyfile()
-            path = self._output + "Doxyfile"
-        else:
-            path = doxyfile
-        return self._load_text_file(path)
+        relative = os.path.relpath(
+            os.path.join(self._current_dir, python_file), self._current_dir
+        )
+        segments = [
+            PARENT_DIRECTORY if segment == os.pardir else segment
+            for segment in relative.split(os.sep)
+        ]
+        return os.path.join(self._tmp_dir, *segments)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """loads the manifest of the previous incremental run
+
+        Converted files of a manifest with another version may be laid out
+        differently in tmp/, so they are removed.
 
-    def _generate_doxyfile(self):
-        command = f"doxygen -g {self._output}Doxyfile"
-        self._execute_command(command)
+        Returns:
+            Dict[str, Any]: source file hashes under 'files' and the hash of the
+                Doxyfile under 'doxyfile'. Empty if there was no previous run.
+        """
+        try:
+            with open(self._manifest_path, "r", encoding="UTF-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {"files": {}, "doxyfile": None}
+        if manifest.get("version") != MANIFEST_VERSION:
+            logging.info("manifest of an older version. Convert all files again.")
+            self._remove_directory(self._tmp_dir)
+            return {"files": {}, "doxyfile": None}
+        return manifest
+
+    def _write_manifest(
+        self, file_hashes: Dict[str, str], doxyfile_hash: Union[None, str]
+    ):
+        """stores the state of this run for the next incremental run
+
+        Args:
+            file_hashes (Dict[str, str]): content hash per converted source file
+            doxyfile_hash (Union[None, str]): hash of the Doxyfile doxygen ran with.
+                None if doxygen has to run again
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "files": dict(sorted(file_hashes.items())),
+            "doxyfile": doxyfile_hash,
+        }
+        with open(self._manifest_path, "w", encoding="UTF-8") as file:
+            json.dump(manifest, file, indent=1)
 
-    @staticmethod
-    def _load_text_file(path: str) -> List[str]:
-        """loads text file from file system
+    def _remove_stale_files(
+        self, previous_hashes: Dict[str, str], file_hashes: Dict[str, str]
+    ) -> List[str]:
+        """removes converted files from tmp directory whose source was deleted
 
         Args:
-            path (str): path to text file
+            previous_hashes (Dict[str, str]): file hashes from the previous run
+            file_hashes (Dict[str, str]): file hashes of the current run
 
         Returns:
-            List[str]: individual lines of text file
+            List[str]: source files which were removed since the previous run
         """
-        with open(path, "r", encoding="UTF-8") as file:
-            lines = file.readlines()
-        return lines
+        removed_files = sorted(set(previous_hashes) - set(file_hashes))
+        for python_file in removed_files:
+            logging.debug(f"remove {self._tmp_path(python_file)}")
+            try:
+                os.remove(self._tmp_path(python_file))
+            except FileNotFoundError:
+                pass
+        return removed_files
 
-    @staticmethod
-    def _write_text_file(path: str, content: List[str]):
-        """write given lines into textfile
+    def _load_doxyfile(self, doxyfile: Union[None, str]) -> Doxyfile:
+        """loads Doxyfile form filesystem
 
         Args:
-            path (str): where to write the text file
-            content (str):
+            doxyfile (Union[None, str]): path to Doxyfile.
+                If None -> use the Doxyfile template installed with this package
+
+        Returns:
+            Doxyfile: parsed Doxyfile
         """
-        with open(path, "w", encoding="UTF-8") as file:
-            file.writelines(content)
+        if doxyfile is None:
+            return Doxyfile.template()
+        return Doxyfile.load(doxyfile)
 
-    def _call_doxypypy(self, python_files: List[str]):
+    def _call_doxypypy(self, python_files: List[str]) -> List[str]:
         """call doxypypy on a given list of files to copy in self._output/tmp directory
 
+        Conversions are distributed over a pool of at most self._jobs workers. Every
+        file is written to its own destination, so the result in tmp/ does not depend
+        on the order in which the workers finish.
+
         Args:
             python_files (List[str]): list of python files to apply to doxypypy on and
                 add into self._output/tmp directory
-        """
-        for python_file in python_files:
-            command = f"doxypypy -a -c {python_file} > {self._tmp_dir+python_file.lstrip('../')}"
-            self._execute_command(command)
 
-    def _alter_doxyfile(self):
-        """alter Doxyfile at:
-        - Project_NAME
-        - INPUT
-        - OUTPUT_DIRECTORY
+        Returns:
+            List[str]: python files doxypypy failed on
         """
-        title_str = "PROJECT_NAME           ="
-        input_str = "INPUT                  ="
-        output_str = "OUTPUT_DIRECTORY       ="
-        html_style_sheet_str = "HTML_EXTRA_STYLESHEET  ="
-        recursive_str = "RECURSIVE              ="
-        index_to_remove = []
-        for line_idx in range(len(self._doxyfile)):
-            # alter input directory
-            if (
-                input_str in self._doxyfile[line_idx]
-                and self._tmp_dir not in self._doxyfile[line_idx]
-            ):
-                self._doxyfile[line_idx] = self._add_doxy_content(
-                    self._doxyfile[line_idx], f" {self._tmp_dir}"
-                )
-                logging.debug("altered input directory")
-            # alter title to custom
-            elif title_str in self._doxyfile[line_idx]:
-                title_line = self._doxyfile[line_idx]
-                title_line = title_line.split("=")[0]
-                title_line = self._add_doxy_content(title_line + "=", self._title)
-                self._doxyfile[line_idx] = title_line
-                logging.debug("altered title")
-            # alter output_directory
-            elif output_str in self._doxyfile[line_idx]:
-                self._doxyfile[line_idx] = self._add_doxy_content(
-                    self._doxyfile[line_idx], f" {self._output}"
+        python_files = sorted(python_files)
+        destinations = list(map(self._tmp_path, python_files))
+
+        if self._engine == "inprocess" and doxypypy_importable():
+            errors = self._convert_in_process(python_files, destinations)
+        else:
+            if self._engine == "inprocess":
+                logging.warning(
+                    "doxypypy is not importable from this interpreter. "
+                    + "Fall back to the doxypypy executable."
                 )
-                logging.debug("altered output directory")
-            # alter html style sheed
-            elif html_style_sheet_str in self._doxyfile[line_idx]:
-                if self._style_sheet_path is None:
-                    index_to_remove.append(line_idx)
-                else:
-                    self._doxyfile[line_idx] = self._add_doxy_content(
-                        self._doxyfile[line_idx], self._style_sheet_path
-                    )
-            # alter recursive state
-            elif recursive_str in self._doxyfile[line_idx]:
-                self._doxyfile[line_idx] = self._replace_doxy_content(
-                    self._doxyfile[line_idx], "YES"
+            futures = [
+                self._runner.submit(
+                    ["doxypypy", *DOXYPYPY_ARGUMENTS, python_file],
+                    stdout_path=destination,
                 )
+                for python_file, destination in zip(python_files, destinations)
+            ]
+            errors = [
+                None if result.ok else result.error_message()
+                for result in (future.result() for future in futures)
+            ]
+            self._runner.shutdown()
 
-        # remove indices
-        for index in index_to_remove[::-1]:
-            self._doxyfile.pop(index)
+        failures = [
+            (file, error)
+            for file, error in zip(python_files, errors)
+            if error is not None
+        ]
+        for python_file, error in failures:
+            self._error(f"doxypypy failed on {python_file}: {error}")
+        if len(failures) > 0:
+            logging.warning(
+                f"doxypypy failed on {len(failures)} of {len(python_files)} files"
+            )
+        return [python_file for python_file, _ in failures]
 
-        self._write_text_file(self._output + "Doxyfile", self._doxyfile)
+    def _convert_in_process(
+        self, python_files: List[str], destinations: List[str]
+    ) -> List[Union[None, str]]:
+        """convert files with doxypypy imported as a library
 
-    @staticmethod
-    def _add_doxy_content(line: str, content: str) -> str:
-        """adds line at the back of a given line but before '\\n'
+        The files are sharded over a pool of long-lived worker processes, which
+        import doxypypy only once each. Even with one job the conversion runs in
+        a worker, because doxypypy writes to sys.stdout, which would capture the
+        output of all other threads of this process.
 
         Args:
-            line (str): line to alter
-            content (str): content to add after = but before '\\n'
+            python_files (List[str]): python files to convert
+            destinations (List[str]): where to write the converted files
 
         Returns:
-            str: altered line
+            List[Union[None, str]]: error message per file, None on success
         """
-        line = line.rstrip("\n")
-        line += f" {content}"
-        line += "\n"
-        return line
+        if len(python_files) == 0:
+            return []
 
-    @staticmethod
-    def _replace_doxy_content(line: str, content: str) -> str:
-        """method will replace everythin on right side of "=" and put content into
+        workers = min(self._jobs, len(python_files))
+        chunksize = max(1, len(python_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    convert_in_process, python_files, destinations, chunksize=chunksize
+                )
+            )
+
+    def _alter_doxyfile(self, filter_mode: bool = False):
+        """alter Doxyfile at:
+        - PROJECT_NAME
+        - INPUT
+        - FILTER_PATTERNS in filter mode
+        - OUTPUT_DIRECTORY
+        - HTML_EXTRA_STYLESHEET
+        - RECURSIVE
+        followed by the preset, the output formats, the number of threads, the xml
+        output and tag file of a shard and the assignments given with doxy_set
 
         Args:
-            line (str): line to alter
-            content (str): content to put on the right sight of "="
+            filter_mode (bool, optional): doxygen reads the python files itself and
+                converts them with doxypypy as input filter. Otherwise it reads the
+                converted files in tmp/. Defaults to False.
+        """
+        self._doxyfile["PROJECT_NAME"] = quote(self._title)
+        if filter_mode:
+            python_files = self._python_files()
+            self._doxyfile.append(
+                "INPUT", " ".join(quote(os.path.abspath(x)) for x in python_files)
+            )
+            self._doxyfile.append(
+                "FILTER_PATTERNS", quote(f"*.py={self._filter_command}")
+            )
+        elif self._tmp_dir not in self._doxyfile.get("INPUT"):
+            self._doxyfile.append("INPUT", quote(self._tmp_dir))
+        self._doxyfile["OUTPUT_DIRECTORY"] = quote(self._output)
+        if self._style_sheet_path is None:
+            self._doxyfile.remove("HTML_EXTRA_STYLESHEET")
+        else:
+            self._doxyfile.append(
+                "HTML_EXTRA_STYLESHEET", quote(self._style_sheet_path)
+            )
+        self._doxyfile["RECURSIVE"] = "YES"
+        if self._preset is not None:
+            self._doxyfile.update(PRESETS[self._preset])
+        if self._outputs is not None:
+            self._doxyfile.update(
+                {
+                    key: "YES" if output in self._outputs else "NO"
+                    for output, key in OUTPUT_GENERATORS.items()
+                }
+            )
+        if self._threads is not None:
+            self._doxyfile["NUM_PROC_THREADS"] = str(self._threads)
+            self._doxyfile["DOT_NUM_THREADS"] = str(self._threads)
+        if self._shard is not None:
+            # 'merge' combines the xml of all shards and links them by tag files
+            self._doxyfile["GENERATE_XML"] = "YES"
+            self._doxyfile["GENERATE_TAGFILE"] = quote(
+                self._output + SHARD_TAGFILE_NAME
+            )
+        for assignment in self._doxy_set:
+            self._doxyfile.assign(assignment)
+        logging.debug("altered Doxyfile")
+
+    def _generate_documentation(self) -> CommandResult:
+        """write the altered Doxyfile and run doxygen with it on hostsystem
 
         Returns:
-            str: altered line
+            CommandResult: result of the doxygen run
         """
-        line = line.rstrip("\n")
-        key = line.split("=")[0]
-        line = key + "= " + content + "\n"
-        return line
-
-    def _generate_documentation(self):
-        """generate doxygen command and execute it on hostsystem"""
-        command = f"doxygen {self._output +'Doxyfile'}"
-        self._execute_command(command)
+        return self._run_doxygen(self._doxyfile)
 
     def _cleanup(self):
         """remove temporary directory from filesystem"""
-        command = f"rm -r {self._tmp_dir}"
-        self._execute_command(command)
+        self._remove_directory(self._tmp_dir)
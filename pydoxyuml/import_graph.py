@@ -0,0 +1,473 @@
+"""Module provides a graph of local python modules connected by their imports"""
+
+from collections import deque
+import fnmatch
+import os
+import threading
+from typing import Dict, Iterable, List, Set, Union
+
+from pydoxyuml.utils.cache import SourceCache, collect_imports
+from pydoxyuml.utils.discovery import (
+    DEFAULT_EXCLUDES,
+    module_name_from_path,
+    walk_sources,
+)
+
+
+def absolute_module(
+    package: str, module: Union[None, str], level: int
+) -> Union[None, str]:
+    """converts the module of a (relative) import into an absolute module name
+
+    Args:
+        package (str): package the importing module belongs to
+        module (Union[None, str]): module as written in the import statement
+        level (int): number of leading dots of the import statement
+
+    Returns:
+        Union[None, str]: absolute module name. None if the import reaches
+            beyond the top level package
+    """
+    if level == 0:
+        return module or None
+    parts = package.split(".") if package else []
+    if level - 1 > len(parts):
+        return None
+    parts = parts[: len(parts) - (level - 1)]
+    if module:
+        parts.append(module)
+    return ".".join(parts) or None
+
+
+def package_of(module: str, path: str) -> str:
+    """package a module belongs to
+
+    Args:
+        module (str): dotted module name
+        path (str): path to the file of the module
+
+    Returns:
+        str: module itself for '__init__.py' files, its parent package otherwise
+    """
+    if os.path.basename(path) == "__init__.py":
+        return module
+    return module.rpartition(".")[0]
+
+
+class ModuleResolver:
+    """maps dotted module names to files below a list of search paths
+
+    A top level name is looked up once: its directory is walked a single time in
+    every search path containing it and all modules below it are stored in a
+    dict, so later lookups are dict accesses which never touch the file system.
+    Regular packages shadow modules of the same name and earlier search paths
+    shadow later ones, like sys.path does. Directories without '__init__.py' are
+    namespace packages. Not thread safe, ImportGraph serializes all lookups.
+    """
+
+    def __init__(
+        self,
+        search_paths: Iterable[str],
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+    ) -> None:
+        self.search_paths = list(dict.fromkeys(map(os.path.normpath, search_paths)))
+        """List[str]: directories modules are resolved against in given order"""
+        self._exclude = list(exclude)
+        self._gitignore = gitignore
+        self._modules: Dict[str, str] = {}
+        """Dict[str, str]: file path per module name of all scanned top levels"""
+        self._packages: Set[str] = set()
+        """Set[str]: regular and namespace packages of all scanned top levels"""
+        self._scanned: Set[str] = set()
+        """Set[str]: top level names which were looked up already"""
+        self._listings: Dict[str, Dict[str, bool]] = {}
+        """Dict[str, Dict[str, bool]]: entries per search path, True for
+        directories"""
+
+    def find(
+        self, module: Union[None, str], package: str = "", level: int = 0
+    ) -> Union[None, str]:
+        """file of a module
+
+        Args:
+            module (Union[None, str]): dotted module name as written in the import
+                statement
+            package (str, optional): package of the importing module. Only used
+                for relative imports. Defaults to "".
+            level (int, optional): number of leading dots of a relative import.
+                Defaults to 0.
+
+        Returns:
+            Union[None, str]: path to the python file. None for unknown modules
+                and namespace packages
+        """
+        module = absolute_module(package, module, level)
+        if module is None:
+            return None
+        self._scan(module.partition(".")[0])
+        return self._modules.get(module)
+
+    def is_package(self, module: str) -> bool:
+        """decides if a dotted name is a local regular or namespace package
+
+        Args:
+            module (str): dotted module name
+
+        Returns:
+            bool: True if a directory exists for the module
+        """
+        self._scan(module.partition(".")[0])
+        return module in self._packages
+
+    def is_local(self, module: str) -> bool:
+        """decides if the top level module of a dotted name is local
+
+        Args:
+            module (str): dotted module name like 'numpy.linalg'
+
+        Returns:
+            bool: True if the first part of the name is a local module or package
+        """
+        top_level = module.partition(".")[0]
+        return self.find(top_level) is not None or self.is_package(top_level)
+
+    def clear(self):
+        """forgets all lookups, so added and removed files are found"""
+        self._modules.clear()
+        self._packages.clear()
+        self._scanned.clear()
+        self._listings.clear()
+
+    def _scan(self, top_level: str):
+        """registers all modules of a top level name in every search path
+
+        Args:
+            top_level (str): first part of a dotted module name
+        """
+        if top_level in self._scanned:
+            return
+        self._scanned.add(top_level)
+        if len(top_level) == 0 or self._excluded(top_level):
+            return
+        for base in self.search_paths:
+            listing = self._listing(base)
+            if listing.get(top_level) is True:
+                files, _ = walk_sources(
+                    os.path.join(base, top_level), self._exclude, self._gitignore
+                )
+                # '__init__.py' files first, so packages shadow equally named modules
+                files.sort(key=lambda x: os.path.basename(x) != "__init__.py")
+                for file in files:
+                    module = module_name_from_path(file, base)
+                    self._modules.setdefault(module, file)
+                    parts = os.path.relpath(os.path.dirname(file), base).split(os.sep)
+                    for end in range(1, len(parts) + 1):
+                        self._packages.add(".".join(parts[:end]))
+            if listing.get(f"{top_level}.py") is False:
+                file = os.path.join(base, f"{top_level}.py")
+                self._modules.setdefault(top_level, os.path.normpath(file))
+
+    def _listing(self, base: str) -> Dict[str, bool]:
+        """entries of a search path, read once
+
+        Args:
+            base (str): search path
+
+        Returns:
+            Dict[str, bool]: True for directories, False for files per name
+        """
+        if base not in self._listings:
+            listing = {}
+            try:
+                with os.scandir(base) as iterator:
+                    for entry in iterator:
+                        listing[entry.name] = entry.is_dir()
+            except OSError:
+                pass
+            self._listings[base] = listing
+        return self._listings[base]
+
+    def _excluded(self, name: str) -> bool:
+        """decides if a top level name matches an exclude glob
+
+        Args:
+            name (str): top level directory or module name
+
+        Returns:
+            bool: True if the name must not be resolved
+        """
+        return any(
+            fnmatch.fnmatch(name, pattern)
+            for pattern in [*DEFAULT_EXCLUDES, *self._exclude]
+        )
+
+
+def strongly_connected_components(
+    nodes: Iterable[str], edges: Dict[str, List[str]]
+) -> List[List[str]]:
+    """computes strongly connected components with an iterative Tarjan algorithm
+
+    Args:
+        nodes (Iterable[str]): nodes of the graph
+        edges (Dict[str, List[str]]): successors per node. Missing nodes have none
+
+    Returns:
+        List[List[str]]: components in reverse topological order
+    """
+    index: Dict[str, int] = {}
+    low_link: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components = []
+    counter = 0
+
+    for start in nodes:
+        if start in index:
+            continue
+        index[start] = low_link[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(edges.get(start, [])))]
+        while len(work) > 0:
+            node, successors = work[-1]
+            descended = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low_link[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edges.get(successor, []))))
+                    descended = True
+                    break
+                if successor in on_stack:
+                    low_link[node] = min(low_link[node], index[successor])
+            if descended:
+                continue
+            work.pop()
+            if len(work) > 0:
+                parent = work[-1][0]
+                low_link[parent] = min(low_link[parent], low_link[node])
+            if low_link[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+class ImportGraph:
+    """directed graph with local modules as nodes and imports as edges
+
+    Nodes are registered for every file of the input roots. Edges of a module are
+    computed the first time they are requested and memoized, so every file is
+    parsed at most once no matter how many modules import it.
+    """
+
+    def __init__(
+        self,
+        search_paths: Iterable[str],
+        cache: SourceCache,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+    ) -> None:
+        self._search_paths = list(
+            dict.fromkeys(map(lambda x: os.path.relpath(x), search_paths))
+        )
+        """List[str]: directories imports are resolved against, relative to cwd"""
+        self._resolver = ModuleResolver(self._search_paths, exclude, gitignore)
+        """ModuleResolver: file lookup of modules which are not registered"""
+        self._cache = cache
+        self.files: Dict[str, str] = {}
+        """Dict[str, str]: file path per module name"""
+        self.edges: Dict[str, List[str]] = {}
+        """Dict[str, List[str]]: imported local modules per expanded module"""
+        self._resolved: Dict[str, Union[None, str]] = {}
+        """Dict[str, Union[None, str]]: memoized module name lookups"""
+        self._modules: Dict[str, str] = {}
+        """Dict[str, str]: module name per absolute file path"""
+        self._lock = threading.RLock()
+        """threading.RLock: allows diagram jobs of several threads to share the graph"""
+
+    def add_file(self, path: str) -> str:
+        """registers a python file as node
+
+        Args:
+            path (str): path to python file
+
+        Returns:
+            str: module name of the file
+        """
+        path = os.path.normpath(path)
+        bases = [
+            base
+            for base in self._search_paths
+            if not os.path.relpath(path, base).startswith("..")
+        ]
+        base = max(bases, key=len) if len(bases) > 0 else os.path.dirname(path)
+        module = module_name_from_path(path, base)
+        with self._lock:
+            self.files.setdefault(module, path)
+            self._modules.setdefault(os.path.abspath(path), module)
+            self._resolved[module] = module
+        return module
+
+    def invalidate(self, paths: Iterable[str], structural: bool = False):
+        """forgets the memoized imports of changed files
+
+        Args:
+            paths (Iterable[str]): paths of modified python files
+            structural (bool, optional): files were added or removed, so every
+                lookup is repeated. Defaults to False.
+        """
+        with self._lock:
+            if structural:
+                self.files.clear()
+                self.edges.clear()
+                self._resolved.clear()
+                self._modules.clear()
+                self._resolver.clear()
+                return
+            for path in paths:
+                module = self._modules.get(os.path.abspath(path))
+                if module is not None:
+                    self.edges.pop(module, None)
+
+    def module_of(self, path: str) -> str:
+        """module name of a file known to the graph
+
+        Args:
+            path (str): path to python file
+
+        Returns:
+            str: module name
+        """
+        return self._modules[os.path.abspath(path)]
+
+    def resolve(self, module: str) -> Union[None, str]:
+        """looks up a local module by its dotted name
+
+        Args:
+            module (str): dotted module name like 'pkg.sub.mod'
+
+        Returns:
+            Union[None, str]: module name if a local file exists for it, else None
+        """
+        with self._lock:
+            if module in self._resolved:
+                return self._resolved[module]
+            if not module:
+                return None
+            result = None
+            path = self._resolver.find(module)
+            if path is not None:
+                self.files.setdefault(module, path)
+                self._modules.setdefault(os.path.abspath(path), module)
+                result = module
+            self._resolved[module] = result
+            return result
+
+    def imports(self, module: str) -> List[str]:
+        """local modules imported by a given module
+
+        Handles 'import x.y', 'from x import y' and relative imports. Names which
+        are no module themselves (e.g. classes) are mapped to their module.
+
+        Args:
+            module (str): module name of a registered or resolved module
+
+        Returns:
+            List[str]: imported local modules without duplicates
+        """
+        with self._lock:
+            if module not in self.edges:
+                self.edges[module] = self._collect_edges(module)
+            return self.edges[module]
+
+    def _collect_edges(self, module: str) -> List[str]:
+        """resolves the import statements of a module to local modules
+
+        Args:
+            module (str): module name of a registered or resolved module
+
+        Returns:
+            List[str]: imported local modules without duplicates
+        """
+        package = package_of(module, self.files[module])
+
+        targets = []
+        for kind, imported, names, level in self._cache.extract(
+            self.files[module], "imports", collect_imports
+        ):
+            if kind == "import":
+                targets.append(self._resolve_prefix(imported))
+                continue
+            imported = absolute_module(package, imported, level)
+            if imported is None:
+                continue
+            for name in names:
+                target = self.resolve(f"{imported}.{name}") if name != "*" else None
+                targets.append(target or self._resolve_prefix(imported))
+
+        return [
+            target
+            for target in dict.fromkeys(targets)
+            if target is not None and target != module
+        ]
+
+    def closure(self, modules: Iterable[str], depth: int) -> List[str]:
+        """breadth first traversal along imports
+
+        Args:
+            modules (Iterable[str]): modules to start from
+            depth (int): maximum number of import hops
+
+        Returns:
+            List[str]: reached modules which are not part of modules, in order of
+                discovery
+        """
+        visited = set(modules)
+        frontier = deque(modules)
+        reached = []
+        for _ in range(depth):
+            next_frontier = deque()
+            while len(frontier) > 0:
+                for target in self.imports(frontier.popleft()):
+                    if target not in visited:
+                        visited.add(target)
+                        reached.append(target)
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return reached
+
+    def cycles(self) -> List[List[str]]:
+        """import cycles between the modules expanded so far
+
+        Returns:
+            List[List[str]]: strongly connected components with more than one module
+        """
+        components = strongly_connected_components(self.edges, self.edges)
+        return [sorted(component) for component in components if len(component) > 1]
+
+    def _resolve_prefix(self, module: str) -> Union[None, str]:
+        """resolves the longest prefix of a dotted name which is a local module
+
+        Args:
+            module (str): dotted name like 'pkg.mod.Class'
+
+        Returns:
+            Union[None, str]: module name or None if no prefix is local
+        """
+        parts = module.split(".")
+        while len(parts) > 0:
+            resolved = self.resolve(".".join(parts))
+            if resolved is not None:
+                return resolved
+            parts.pop()
+        return None
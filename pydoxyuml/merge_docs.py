@@ -0,0 +1,272 @@
+"""Module provides a class to merge the doxygen output of several shards into one
+browsable site"""
+
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Union
+from xml.etree import ElementTree
+
+from pydoxyuml.documenter import CommandResult, Documenter
+from pydoxyuml.doxyfile import OUTPUT_GENERATORS, Doxyfile, parse_assignment, quote
+from pydoxyuml.genreate_doxy_doc import SHARD_MANIFEST_NAME, SHARD_VERSION
+from pydoxyuml.utils.profiling import Profiler
+
+
+SHARDS_DIRECTORY = "shards"
+"""str: directory inside the merged html output with the html of every shard"""
+MAINPAGE_NAME = "mainpage.dox"
+"""str: file name of the generated main page inside the output directory"""
+EXTERNAL_KEYS = {
+    "ALLEXTERNALS": "YES",
+    "EXTERNAL_GROUPS": "YES",
+    "EXTERNAL_PAGES": "YES",
+}
+"""Dict[str, str]: Doxyfile keys listing the entities of all tag files in the indexes
+of the merged site"""
+
+
+class DocsMerger(Documenter):
+    """Class to merge the output of 'generate-docs --shard' runs
+
+    The html of every shard is copied into html/shards/<index>/ and doxygen runs
+    once more on a generated main page with the tag files of all shards. The
+    class, namespace and file indexes of the resulting site list the entities of
+    all shards and link into their pages. The xml of all shards is combined into
+    a single xml/ directory with one index.xml.
+    """
+
+    def __init__(
+        self,
+        input: List[str],
+        output: str,
+        title: Union[None, str] = None,
+        doxyfile: Union[None, str] = None,
+        style_sheet: Union[None, str] = None,
+        doxy_set: Iterable[str] = (),
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+        base_dir: Union[None, str] = None,
+    ) -> None:
+        super().__init__(
+            input, output, timeout=timeout, profiler=profiler, base_dir=base_dir
+        )
+        self._title = title
+        """Union[None, str]: title of the site. None -> title of the first shard"""
+        self._doxy_path = doxyfile
+        """Union[None, str]: path to doxyfile. None -> use the bundled template"""
+        self._style_sheet_path = style_sheet
+        self._doxy_set = list(doxy_set)
+        """List[str]: assignments like 'KEY=VALUE' applied to the Doxyfile last"""
+        for assignment in self._doxy_set:
+            parse_assignment(assignment)
+        self._html_dir = self._output + "html/"
+        """str: html output of the merged site"""
+        self._xml_dir = self._output + "xml/"
+        """str: combined xml output of all shards"""
+
+    def __call__(self, *args: Any, **kwds: Any) -> Any:
+        self._errors = []
+        self._create_directory(self._output)
+        with self._profiler.stage("load shards"):
+            shards = self._load_shards()
+        if len(shards) == 0:
+            return
+        self._profiler.count("shards", len(shards))
+        with self._profiler.stage("copy html"):
+            self._copy_html(shards)
+        with self._profiler.stage("merge xml"):
+            self._merge_xml(shards)
+        with self._profiler.stage("doxygen"):
+            self._generate_index(shards)
+        self._log_command_summary()
+
+    def _load_shards(self) -> List[Dict[str, Any]]:
+        """reads the descriptions written by the shards
+
+        Returns:
+            List[Dict[str, Any]]: description of every shard ordered by index with
+                its absolute directory under 'path'. Empty if the shards do not
+                belong to the same run.
+        """
+        shards: Dict[int, Dict[str, Any]] = {}
+        for directory in self._input:
+            path = os.path.join(directory, SHARD_MANIFEST_NAME)
+            try:
+                with open(path, "r", encoding="UTF-8") as file:
+                    shard = json.load(file)
+            except (OSError, ValueError) as error:
+                self._error(f"no shard output in {directory}: {error}")
+                continue
+            if shard.get("version") != SHARD_VERSION:
+                self._error(f"{path} was written by an incompatible version")
+                continue
+            if shard["index"] in shards:
+                self._error(
+                    f"shard {shard['index']} is given twice: "
+                    + f"{shards[shard['index']]['path']} and {directory}"
+                )
+                continue
+            shard["path"] = os.path.abspath(directory)
+            shards[shard["index"]] = shard
+
+        counts = sorted({shard["count"] for shard in shards.values()})
+        if len(counts) > 1:
+            self._error(
+                f"shards belong to runs with {', '.join(map(str, counts))} shards"
+            )
+            return []
+        if len(shards) == 0:
+            self._error("no shard output to merge")
+            return []
+        missing = sorted(set(range(1, counts[0] + 1)) - set(shards))
+        if len(missing) > 0:
+            logging.warning(
+                f"shards {', '.join(map(str, missing))} of {counts[0]} are missing. "
+                + "Their files are not part of the merged docs."
+            )
+        return [shards[index] for index in sorted(shards)]
+
+    def _copy_html(self, shards: List[Dict[str, Any]]):
+        """copies the html of every shard into html/shards/<index>/
+
+        Args:
+            shards (List[Dict[str, Any]]): descriptions of the shards
+        """
+        shards_dir = self._html_dir + SHARDS_DIRECTORY + "/"
+        self._remove_directory(shards_dir)
+        for shard in shards:
+            source = os.path.join(shard["path"], shard["html"])
+            if not os.path.isdir(source):
+                logging.warning(f"shard {shard['index']} has no html in {source}")
+                continue
+            destination = shards_dir + str(shard["index"])
+            logging.debug(f"copy {source} to {destination}")
+            shutil.copytree(source, destination)
+
+    def _merge_xml(self, shards: List[Dict[str, Any]]):
+        """combines the xml of all shards into xml/
+
+        Compounds like the namespace of a package split over several shards
+        are described by more than one shard. The first shard wins.
+
+        Args:
+            shards (List[Dict[str, Any]]): descriptions of the shards
+        """
+        self._remove_directory(self._xml_dir)
+        self._create_directory(self._xml_dir)
+        index = None
+        refids = set()
+        duplicates = 0
+        for shard in shards:
+            source = os.path.join(shard["path"], shard["xml"])
+            try:
+                root = ElementTree.parse(os.path.join(source, "index.xml")).getroot()
+            except (OSError, ElementTree.ParseError) as error:
+                self._error(f"shard {shard['index']} has no xml index: {error}")
+                continue
+            if index is None:
+                index = ElementTree.Element(root.tag, root.attrib)
+            for compound in root.findall("compound"):
+                if compound.get("refid") in refids:
+                    duplicates += 1
+                    continue
+                refids.add(compound.get("refid"))
+                index.append(compound)
+            for entry in os.scandir(source):
+                destination = self._xml_dir + entry.name
+                if entry.is_file() and entry.name != "index.xml":
+                    if not os.path.exists(destination):
+                        self._copy(entry.path, destination)
+
+        if index is None:
+            return
+        ElementTree.ElementTree(index).write(
+            self._xml_dir + "index.xml", encoding="UTF-8", xml_declaration=True
+        )
+        logging.info(
+            f"merged {len(refids)} xml compounds, {duplicates} described by "
+            + "several shards"
+        )
+
+    def _generate_index(self, shards: List[Dict[str, Any]]) -> CommandResult:
+        """runs doxygen on a main page linking the tag files of all shards
+
+        Args:
+            shards (List[Dict[str, Any]]): descriptions of the shards
+
+        Returns:
+            CommandResult: result of the doxygen run
+        """
+        doxyfile = (
+            Doxyfile.template()
+            if self._doxy_path is None
+            else Doxyfile.load(self._doxy_path)
+        )
+        title = self._title or shards[0]["title"]
+        mainpage = self._output + MAINPAGE_NAME
+        self._write_mainpage(mainpage, title, shards)
+
+        tagfiles = []
+        for shard in shards:
+            tagfile = os.path.join(shard["path"], shard["tagfile"])
+            if not os.path.isfile(tagfile):
+                self._error(f"shard {shard['index']} has no tag file {tagfile}")
+                continue
+            tagfiles.append(quote(f"{tagfile}={SHARDS_DIRECTORY}/{shard['index']}"))
+
+        doxyfile["PROJECT_NAME"] = quote(title)
+        doxyfile["INPUT"] = quote(mainpage)
+        doxyfile["RECURSIVE"] = "NO"
+        doxyfile["OUTPUT_DIRECTORY"] = quote(self._output)
+        doxyfile["HTML_OUTPUT"] = "html"
+        # the xml of the shards is merged above and must not be overwritten
+        doxyfile.update(
+            {
+                key: "YES" if output == "html" else "NO"
+                for output, key in OUTPUT_GENERATORS.items()
+            }
+        )
+        doxyfile["TAGFILES"] = " ".join(tagfiles)
+        doxyfile.remove("GENERATE_TAGFILE")
+        doxyfile.update(EXTERNAL_KEYS)
+        if self._style_sheet_path is None:
+            doxyfile.remove("HTML_EXTRA_STYLESHEET")
+        else:
+            doxyfile.append("HTML_EXTRA_STYLESHEET", quote(self._style_sheet_path))
+        for assignment in self._doxy_set:
+            doxyfile.assign(assignment)
+        return self._run_doxygen(doxyfile)
+
+    @staticmethod
+    def _write_mainpage(path: str, title: str, shards: List[Dict[str, Any]]):
+        """writes the main page of the merged site with a link to every shard
+
+        Args:
+            path (str): path of the doxygen page
+            title (str): title of the site
+            shards (List[Dict[str, Any]]): descriptions of the shards
+        """
+        files = sum(len(shard["files"]) for shard in shards)
+        lines = [
+            f"/** \\mainpage {title}",
+            "",
+            f"Documentation of {files} files merged from {len(shards)} of "
+            + f"{shards[0]['count']} shards.",
+            "",
+        ]
+        for shard in shards:
+            location = f"{SHARDS_DIRECTORY}/{shard['index']}/index.html"
+            extent = (
+                f"{shard['files'][0]} to {shard['files'][-1]}"
+                if len(shard["files"]) > 0
+                else "no files"
+            )
+            lines.append(
+                f"- <a href=\"{location}\">Shard {shard['index']}</a>: "
+                + f"{len(shard['files'])} files, {extent}"
+            )
+        lines.append("*/")
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write("\n".join(lines) + "\n")
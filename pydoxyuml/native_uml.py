@@ -0,0 +1,510 @@
+"""Module provides a lightweight UML diagram generator based on the stdlib ast
+
+Class and package diagrams are extracted from the syntax trees which are already
+parsed to collect the imports and written as PlantUML, Mermaid or Graphviz dot
+files named like the diagrams of pyreverse."""
+
+import ast
+import html
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from pydoxyuml.import_graph import ImportGraph, absolute_module, package_of
+from pydoxyuml.utils.cache import SourceCache
+
+
+NATIVE_FORMATS = {
+    "puml": "puml",
+    "plantuml": "puml",
+    "mmd": "mmd",
+    "dot": "dot",
+    "gv": "gv",
+}
+"""Dict[str, str]: file extension per output format the native engine can write"""
+
+COLORS = [
+    "aliceblue",
+    "antiquewhite",
+    "aquamarine",
+    "burlywood",
+    "cadetblue",
+    "chartreuse",
+    "chocolate",
+    "coral",
+    "cornflowerblue",
+    "cyan",
+    "darkgoldenrod",
+    "darkseagreen",
+]
+"""List[str]: colors for classes of different packages if colorized"""
+
+
+def dotted_name(node: ast.AST) -> Union[None, str]:
+    """converts a name or attribute node into a dotted string
+
+    Args:
+        node (ast.AST): expression node like the base of a class
+
+    Returns:
+        Union[None, str]: string like 'module.Class'. None for other expressions
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = dotted_name(node.value)
+        return None if value is None else f"{value}.{node.attr}"
+    if isinstance(node, ast.Subscript):
+        return dotted_name(node.value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    # python < 3.8 parses string literals as ast.Str
+    if type(node).__name__ == "Str":
+        return node.s
+    return None
+
+
+def _function_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    """signature of a method without self / cls
+
+    Args:
+        node (Union[ast.FunctionDef, ast.AsyncFunctionDef]): method definition
+
+    Returns:
+        str: signature like 'run(x, y)'
+    """
+    # positional-only arguments exist since python 3.8
+    positional = getattr(node.args, "posonlyargs", [])
+    arguments = [*positional, *node.args.args, *node.args.kwonlyargs]
+    names = [argument.arg for argument in arguments]
+    decorators = [dotted_name(decorator) for decorator in node.decorator_list]
+    if len(names) > 0 and "staticmethod" not in decorators:
+        names = names[1:]
+    return f"{node.name}({', '.join(names)})"
+
+
+def _instance_attributes(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+) -> List[Tuple[str, Union[None, str]]]:
+    """attributes assigned to 'self' inside a method
+
+    Args:
+        node (Union[ast.FunctionDef, ast.AsyncFunctionDef]): method definition
+
+    Returns:
+        List[Tuple[str, Union[None, str]]]: attribute name and annotation
+    """
+    attributes = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.AnnAssign):
+            targets, annotation = [child.target], dotted_name(child.annotation)
+        elif isinstance(child, ast.Assign):
+            targets, annotation = child.targets, None
+        else:
+            continue
+        for target in targets:
+            if (
+                isinstance(target, ast.Attribute)
+                and isinstance(target.value, ast.Name)
+                and target.value.id == "self"
+            ):
+                attributes.append((target.attr, annotation))
+    return attributes
+
+
+def _collect_class(node: ast.ClassDef, qualname: str) -> Dict[str, Any]:
+    """extracts name, bases, attributes and methods of a class definition
+
+    Args:
+        node (ast.ClassDef): class definition
+        qualname (str): qualified name inside its module
+
+    Returns:
+        Dict[str, Any]: description of the class
+    """
+    attributes: Dict[str, Union[None, str]] = {}
+    methods = []
+    for child in node.body:
+        if isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+            attributes[child.target.id] = dotted_name(child.annotation)
+        elif isinstance(child, ast.Assign):
+            for target in child.targets:
+                if isinstance(target, ast.Name):
+                    attributes.setdefault(target.id, None)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            methods.append(_function_signature(child))
+            for name, annotation in _instance_attributes(child):
+                if attributes.get(name) is None:
+                    attributes[name] = annotation
+    return {
+        "name": node.name,
+        "qualname": qualname,
+        "bases": [name for name in map(dotted_name, node.bases) if name is not None],
+        "attributes": list(attributes.items()),
+        "methods": methods,
+    }
+
+
+def collect_definitions(tree: ast.Module) -> Dict[str, Any]:
+    """collects classes and imported names of a module
+
+    Args:
+        tree (ast.Module): parsed python file
+
+    Returns:
+        Dict[str, Any]: 'classes' with a description per class and 'aliases'
+            mapping names bound by imports to (level, module, name)
+    """
+    classes = []
+    pending = [(node, "") for node in tree.body]
+    while len(pending) > 0:
+        node, prefix = pending.pop(0)
+        if isinstance(node, ast.ClassDef):
+            qualname = prefix + node.name
+            classes.append(_collect_class(node, qualname))
+            pending.extend((child, qualname + ".") for child in node.body)
+        elif isinstance(node, (ast.If, ast.Try)):
+            children = [*node.body, *node.orelse]
+            for handler in getattr(node, "handlers", []):
+                children.extend(handler.body)
+            pending.extend((child, prefix) for child in children)
+
+    aliases = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is not None:
+                    aliases[alias.asname] = (0, None, alias.name)
+                else:
+                    head = alias.name.split(".")[0]
+                    aliases[head] = (0, None, head)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = (
+                    node.level,
+                    node.module,
+                    alias.name,
+                )
+    return {"classes": classes, "aliases": aliases}
+
+
+class UMLModel:
+    """classes, inheritance and module dependencies of a set of python files"""
+
+    def __init__(self, modules: List[str], graph: ImportGraph, cache: SourceCache):
+        self.modules = modules
+        """List[str]: module names contained in the diagrams"""
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        """Dict[str, Dict[str, Any]]: description per fully qualified class name"""
+        self.inheritance: List[Tuple[str, str]] = []
+        """List[Tuple[str, str]]: (child, parent) pairs of classes in the model"""
+        self.dependencies: List[Tuple[str, str]] = []
+        """List[Tuple[str, str]]: (importer, imported) pairs of modules in the model"""
+        packages = sorted({module.rpartition(".")[0] for module in modules})
+        self._packages = {package: index for index, package in enumerate(packages)}
+        """Dict[str, int]: index of every package for coloring"""
+
+        definitions = {}
+        for module in modules:
+            definitions[module] = cache.extract(
+                graph.files[module], "definitions", collect_definitions
+            )
+            for description in definitions[module]["classes"]:
+                self.classes[f"{module}.{description['qualname']}"] = dict(
+                    description, module=module
+                )
+
+        for module in modules:
+            package = package_of(module, graph.files[module])
+            for description in definitions[module]["classes"]:
+                child = f"{module}.{description['qualname']}"
+                for base in description["bases"]:
+                    parent = self._resolve_class(module, package, base, definitions)
+                    if parent is not None:
+                        self.inheritance.append((child, parent))
+
+        contained = set(modules)
+        for module in modules:
+            for imported in graph.imports(module):
+                if imported in contained:
+                    self.dependencies.append((module, imported))
+
+    def _resolve_class(
+        self,
+        module: str,
+        package: str,
+        name: str,
+        definitions: Dict[str, Dict[str, Any]],
+    ) -> Union[None, str]:
+        """resolves a base class name as written in a module to a class in the model
+
+        Args:
+            module (str): module the name is used in
+            package (str): package of the module
+            name (str): dotted name like 'Base' or 'module.Base'
+            definitions (Dict[str, Dict[str, Any]]): extracted definitions per module
+
+        Returns:
+            Union[None, str]: fully qualified class name or None if unknown
+        """
+        head, _, rest = name.partition(".")
+        candidates = [f"{module}.{name}"]
+        alias = definitions[module]["aliases"].get(head)
+        if alias is not None:
+            level, imported_module, imported_name = alias
+            target = imported_name
+            if imported_module is not None or level > 0:
+                base = absolute_module(package, imported_module, level)
+                target = None if base is None else f"{base}.{imported_name}"
+            if target is not None:
+                candidates.append(target + (f".{rest}" if rest else ""))
+        candidates.append(name)
+        for candidate in candidates:
+            if candidate in self.classes:
+                return candidate
+        return None
+
+    def package_color(self, module: str) -> str:
+        """color of a module based on its package
+
+        Args:
+            module (str): module name
+
+        Returns:
+            str: color name
+        """
+        return COLORS[self._packages[module.rpartition(".")[0]] % len(COLORS)]
+
+
+class PackageOverview:
+    """dependencies between packages aggregated from the imports of their modules
+
+    Renders like the package diagram of a UMLModel with one node per package, so
+    its layout stays small no matter how many classes the packages contain.
+    """
+
+    def __init__(self, packages: Dict[str, List[str]], graph: ImportGraph):
+        self.modules = list(packages)
+        """List[str]: package names, the nodes of the overview"""
+        self.dependencies: List[Tuple[str, str]] = []
+        """List[Tuple[str, str]]: (importer, imported) pairs of packages"""
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        self.inheritance: List[Tuple[str, str]] = []
+        owner = {
+            module: package
+            for package, modules in packages.items()
+            for module in modules
+        }
+        dependencies = {}
+        for package, modules in packages.items():
+            for module in modules:
+                for imported in graph.imports(module):
+                    target = owner.get(imported)
+                    if target is not None and target != package:
+                        dependencies[(package, target)] = None
+        self.dependencies = list(dependencies)
+
+
+def _member_lines(description: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """attribute and method lines of a class
+
+    Args:
+        description (Dict[str, Any]): description of a class
+
+    Returns:
+        Tuple[List[str], List[str]]: attributes like 'x : int' and methods
+    """
+    attributes = [
+        name if annotation is None else f"{name} : {annotation}"
+        for name, annotation in description["attributes"]
+    ]
+    return attributes, description["methods"]
+
+
+def render_plantuml(model: UMLModel, diagram: str, title: str, colorized: bool) -> str:
+    """renders a class or package diagram as PlantUML
+
+    Args:
+        model (UMLModel): model to render
+        diagram (str): either 'classes' or 'packages'
+        title (str): name of the diagram
+        colorized (bool): color classes by package
+
+    Returns:
+        str: content of the .puml file
+    """
+    lines = [f"@startuml {title}", "set namespaceSeparator none"]
+    if diagram == "packages":
+        for module in model.modules:
+            lines.extend([f'package "{module}" as {module} {{', "}"])
+        for importer, imported in model.dependencies:
+            lines.append(f"{importer} --> {imported}")
+    else:
+        for name, description in model.classes.items():
+            color = ""
+            if colorized:
+                color = f" #{model.package_color(description['module'])}"
+            lines.append(f'class "{description["name"]}" as {name}{color} {{')
+            attributes, methods = _member_lines(description)
+            lines.extend(f"  {line}" for line in [*attributes, *methods])
+            lines.append("}")
+        for child, parent in model.inheritance:
+            lines.append(f"{child} --|> {parent}")
+    lines.append("@enduml")
+    return "\n".join(lines) + "\n"
+
+
+def render_mermaid(model: UMLModel, diagram: str, title: str, colorized: bool) -> str:
+    """renders a class or package diagram as Mermaid class diagram
+
+    Args:
+        model (UMLModel): model to render
+        diagram (str): either 'classes' or 'packages'
+        title (str): name of the diagram
+        colorized (bool): unused, Mermaid class diagrams are not colorized
+
+    Returns:
+        str: content of the .mmd file
+    """
+    del title, colorized
+
+    def identifier(name: str) -> str:
+        # Mermaid ids may not contain dots. '_' is escaped as well, so 'a.b_c' and
+        # 'a_b.c' keep distinct ids. The dotted name is shown as label.
+        return name.replace("_", "__").replace(".", "_d")
+
+    lines = ["classDiagram"]
+    if diagram == "packages":
+        for module in model.modules:
+            lines.append(f'  class {identifier(module)}["{module}"]')
+        for importer, imported in model.dependencies:
+            lines.append(f"  {identifier(importer)} --> {identifier(imported)}")
+    else:
+        for name, description in model.classes.items():
+            lines.append(f'  class {identifier(name)}["{description["name"]}"] {{')
+            attributes, methods = _member_lines(description)
+            lines.extend(f"    {line}" for line in [*attributes, *methods])
+            lines.append("  }")
+        for child, parent in model.inheritance:
+            lines.append(f"  {identifier(parent)} <|-- {identifier(child)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_dot(model: UMLModel, diagram: str, title: str, colorized: bool) -> str:
+    """renders a class or package diagram as Graphviz dot
+
+    Args:
+        model (UMLModel): model to render
+        diagram (str): either 'classes' or 'packages'
+        title (str): name of the diagram
+        colorized (bool): color classes by package
+
+    Returns:
+        str: content of the .dot file
+    """
+    lines = [f'digraph "{title}" {{', "rankdir=BT", 'charset="utf-8"']
+    if diagram == "packages":
+        for module in model.modules:
+            lines.append(f'"{module}" [label=<{html.escape(module)}>, shape="box"];')
+        for importer, imported in model.dependencies:
+            lines.append(f'"{importer}" -> "{imported}" [arrowhead="open"];')
+    else:
+        for name, description in model.classes.items():
+            attributes, methods = _member_lines(description)
+            compartments = [
+                "".join(f'{html.escape(line)}<br ALIGN="LEFT"/>' for line in block)
+                for block in (attributes, methods)
+            ]
+            class_label = html.escape(description["name"])
+            label = "{" + "|".join([class_label, *compartments]) + "}"
+            style = 'style="solid"'
+            if colorized:
+                color = model.package_color(description["module"])
+                style = f'fillcolor="{color}", style="filled"'
+            lines.append(f'"{name}" [label=<{label}>, shape="record", {style}];')
+        for child, parent in model.inheritance:
+            lines.append(f'"{child}" -> "{parent}" [arrowhead="empty"];')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {
+    "puml": render_plantuml,
+    "mmd": render_mermaid,
+    "dot": render_dot,
+    "gv": render_dot,
+}
+"""Dict[str, Callable]: renderer per file extension"""
+
+
+def write_diagrams(
+    project_name: str,
+    python_files: Iterable[str],
+    graph: ImportGraph,
+    cache: SourceCache,
+    output_formats: Iterable[str],
+    output: str,
+    colorized: bool = False,
+) -> List[str]:
+    """writes class and package diagram of the given modules in every format
+
+    The model is built once and rendered into all formats.
+
+    Args:
+        project_name (str): name used in the file names like pyreverse does
+        python_files (Iterable[str]): files to include. Must be known to graph
+        graph (ImportGraph): import graph the files are registered in
+        cache (SourceCache): cache to parse the modules with
+        output_formats (Iterable[str]): subset of NATIVE_FORMATS
+        output (str): output directory
+        colorized (bool, optional): color classes by package. Defaults to False.
+
+    Returns:
+        List[str]: paths of the written files
+    """
+    extensions = list(dict.fromkeys(map(NATIVE_FORMATS.get, output_formats)))
+    if len(extensions) == 0:
+        return []
+    modules = list(dict.fromkeys(map(graph.module_of, python_files)))
+    model = UMLModel(modules, graph, cache)
+    paths = []
+    for extension in extensions:
+        for diagram in ["classes", "packages"]:
+            path = os.path.join(output, f"{diagram}_{project_name}.{extension}")
+            content = RENDERERS[extension](
+                model, diagram, f"{diagram}_{project_name}", colorized
+            )
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(content)
+            logging.debug(f"wrote {path}")
+            paths.append(path)
+    return paths
+
+
+def write_overview(
+    project_name: str,
+    overview: PackageOverview,
+    output_formats: Iterable[str],
+    output: str,
+) -> List[str]:
+    """writes the package overview in every format
+
+    Args:
+        project_name (str): name used in the file names like 'overview_<name>'
+        overview (PackageOverview): packages and their dependencies
+        output_formats (Iterable[str]): subset of NATIVE_FORMATS
+        output (str): output directory
+
+    Returns:
+        List[str]: paths of the written files
+    """
+    paths = []
+    for extension in dict.fromkeys(map(NATIVE_FORMATS.get, output_formats)):
+        title = f"overview_{project_name}"
+        path = os.path.join(output, f"{title}.{extension}")
+        content = RENDERERS[extension](overview, "packages", title, False)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        logging.debug(f"wrote {path}")
+        paths.append(path)
+    return paths
@@ -0,0 +1,216 @@
+"""Module provides a cache for parsed python files"""
+
+import ast
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+
+CACHE_VERSION = 3
+"""int: bumped whenever the layout of the persisted cache or an extractor changes"""
+CACHE_FILE_NAME = "source_cache.pickle"
+"""str: name of the persisted cache file inside the cache directory"""
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """cheap signature of a file which changes whenever the file is modified
+
+    Args:
+        path (str): path to file
+
+    Returns:
+        Tuple[int, int]: modification time in nanoseconds and size in bytes
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path: str) -> str:
+    """content hash of a file which survives touching or checking it out again
+
+    Args:
+        path (str): path to file
+
+    Returns:
+        str: sha256 hex digest of the file content
+    """
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def collect_imports(
+    tree: ast.Module,
+) -> List[Tuple[str, Union[None, str], List[str], int]]:
+    """collects all import statements of a module
+
+    Args:
+        tree (ast.Module): parsed python file
+
+    Returns:
+        List[Tuple[str, Union[None, str], List[str], int]]: one entry per import
+            statement as (kind, module, names, level). kind is 'import' for
+            'import x.y' and 'from' for 'from x import y'. level is the number of
+            leading dots of a relative import.
+    """
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(("import", alias.name, [], 0))
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names]
+            imports.append(("from", node.module, names, node.level))
+    return imports
+
+
+class SourceCache:
+    """caches syntax trees of python files and results extracted from them
+
+    Entries are keyed by absolute path. If modification time or size of a file
+    changed, the content hash decides whether the extracted results are still
+    valid, so a checkout or touch does not cause parsing again. Syntax trees live
+    in memory only, extracted results are persisted to disk if a cache directory
+    is given, so a later run on an unchanged tree does not parse anything at all.
+    """
+
+    def __init__(self, cache_dir: Union[None, str] = None) -> None:
+        self._cache_path = (
+            None if cache_dir is None else os.path.join(cache_dir, CACHE_FILE_NAME)
+        )
+        """Union[None, str]: path to persisted cache. None -> in memory only"""
+        self._entries: Dict[str, Tuple[Tuple[int, int], str, Dict[str, Any]]] = {}
+        """Dict[str, Tuple[Tuple[int, int], str, Dict[str, Any]]]: file signature,
+        content hash and extracted results per file"""
+        self._trees: Dict[str, Tuple[Tuple[int, int], ast.Module]] = {}
+        """Dict[str, Tuple[Tuple[int, int], ast.Module]]: parsed files of this run"""
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.parsed = 0
+        """int: number of files parsed by this cache"""
+        self.hits = 0
+        """int: number of extractions served from the cache"""
+        self._load()
+
+    def parse(self, path: str) -> ast.Module:
+        """parses a python file at most once per modification
+
+        Args:
+            path (str): path to python file
+
+        Returns:
+            ast.Module: syntax tree of the file
+        """
+        key = os.path.abspath(path)
+        signature = file_signature(key)
+        with self._lock:
+            cached = self._trees.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        with open(key, "r", encoding="utf-8") as file:
+            tree = ast.parse(file.read(), path)
+        with self._lock:
+            self.parsed += 1
+            self._trees[key] = (signature, tree)
+        return tree
+
+    def extract(
+        self, path: str, name: str, extractor: Callable[[ast.Module], Any]
+    ) -> Any:
+        """returns the result of an extractor applied to the syntax tree of a file
+
+        Args:
+            path (str): path to python file
+            name (str): unique name of the extractor. Used as cache key
+            extractor (Callable[[ast.Module], Any]): function computing a picklable
+                result from the syntax tree
+
+        Returns:
+            Any: result of extractor
+        """
+        found, result = self.lookup(path, name)
+        if found:
+            return result
+        result = extractor(self.parse(path))
+        self.store(path, name, result)
+        return result
+
+    def lookup(self, path: str, name: str) -> Tuple[bool, Any]:
+        """cached result of an extractor for the current content of a file
+
+        Args:
+            path (str): path to python file
+            name (str): unique name of the extractor
+
+        Returns:
+            Tuple[bool, Any]: whether a valid result was cached and the result
+        """
+        key = os.path.abspath(path)
+        signature = file_signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or name not in entry[2]:
+            return False, None
+        if entry[0] != signature:
+            if file_digest(key) != entry[1]:
+                return False, None
+            with self._lock:
+                self._entries[key] = (signature, entry[1], entry[2])
+                self._dirty = True
+        with self._lock:
+            self.hits += 1
+        return True, entry[2][name]
+
+    def store(self, path: str, name: str, result: Any):
+        """caches the result of an extractor computed elsewhere
+
+        Used for results computed in worker processes, which have no access to
+        this cache.
+
+        Args:
+            path (str): path to python file
+            name (str): unique name of the extractor
+            result (Any): picklable result for the current content of the file
+        """
+        key = os.path.abspath(path)
+        signature = file_signature(key)
+        digest = file_digest(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != digest:
+                entry = (signature, digest, {})
+            self._entries[key] = (signature, digest, entry[2])
+            entry[2][name] = result
+            self._dirty = True
+
+    def save(self):
+        """writes extracted results to disk if a cache directory was given"""
+        if self._cache_path is None or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+        tmp_path = self._cache_path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(
+                    (CACHE_VERSION, self._entries),
+                    file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            self._dirty = False
+        os.replace(tmp_path, self._cache_path)
+        logging.debug(f"saved source cache to {self._cache_path}")
+
+    def _load(self):
+        """loads extracted results from disk. Ignores missing or outdated caches"""
+        if self._cache_path is None:
+            return
+        try:
+            with open(self._cache_path, "rb") as file:
+                version, entries = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return
+        if version == CACHE_VERSION:
+            self._entries = entries
+            logging.debug(f"loaded {len(entries)} entries from {self._cache_path}")
@@ -0,0 +1,365 @@
+"""Module provides a single pass discovery of python sources below input roots"""
+
+from dataclasses import dataclass, field
+import fnmatch
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Pattern, Tuple
+
+
+DEFAULT_EXCLUDES = [
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "__pycache__",
+    "node_modules",
+    "*.egg-info",
+]
+"""List[str]: directory names which never contain sources worth documenting"""
+
+
+def module_name_from_path(path: str, base: str) -> str:
+    """converts a file path into a dotted module name relative to base
+
+    Args:
+        path (str): path to python file like 'pkg/sub/mod.py'
+        base (str): directory the module name is relative to
+
+    Returns:
+        str: module name like 'pkg.sub.mod'. '__init__.py' files are named after
+            their package
+    """
+    relative = os.path.relpath(path, base)
+    parts = relative[: -len(".py")].split(os.sep)
+    if parts[-1] == "__init__" and len(parts) > 1:
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def root_base(root: str) -> str:
+    """directory module names of a given input root are relative to
+
+    Args:
+        root (str): input root directory
+
+    Returns:
+        str: parent directory of the top level package if root is a package or
+            subpackage, root itself otherwise
+    """
+    base = os.path.normpath(root)
+    while os.path.isfile(os.path.join(base, "__init__.py")):
+        parent = os.path.normpath(os.path.join(base, os.pardir))
+        if os.path.abspath(parent) == os.path.abspath(base):
+            break
+        base = parent
+    return base
+
+
+def _translate_gitignore_pattern(pattern: str) -> str:
+    """translates a gitignore glob into a regular expression
+
+    Args:
+        pattern (str): glob without leading '!' and trailing '/'
+
+    Returns:
+        str: regular expression matching paths separated by '/'
+    """
+    result = ""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            result += "(?:.*/)?"
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            result += ".*"
+            index += 2
+            continue
+        if char == "*":
+            result += "[^/]*"
+        elif char == "?":
+            result += "[^/]"
+        elif char == "[" and "]" in pattern[index + 1 :]:
+            end = pattern.index("]", index + 1)
+            content = pattern[index + 1 : end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            result += f"[{content}]"
+            index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            result += re.escape(pattern[index])
+        else:
+            result += re.escape(char)
+        index += 1
+    return result
+
+
+@dataclass
+class GitIgnoreRule:
+    """single pattern of a .gitignore file"""
+
+    base: str
+    """str: directory of the .gitignore file"""
+    regex: Pattern
+    """Pattern: compiled pattern"""
+    negated: bool
+    """bool: pattern starts with '!' and re-includes paths"""
+    directory_only: bool
+    """bool: pattern ends with '/' and only matches directories"""
+    anchored: bool
+    """bool: pattern contains a '/' and is matched against the relative path"""
+
+    @classmethod
+    def parse(cls, line: str, base: str) -> "GitIgnoreRule":
+        """creates a rule from a line of a .gitignore file
+
+        Args:
+            line (str): stripped, non empty line which is no comment
+            base (str): directory of the .gitignore file
+
+        Returns:
+            GitIgnoreRule: parsed rule
+        """
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = re.compile(_translate_gitignore_pattern(line) + r"\Z")
+        return cls(base, regex, negated, directory_only, anchored)
+
+    def match(self, path: str, is_directory: bool) -> bool:
+        """checks if the rule applies to a path
+
+        Args:
+            path (str): path below the base directory
+            is_directory (bool): path is a directory
+
+        Returns:
+            bool: True if the pattern matches
+        """
+        if self.directory_only and not is_directory:
+            return False
+        relative = os.path.relpath(path, self.base).replace(os.sep, "/")
+        if relative.startswith("../"):
+            return False
+        if self.anchored:
+            return self.regex.match(relative) is not None
+        return self.regex.match(relative.rpartition("/")[2]) is not None
+
+
+def load_gitignore(directory: str) -> List[GitIgnoreRule]:
+    """reads the rules of a .gitignore file in a given directory
+
+    Args:
+        directory (str): directory which might contain a .gitignore file
+
+    Returns:
+        List[GitIgnoreRule]: rules in order of the file. Empty if there is no file
+    """
+    try:
+        path = os.path.join(directory, ".gitignore")
+        with open(path, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return []
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if len(line) == 0 or line.startswith("#"):
+            continue
+        rules.append(GitIgnoreRule.parse(line, directory))
+    return rules
+
+
+def _ancestor_gitignores(root: str) -> List[GitIgnoreRule]:
+    """rules of .gitignore files above a root up to the enclosing git repository
+
+    Args:
+        root (str): input root directory
+
+    Returns:
+        List[GitIgnoreRule]: rules ordered from the outermost directory inwards
+    """
+    ancestors = []
+    directory = os.path.dirname(os.path.abspath(root))
+    while True:
+        ancestors.append(directory)
+        if os.path.exists(os.path.join(directory, ".git")):
+            break
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            # not inside a git repository -> only gitignores inside the root count
+            return []
+        directory = parent
+    rules = []
+    for directory in reversed(ancestors):
+        rules.extend(load_gitignore(directory))
+    return rules
+
+
+def is_ignored(path: str, is_directory: bool, rules: Iterable[GitIgnoreRule]) -> bool:
+    """evaluates gitignore rules for a path. The last matching rule wins
+
+    Args:
+        path (str): path to check
+        is_directory (bool): path is a directory
+        rules (Iterable[GitIgnoreRule]): rules ordered by precedence
+
+    Returns:
+        bool: True if the path is ignored
+    """
+    ignored = False
+    absolute = os.path.abspath(path)
+    for rule in rules:
+        if rule.negated == ignored and rule.match(absolute, is_directory):
+            ignored = not rule.negated
+    return ignored
+
+
+@dataclass
+class SourceIndex:
+    """python files, packages and module names below a set of input roots"""
+
+    roots: List[str]
+    """List[str]: input roots in given order"""
+    files: Dict[str, List[str]] = field(default_factory=dict)
+    """Dict[str, List[str]]: sorted python files per root"""
+    packages: Dict[str, List[str]] = field(default_factory=dict)
+    """Dict[str, List[str]]: directories with an '__init__.py' per root"""
+    modules: Dict[str, str] = field(default_factory=dict)
+    """Dict[str, str]: file path per dotted module name"""
+
+    def all_files(self) -> List[str]:
+        """python files of all roots without duplicates
+
+        Returns:
+            List[str]: python files in order of the roots
+        """
+        files = (file for root in self.roots for file in self.files[root])
+        return list(dict.fromkeys(files))
+
+    def package_files(self, root: str) -> List[str]:
+        """python files of a root which are located directly inside a package
+
+        Args:
+            root (str): one of the roots
+
+        Returns:
+            List[str]: sorted python files whose directory contains '__init__.py'
+        """
+        packages = set(self.packages[root])
+        return [file for file in self.files[root] if os.path.dirname(file) in packages]
+
+
+def discover_sources(
+    roots: Iterable[str], exclude: Iterable[str] = (), gitignore: bool = True
+) -> SourceIndex:
+    """walks every root once and collects all python sources
+
+    Directories matching DEFAULT_EXCLUDES, an exclude glob or a .gitignore rule
+    are pruned before they are entered.
+
+    Args:
+        roots (Iterable[str]): input root directories
+        exclude (Iterable[str], optional): globs matched against names and paths
+            relative to the root. Defaults to ().
+        gitignore (bool, optional): honour .gitignore files. Defaults to True.
+
+    Returns:
+        SourceIndex: discovered files, packages and module names
+    """
+    exclude = [*DEFAULT_EXCLUDES, *exclude]
+    index = SourceIndex(list(dict.fromkeys(roots)))
+    for root in index.roots:
+        files, packages = _walk(os.path.normpath(root), exclude, gitignore)
+        index.files[root] = files
+        index.packages[root] = packages
+        base = root_base(root)
+        for file in files:
+            index.modules.setdefault(module_name_from_path(file, base), file)
+    logging.debug(
+        f"discovered {len(index.modules)} python files in {len(index.roots)} roots"
+    )
+    return index
+
+
+def walk_sources(
+    root: str, exclude: Iterable[str] = (), gitignore: bool = True
+) -> Tuple[List[str], List[str]]:
+    """collects python files and packages below a single directory
+
+    Args:
+        root (str): directory to walk
+        exclude (Iterable[str], optional): globs in addition to DEFAULT_EXCLUDES.
+            Defaults to ().
+        gitignore (bool, optional): honour .gitignore files. Defaults to True.
+
+    Returns:
+        Tuple[List[str], List[str]]: sorted python files and package directories
+    """
+    return _walk(os.path.normpath(root), [*DEFAULT_EXCLUDES, *exclude], gitignore)
+
+
+def _walk(
+    root: str, exclude: List[str], gitignore: bool
+) -> Tuple[List[str], List[str]]:
+    """collects python files and packages below a root with os.scandir
+
+    Args:
+        root (str): normalized root directory
+        exclude (List[str]): globs of excluded names and relative paths
+        gitignore (bool): honour .gitignore files
+
+    Returns:
+        Tuple[List[str], List[str]]: sorted python files and package directories
+    """
+
+    def excluded(path: str) -> bool:
+        relative = os.path.relpath(path, root).replace(os.sep, "/")
+        name = os.path.basename(path)
+        return any(
+            fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative, pattern)
+            for pattern in exclude
+        )
+
+    files = []
+    packages = []
+    pending = [(root, _ancestor_gitignores(root) if gitignore else [])]
+    while len(pending) > 0:
+        directory, rules = pending.pop()
+        if gitignore:
+            rules = rules + load_gitignore(directory)
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda x: x.name)
+        except OSError as error:
+            logging.warning(f"cannot read {directory}: {error}")
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            path = os.path.join(directory, entry.name)
+            is_directory = entry.is_dir()
+            if excluded(path) or (gitignore and is_ignored(path, is_directory, rules)):
+                continue
+            if is_directory:
+                subdirectories.append(path)
+            elif entry.name.endswith(".py") and entry.is_file():
+                files.append(path)
+                if entry.name == "__init__.py":
+                    packages.append(directory)
+        pending.extend((path, rules) for path in reversed(subdirectories))
+    return sorted(files), sorted(packages)
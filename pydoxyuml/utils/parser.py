@@ -1,7 +1,260 @@
 """Module provides all functions to setup an ArgumentParser"""
 
-from argparse import ArgumentParser
+from argparse import Action, ArgumentParser, Namespace
 import argparse
+from typing import Any, List, Tuple
+
+from pydoxyuml.doxyfile import OUTPUT_GENERATORS, PRESETS, parse_assignment
+
+
+class VersionAction(Action):
+    """prints the installed version of pydoxyuml and exits
+
+    Unlike argparse's 'version' action the version is only looked up when the
+    flag is given, so other invocations do not pay for reading package metadata.
+    """
+
+    def __init__(self, option_strings: List[str], dest: str, **kwargs: Any) -> None:
+        kwargs.setdefault("help", "show the installed version and exit")
+        kwargs.setdefault("default", argparse.SUPPRESS)
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(
+        self,
+        parser: ArgumentParser,
+        namespace: Namespace,
+        values: Any,
+        option_string: Any = None,
+    ):
+        # pylint: disable=import-outside-toplevel
+        try:
+            from importlib import metadata
+        except ImportError:  # python < 3.8
+            import importlib_metadata as metadata
+
+        try:
+            version = metadata.version("pydoxyuml")
+        except metadata.PackageNotFoundError:
+            version = "unknown (not installed)"
+        parser.exit(message=f"pydoxyuml {version}\n")
+
+
+def doxy_assignment(assignment: str) -> str:
+    """argparse type checking a Doxyfile assignment like 'KEY=VALUE'
+
+    Args:
+        assignment (str): command line argument
+
+    Raises:
+        argparse.ArgumentTypeError: assignment is malformed
+
+    Returns:
+        str: unchanged assignment
+    """
+    try:
+        parse_assignment(assignment)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+    return assignment
+
+
+def output_list(outputs: str) -> List[str]:
+    """argparse type splitting a comma separated list of doxygen outputs
+
+    Args:
+        outputs (str): command line argument like 'html,xml'
+
+    Raises:
+        argparse.ArgumentTypeError: list contains an unknown output
+
+    Returns:
+        List[str]: output formats
+    """
+    result = [output.strip() for output in outputs.split(",") if output.strip()]
+    unknown = [output for output in result if output not in OUTPUT_GENERATORS]
+    if len(unknown) > 0:
+        raise argparse.ArgumentTypeError(
+            f"unknown outputs {', '.join(unknown)}. "
+            + f"Choose from {', '.join(OUTPUT_GENERATORS)}"
+        )
+    return result
+
+
+def shard_spec(shard: str) -> Tuple[int, int]:
+    """argparse type parsing a shard like '2/4'
+
+    Args:
+        shard (str): command line argument
+
+    Raises:
+        argparse.ArgumentTypeError: shard is malformed or out of range
+
+    Returns:
+        Tuple[int, int]: index starting at 1 and total number of shards
+    """
+    index, separator, count = shard.partition("/")
+    try:
+        result = (int(index), int(count))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(
+            f"expected INDEX/COUNT, got '{shard}'"
+        ) from error
+    if len(separator) == 0 or not 1 <= result[0] <= result[1]:
+        raise argparse.ArgumentTypeError(
+            f"expected INDEX/COUNT with 1 <= INDEX <= COUNT, got '{shard}'"
+        )
+    return result
+
+
+def _add_docs_options(parser: ArgumentParser):
+    """adds the options shaping the Doxyfile and the doxygen run
+
+    Args:
+        parser (ArgumentParser): parser of a command generating doxygen docs
+    """
+    parser.add_argument(
+        "--doxyfile",
+        type=str,
+        help="Path to Doxyfile. Is required if the corresponding Doxyfile is \
+            not in the current directory.",
+    )
+    parser.add_argument(
+        "--title",
+        type=str,
+        default="Example Project",
+        help="Title for project you want to document.",
+    )
+    parser.add_argument(
+        "--style-sheet", type=str, help="Absolute path to html style sheet."
+    )
+    parser.add_argument(
+        "--preprocess",
+        type=str,
+        default="tmp",
+        choices=["tmp", "filter"],
+        help="'tmp' converts all files with doxypypy into <output>/tmp/ before \
+            doxygen runs. 'filter' lets doxygen run doxypypy as input filter on the \
+            original files, so no copy of the sources is written.",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Number of doxygen threads for parsing and dot rendering \
+            (NUM_PROC_THREADS and DOT_NUM_THREADS). 0 uses all cores.",
+    )
+    parser.add_argument(
+        "--outputs",
+        type=output_list,
+        metavar="html,xml,...",
+        help=f"Comma separated doxygen outputs out of {','.join(OUTPUT_GENERATORS)}. \
+            All other outputs are disabled.",
+    )
+    parser.add_argument(
+        "--preset",
+        type=str,
+        choices=list(PRESETS),
+        help="Set of Doxygen keys applied before --outputs, --threads and \
+            --doxy-set. 'fast' writes html only, without call and include graphs, \
+            on all cores.",
+    )
+    parser.add_argument(
+        "--doxy-set",
+        nargs="+",
+        type=doxy_assignment,
+        default=[],
+        metavar="KEY=VALUE",
+        help="Set any Doxygen key, e.g. 'NUM_PROC_THREADS=4'. 'KEY+=VALUE' appends \
+            to a key. Applied after all other options.",
+    )
+
+
+def _add_uml_options(parser: ArgumentParser, engine_option: str):
+    """adds the options shaping the analysis and the rendering of UML diagrams
+
+    Args:
+        parser (ArgumentParser): parser of a command generating UML diagrams
+        engine_option (str): name of the option selecting the UML engine, like
+            '--engine'
+    """
+    parser.add_argument(
+        "--format",
+        nargs="+",
+        type=str,
+        default=["png"],
+        choices=["png", "jpg", "puml", "plantuml", "dot", "gv", "mmd", "html"],
+        help="Output formats for uml diagrams. *.<format>. The project is analysed \
+            once for all given formats.",
+    )
+    parser.add_argument(
+        "--colorized",
+        action="store_true",
+        help="Flag activates colorized UML generation",
+    )
+    parser.add_argument(
+        "--recursion-depth",
+        type=int,
+        default=1,
+        help="how deep the algorithm will go to discover local parent directories \
+            for generating UML diagrams.",
+    )
+    parser.add_argument(
+        "--source-root",
+        dest="source_roots",
+        nargs="+",
+        type=str,
+        default=[],
+        help="Additional directories imports are resolved against, like the 'src' \
+            directory of a src layout. The top level packages of the inputs and \
+            the working directory are always searched.",
+    )
+    parser.add_argument(
+        engine_option,
+        type=str,
+        default="pyreverse",
+        choices=["pyreverse", "native"],
+        help="Generate diagrams with pyreverse or with the built-in generator based \
+            on the python syntax tree. The native engine supports the formats \
+            puml, plantuml, mmd, dot and gv.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Maximum number of files analysed by one pyreverse call. Larger \
+            diagrams are generated in batches and merged, which bounds memory and \
+            command line length. Only applies to the formats dot, gv, png and jpg.",
+    )
+    parser.add_argument(
+        "--per-package",
+        action="store_true",
+        help="Generate one diagram per package instead of one per input, plus a \
+            package overview per input and an index.html linking all diagrams. \
+            The diagrams of all packages are generated in parallel with --jobs.",
+    )
+
+
+def _add_discovery_options(parser: ArgumentParser, action: str = "document"):
+    """adds the options selecting the python files inside the inputs
+
+    Args:
+        parser (ArgumentParser): parser of a command walking the inputs
+        action (str, optional): what the command does with the files, used in the
+            help texts. Defaults to "document".
+    """
+    parser.add_argument(
+        "--exclude",
+        nargs="+",
+        type=str,
+        default=[],
+        help="Glob patterns of files and directories to skip, matched against names \
+            and paths relative to each input. VCS, virtualenv and cache directories \
+            are always skipped.",
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        dest="gitignore",
+        action="store_false",
+        help=f"Also {action} files and directories ignored by .gitignore files.",
+    )
 
 
 def setup_parser_generate_docs(parser: ArgumentParser) -> ArgumentParser:
@@ -27,21 +280,94 @@ def setup_parser_generate_docs(parser: ArgumentParser) -> ArgumentParser:
             documentation with folders 'html/', 'latex/', ...",
         required=True,
     )
+    _add_docs_options(parser)
     parser.add_argument(
-        "--doxyfile",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files converted by doxypypy in parallel.",
+    )
+    parser.add_argument(
+        "--engine",
         type=str,
-        help="Path to Doxyfile. Is required if the corresponding Doxyfile is \
-            not in the current directory.",
+        default="inprocess",
+        choices=["inprocess", "subprocess"],
+        help="Run doxypypy as a library inside long-lived processes or spawn the \
+            doxypypy executable once per file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the preprocessed sources between runs and only convert changed \
+            files. Doxygen is skipped if neither sources nor Doxyfile changed.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        metavar="INDEX/COUNT",
+        help="Only document the INDEX-th of COUNT deterministic slices of the input \
+            files and write xml and a tag file for 'merge'. Every shard needs its \
+            own --output.",
+    )
+    _add_discovery_options(parser)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timeout in seconds for every external command. Unlimited if not set.",
+    )
+    return parser
+
+
+def setup_parser_merge(parser: ArgumentParser) -> ArgumentParser:
+    """setup parser for merge command
+
+    Args:
+        parser (ArgumentParser): parser object
+
+    Returns:
+        ArgumentParser: setup parser object
+    """
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        type=str,
+        help="Output directories of 'generate-docs --shard' runs",
+        required=True,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Relative path to directory where you want to save the merged \
+            documentation with folders 'html/' and 'xml/'",
+        required=True,
     )
     parser.add_argument(
         "--title",
         type=str,
-        default="Example Project",
-        help="Title for project you want to document.",
+        help="Title of the merged documentation. Defaults to the title of the \
+            shards.",
+    )
+    parser.add_argument(
+        "--doxyfile",
+        type=str,
+        help="Path to Doxyfile for the main page. Defaults to the bundled template.",
     )
     parser.add_argument(
         "--style-sheet", type=str, help="Absolute path to html style sheet."
     )
+    parser.add_argument(
+        "--doxy-set",
+        nargs="+",
+        type=doxy_assignment,
+        default=[],
+        metavar="KEY=VALUE",
+        help="Set any Doxygen key of the main page. Applied after all other options.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timeout in seconds for doxygen. Unlimited if not set.",
+    )
     return parser
 
 
@@ -68,25 +394,259 @@ def setup_parser_generate_uml(parser: ArgumentParser) -> ArgumentParser:
         help="Relative path to directory where you want to save your documentation \
             with folder 'uml/'",
     )
+    _add_uml_options(parser, "--engine")
     parser.add_argument(
-        "--recursion-depth",
+        "--cache-dir",
+        type=str,
+        help="Directory to persist parsed imports between runs. Files are only \
+            parsed again if their modification time or size changed.",
+    )
+    parser.add_argument(
+        "--jobs",
         type=int,
         default=1,
-        help="how deep the algorithm will go to discover local parent directories \
-            for generating UML diagrams.",
+        help="Number of diagrams generated in parallel. The complete diagram of all \
+            inputs is generated alongside the diagrams of the individual inputs.",
+    )
+    _add_discovery_options(parser)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timeout in seconds for every external command. Unlimited if not set.",
+    )
+    return parser
+
+
+def setup_parser_generate_all(parser: ArgumentParser) -> ArgumentParser:
+    """setup parser for generate-all command
+
+    Args:
+        parser (ArgumentParser): parser object
+
+    Returns:
+        ArgumentParser: setup parser object
+    """
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        type=str,
+        help="Collection of paths to the files you want to document",
+        required=True,
+    )
+    parser.add_argument(
+        "--docs-output",
+        type=str,
+        help="Relative path to directory where you want to save your \
+            documentation with folders 'html/', 'latex/', ...",
+        required=True,
+    )
+    parser.add_argument(
+        "--uml-output",
+        type=str,
+        default="uml",
+        help="Relative path to directory where you want to save your UML diagrams",
+    )
+    _add_docs_options(parser)
+    parser.add_argument(
+        "--docs-engine",
+        type=str,
+        default="inprocess",
+        choices=["inprocess", "subprocess"],
+        help="Run doxypypy as a library inside long-lived processes or spawn the \
+            doxypypy executable once per file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the preprocessed sources between runs and only convert changed \
+            files.",
+    )
+    _add_uml_options(parser, "--uml-engine")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory to persist parsed imports between runs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files converted and diagrams generated in parallel by each \
+            of the two pipelines.",
+    )
+    _add_discovery_options(parser)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timeout in seconds for every external command. Unlimited if not set.",
+    )
+    return parser
+
+
+def setup_parser_watch(parser: ArgumentParser) -> ArgumentParser:
+    """setup parser for watch command
+
+    Args:
+        parser (ArgumentParser): parser object
+
+    Returns:
+        ArgumentParser: setup parser object
+    """
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        type=str,
+        help="Collection of paths to the files you want to document",
+        required=True,
+    )
+    parser.add_argument(
+        "--docs-output",
+        type=str,
+        help="Relative path to directory for the doxygen documentation. Docs are \
+            not generated if not set.",
+    )
+    parser.add_argument(
+        "--uml-output",
+        type=str,
+        help="Relative path to directory for the UML diagrams. Diagrams are not \
+            generated if not set.",
+    )
+    _add_docs_options(parser)
+    _add_uml_options(parser, "--uml-engine")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files converted or diagrams generated in parallel.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between two polls of the input directories.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.5,
+        help="Seconds without further changes before regenerating, so a burst of \
+            saves triggers a single run.",
+    )
+    _add_discovery_options(parser, "watch")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Timeout in seconds for every external command. Unlimited if not set.",
+    )
+    return parser
+
+
+def setup_parser_graph(parser: ArgumentParser) -> ArgumentParser:
+    """setup parser for graph command
+
+    Args:
+        parser (ArgumentParser): parser object
+
+    Returns:
+        ArgumentParser: setup parser object
+    """
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        type=str,
+        help="Collection of paths to the files whose imports you want to analyse",
+        required=True,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="graph",
+        help="Relative path to the directory the files 'imports.<format>' are \
+            written to",
     )
     parser.add_argument(
         "--format",
+        nargs="+",
         type=str,
-        default="png",
-        choices=["png", "jpg", "puml", "plantuml", "dot", "gv", "mmd", "html"],
-        help="Output format for uml diagrams. *.<format>",
+        default=["json"],
+        choices=["json", "graphml", "dot"],
+        help="Export formats of the import graph. Every module carries its fan-in, \
+            fan-out, transitive closure size, longest chain length and cycle.",
     )
     parser.add_argument(
-        "--colorized",
+        "--top",
+        type=int,
+        default=20,
+        help="Number of modules listed per metric in the printed summary.",
+    )
+    parser.add_argument(
+        "--source-root",
+        dest="source_roots",
+        nargs="+",
+        type=str,
+        default=[],
+        help="Additional directories imports are resolved against.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory to persist parsed imports between runs.",
+    )
+    _add_discovery_options(parser, "analyse")
+    return parser
+
+
+def setup_parser_check_docs(parser: ArgumentParser) -> ArgumentParser:
+    """setup parser for check-docs command
+
+    Args:
+        parser (ArgumentParser): parser object
+
+    Returns:
+        ArgumentParser: setup parser object
+    """
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        type=str,
+        help="Collection of paths to the files whose docstrings you want to check",
+        required=True,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the report file. The report is printed if not set.",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="text",
+        choices=["text", "json"],
+        help="Format of the report.",
+    )
+    parser.add_argument(
+        "--fail-under",
+        type=float,
+        help="Exit with code 1 if less than this percentage of the public modules, \
+            classes and functions have a complete docstring.",
+    )
+    parser.add_argument(
+        "--include-private",
         action="store_true",
-        help="Flag activates colorized UML generation",
+        help="Also check definitions whose name starts with '_'.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory to persist the results per file content between runs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes parsing files which are not cached.",
+    )
+    _add_discovery_options(parser, "check")
     return parser
 
 
@@ -107,6 +667,13 @@ def setup_parser(parser: ArgumentParser) -> ArgumentParser:
     )
     parser_generate_docs = setup_parser_generate_docs(parser_generate_docs)
 
+    parser_merge = sub_parser.add_parser(
+        "merge",
+        help="Merge the docs of 'generate-docs --shard' runs into one site",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser_merge = setup_parser_merge(parser_merge)
+
     parser_generate_uml = sub_parser.add_parser(
         "generate-uml",
         help="Generate UML diagrams",
@@ -114,6 +681,35 @@ def setup_parser(parser: ArgumentParser) -> ArgumentParser:
     )
     parser_generate_uml = setup_parser_generate_uml(parser_generate_uml)
 
+    parser_generate_all = sub_parser.add_parser(
+        "generate-all",
+        help="Generate Doxygen-style documentation and UML diagrams concurrently",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser_generate_all = setup_parser_generate_all(parser_generate_all)
+
+    parser_watch = sub_parser.add_parser(
+        "watch",
+        help="Regenerate docs and UML diagrams whenever a python file changes",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser_watch = setup_parser_watch(parser_watch)
+
+    parser_graph = sub_parser.add_parser(
+        "graph",
+        help="Export the import graph of the local modules with metrics",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser_graph = setup_parser_graph(parser_graph)
+
+    parser_check_docs = sub_parser.add_parser(
+        "check-docs",
+        help="Report docstring coverage and docstrings not matching the signature",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser_check_docs = setup_parser_check_docs(parser_check_docs)
+
+    parser.add_argument("--version", action=VersionAction)
     parser.add_argument(
         "--log-level",
         choices=["critical", "error", "warning", "info", "debug", "notset"],
@@ -121,5 +717,22 @@ def setup_parser(parser: ArgumentParser) -> ArgumentParser:
         help="sets log level",
         default="warning",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write durations of all stages, counters, executed commands and peak \
+            memory as json report to --profile-output.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default="pydoxyuml_profile.json",
+        help="Path of the json report written with --profile.",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        help="Dump cProfile statistics of the in-process parts into this file.",
+    )
 
     return parser
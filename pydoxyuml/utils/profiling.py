@@ -0,0 +1,156 @@
+"""Module provides a lightweight profiler for the stages of a documenter run"""
+
+from contextlib import contextmanager
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Union
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on windows
+    resource = None
+
+thread_time = getattr(time, "thread_time", time.process_time)
+"""Callable[[], float]: cpu time of the calling thread. Before python 3.7 the cpu
+time of the whole process"""
+
+
+def peak_rss() -> Dict[str, Union[None, int]]:
+    """peak resident set size of this process and its terminated children
+
+    Returns:
+        Dict[str, Union[None, int]]: peak RSS in bytes for 'self' and 'children'.
+            None if not available on this platform
+    """
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss is given in bytes on macOS and in kilobytes everywhere else
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+class Profiler:
+    """records duration of stages, counters and executed commands of a run
+
+    A disabled profiler only keeps the counters, so documenters can be
+    instrumented unconditionally.
+    """
+
+    def __init__(
+        self, enabled: bool = False, cprofile_path: Union[None, str] = None
+    ) -> None:
+        self.enabled = enabled
+        """bool: record stages"""
+        self._cprofile_path = cprofile_path
+        """Union[None, str]: where to dump the cProfile statistics. None -> off"""
+        self._cprofile: Union[None, cProfile.Profile] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: List[Dict[str, Any]] = []
+        """List[Dict[str, Any]]: name, start offset, wall and cpu time per stage"""
+        self.counters: Dict[str, int] = {}
+        """Dict[str, int]: counted items like files or commands"""
+        self._runners: List[Any] = []
+        """List[CommandRunner]: runners whose commands are part of the report"""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """measures wall and cpu time of the enclosed block
+
+        Args:
+            name (str): name of the stage like 'doxygen'
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        cpu_start = thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                "name": name,
+                "start": start - self._start,
+                "wall_time": time.perf_counter() - start,
+                "cpu_time": thread_time() - cpu_start,
+            }
+            with self._lock:
+                self.stages.append(record)
+            logging.debug(f"stage {name} took {record['wall_time']:.3f}s")
+
+    def count(self, name: str, value: int = 1):
+        """increases a counter
+
+        Args:
+            name (str): name of the counter like 'python_files'
+            value (int, optional): increment. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_runner(self, runner: Any):
+        """includes the commands of a CommandRunner in the report
+
+        Args:
+            runner (CommandRunner): runner executing external commands
+        """
+        self._runners.append(runner)
+
+    def start(self):
+        """starts cProfile for the in-process parts of the calling thread"""
+        self._start = time.perf_counter()
+        if self._cprofile_path is not None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        """stops cProfile and dumps its statistics"""
+        if self._cprofile is None:
+            return
+        self._cprofile.disable()
+        self._cprofile.dump_stats(self._cprofile_path)
+        logging.info(f"wrote cProfile statistics to {self._cprofile_path}")
+        self._cprofile = None
+
+    def report(self) -> Dict[str, Any]:
+        """collects all measurements in a json serializable report
+
+        Returns:
+            Dict[str, Any]: total time, stages, counters, commands and peak RSS
+        """
+        commands: Dict[str, Dict[str, Any]] = {}
+        for runner in self._runners:
+            for result in runner.history:
+                summary = commands.setdefault(
+                    os.path.basename(result.command[0]),
+                    {"count": 0, "failed": 0, "wall_time": 0.0, "cpu_time": 0.0},
+                )
+                summary["count"] += 1
+                summary["failed"] += 0 if result.ok else 1
+                summary["wall_time"] += result.wall_time
+                summary["cpu_time"] += result.cpu_time
+        return {
+            "total_time": time.perf_counter() - self._start,
+            "stages": sorted(self.stages, key=lambda x: x["start"]),
+            "counters": dict(sorted(self.counters.items())),
+            "commands": commands,
+            "peak_rss": peak_rss(),
+        }
+
+    def write_report(self, path: str):
+        """writes the report as json file
+
+        Args:
+            path (str): path to json file
+        """
+        with open(path, "w", encoding="UTF-8") as file:
+            json.dump(self.report(), file, indent=2)
+        logging.info(f"wrote profile report to {path}")
@@ -0,0 +1,192 @@
+"""Module provides a watcher which regenerates documentation on file changes"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from pydoxyuml.generate_uml import UMLDocumenter
+from pydoxyuml.genreate_doxy_doc import DoxyDocumenter
+from pydoxyuml.utils.cache import file_signature
+from pydoxyuml.utils.discovery import discover_sources
+from pydoxyuml.utils.profiling import Profiler
+
+
+class Watcher:
+    """polls the input roots and regenerates docs and UML diagrams on changes
+
+    Doxygen documentation is built incrementally, so only changed files are
+    converted by doxypypy. Only UML diagrams whose import closure contains a
+    changed file are generated again.
+    """
+
+    def __init__(
+        self,
+        input: List[str],
+        docs_output: Union[None, str] = None,
+        uml_output: Union[None, str] = None,
+        doxyfile: Union[None, str] = None,
+        title: str = "Example Project",
+        style_sheet: Union[None, str] = None,
+        doxy_set: Iterable[str] = (),
+        threads: Union[None, int] = None,
+        outputs: Union[None, List[str]] = None,
+        preset: Union[None, str] = None,
+        preprocess: str = "tmp",
+        format: Union[str, List[str]] = "png",
+        colorized: bool = False,
+        recursion_depth: int = 1,
+        source_roots: Iterable[str] = (),
+        batch_size: Union[None, int] = None,
+        per_package: bool = False,
+        uml_engine: str = "pyreverse",
+        jobs: int = 1,
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        exclude: Iterable[str] = (),
+        gitignore: bool = True,
+        timeout: Union[None, float] = None,
+        profiler: Union[None, Profiler] = None,
+    ) -> None:
+        self._input = input
+        """List[str]: list of input module root directories"""
+        self._interval = interval
+        """float: seconds between two polls of the input roots"""
+        self._debounce = debounce
+        """float: seconds the inputs have to be unchanged before regenerating"""
+        self._exclude = list(exclude)
+        self._gitignore = gitignore
+        self._docs: Union[None, DoxyDocumenter] = None
+        """Union[None, DoxyDocumenter]: incremental doxygen documenter. None -> off"""
+        if docs_output is not None:
+            self._docs = DoxyDocumenter(
+                input,
+                docs_output,
+                doxyfile,
+                title,
+                style_sheet,
+                jobs=jobs,
+                incremental=True,
+                timeout=timeout,
+                profiler=profiler,
+                exclude=exclude,
+                gitignore=gitignore,
+                doxy_set=doxy_set,
+                threads=threads,
+                outputs=outputs,
+                preset=preset,
+                preprocess=preprocess,
+            )
+        self._uml: Union[None, UMLDocumenter] = None
+        """Union[None, UMLDocumenter]: diagram documenter. None -> off"""
+        if uml_output is not None:
+            self._uml = UMLDocumenter(
+                input,
+                uml_output,
+                format,
+                colorized,
+                recursion_depth,
+                engine=uml_engine,
+                jobs=jobs,
+                timeout=timeout,
+                profiler=profiler,
+                exclude=exclude,
+                gitignore=gitignore,
+                source_roots=source_roots,
+                batch_size=batch_size,
+                per_package=per_package,
+            )
+
+    def __call__(self) -> None:
+        """generates everything once and regenerates on changes until interrupted"""
+        snapshot = self._snapshot()
+        self._run(self._docs)
+        self._run(self._uml)
+        logging.info(f"watching {' '.join(self._input)} for changes, Ctrl+C stops")
+        try:
+            while True:
+                time.sleep(self._interval)
+                current = self._snapshot()
+                if current == snapshot:
+                    continue
+                current = self._settle(current)
+                changed = sorted(
+                    path
+                    for path in current.keys() | snapshot.keys()
+                    if current.get(path) != snapshot.get(path)
+                )
+                structural = current.keys() != snapshot.keys()
+                snapshot = current
+                self._regenerate(changed, structural)
+        except KeyboardInterrupt:
+            logging.info("stopped watching")
+
+    def _regenerate(self, changed: List[str], structural: bool):
+        """regenerates the outputs affected by changed files
+
+        Args:
+            changed (List[str]): modified, added or removed python files
+            structural (bool): files were added or removed
+        """
+        logging.info(f"{len(changed)} files changed: {' '.join(changed)}")
+        start = time.perf_counter()
+        if self._docs is not None:
+            self._docs.refresh()
+            self._run(self._docs)
+        if self._uml is not None:
+            diagrams = self._run(lambda: self._uml.update(changed, structural))
+            logging.info(f"regenerated {diagrams or 0} uml diagrams")
+        logging.info(f"regenerated in {time.perf_counter() - start:.2f}s")
+
+    def _settle(
+        self, snapshot: Dict[str, Tuple[int, int]]
+    ) -> Dict[str, Tuple[int, int]]:
+        """waits until a burst of changes is over
+
+        Args:
+            snapshot (Dict[str, Tuple[int, int]]): first snapshot of the burst
+
+        Returns:
+            Dict[str, Tuple[int, int]]: snapshot which stayed unchanged for the
+                debounce period
+        """
+        while True:
+            time.sleep(self._debounce)
+            latest = self._snapshot()
+            if latest == snapshot:
+                return snapshot
+            snapshot = latest
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """signatures of all python files of the inputs
+
+        Returns:
+            Dict[str, Tuple[int, int]]: modification time and size per file
+        """
+        index = discover_sources(self._input, self._exclude, self._gitignore)
+        snapshot = {}
+        for path in index.all_files():
+            try:
+                snapshot[path] = file_signature(path)
+            except OSError:
+                # removed between discovery and stat -> picked up by the next poll
+                continue
+        return snapshot
+
+    @staticmethod
+    def _run(generator: Union[None, Callable[[], Any]]) -> Any:
+        """calls a documenter and logs instead of raising errors
+
+        Args:
+            generator (Union[None, Callable[[], Any]]): documenter or function to
+                call. None is skipped
+
+        Returns:
+            Any: result of the call. None if it failed
+        """
+        if generator is None:
+            return None
+        try:
+            return generator()
+        except Exception as exception:  # pylint: disable=broad-except
+            logging.error(f"{type(exception).__name__}: {exception}")
+        return None
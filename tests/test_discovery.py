@@ -0,0 +1,126 @@
+"""Tests of the gitignore handling and the source discovery"""
+
+import os
+
+from pydoxyuml.utils.discovery import (
+    GitIgnoreRule,
+    discover_sources,
+    is_ignored,
+    load_gitignore,
+    walk_sources,
+)
+
+
+def write(path, content=""):
+    """writes a file and creates its parent directories
+
+    Args:
+        path (pathlib.Path): path of the file
+        content (str, optional): content of the file. Defaults to "".
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="UTF-8")
+
+
+def relative(paths, root):
+    """converts paths into sorted '/' separated paths relative to a root
+
+    Args:
+        paths (List[str]): absolute or root based paths
+        root (pathlib.Path): root directory
+
+    Returns:
+        List[str]: relative paths
+    """
+    return sorted(os.path.relpath(x, root).replace(os.sep, "/") for x in paths)
+
+
+def test_rule_flags():
+    rule = GitIgnoreRule.parse("!build/", "/project")
+    assert rule.negated
+    assert rule.directory_only
+    assert not rule.anchored
+    assert GitIgnoreRule.parse("/docs/*.py", "/project").anchored
+
+
+def test_directory_only_rule_skips_files(tmp_path):
+    write(tmp_path / ".gitignore", "build/\n")
+    rules = load_gitignore(str(tmp_path))
+    assert is_ignored(str(tmp_path / "build"), True, rules)
+    assert not is_ignored(str(tmp_path / "build"), False, rules)
+    assert is_ignored(str(tmp_path / "pkg" / "build"), True, rules)
+
+
+def test_negation_reincludes_files(tmp_path):
+    write(tmp_path / ".gitignore", "*_gen.py\n!keep_gen.py\n")
+    rules = load_gitignore(str(tmp_path))
+    assert is_ignored(str(tmp_path / "a_gen.py"), False, rules)
+    assert not is_ignored(str(tmp_path / "keep_gen.py"), False, rules)
+    assert not is_ignored(str(tmp_path / "a.py"), False, rules)
+
+
+def test_last_matching_rule_wins(tmp_path):
+    write(tmp_path / ".gitignore", "!keep.py\n*.py\n")
+    rules = load_gitignore(str(tmp_path))
+    assert is_ignored(str(tmp_path / "keep.py"), False, rules)
+
+
+def test_anchored_rule_only_matches_below_base(tmp_path):
+    write(tmp_path / ".gitignore", "/gen/*.py\n")
+    rules = load_gitignore(str(tmp_path))
+    assert is_ignored(str(tmp_path / "gen" / "a.py"), False, rules)
+    assert not is_ignored(str(tmp_path / "pkg" / "gen" / "a.py"), False, rules)
+
+
+def test_walk_sources_honours_gitignore(tmp_path):
+    write(tmp_path / ".gitignore", "build/\n*_gen.py\n")
+    write(tmp_path / "pkg" / "__init__.py")
+    write(tmp_path / "pkg" / "mod.py")
+    write(tmp_path / "pkg" / "mod_gen.py")
+    write(tmp_path / "pkg" / "build" / "out.py")
+    write(tmp_path / "pkg" / "sub" / ".gitignore", "!keep_gen.py\n")
+    write(tmp_path / "pkg" / "sub" / "keep_gen.py")
+    write(tmp_path / "pkg" / "sub" / "other_gen.py")
+
+    files, packages = walk_sources(str(tmp_path))
+    assert relative(files, tmp_path) == [
+        "pkg/__init__.py",
+        "pkg/mod.py",
+        "pkg/sub/keep_gen.py",
+    ]
+    assert relative(packages, tmp_path) == ["pkg"]
+
+    files, _ = walk_sources(str(tmp_path), gitignore=False)
+    assert len(files) == 6
+
+
+def test_negation_cannot_reinclude_files_of_ignored_directory(tmp_path):
+    write(tmp_path / ".gitignore", "build/\n!build/keep.py\n")
+    write(tmp_path / "build" / "keep.py")
+    write(tmp_path / "mod.py")
+    files, _ = walk_sources(str(tmp_path))
+    assert relative(files, tmp_path) == ["mod.py"]
+
+
+def test_exclude_globs_and_default_excludes(tmp_path):
+    write(tmp_path / "pkg" / "__init__.py")
+    write(tmp_path / "pkg" / "tests" / "test_mod.py")
+    write(tmp_path / "pkg" / "__pycache__" / "mod.py")
+    write(tmp_path / "pkg" / "mod_pb2.py")
+    files, _ = walk_sources(str(tmp_path), exclude=["tests", "*_pb2.py"])
+    assert relative(files, tmp_path) == ["pkg/__init__.py"]
+
+
+def test_discover_sources_module_names(tmp_path):
+    write(tmp_path / "pkg" / "__init__.py")
+    write(tmp_path / "pkg" / "sub" / "__init__.py")
+    write(tmp_path / "pkg" / "sub" / "mod.py")
+    root = str(tmp_path / "pkg")
+    index = discover_sources([root, root])
+    assert index.roots == [root]
+    assert sorted(index.modules) == ["pkg", "pkg.sub", "pkg.sub.mod"]
+    assert relative(index.package_files(root), tmp_path) == [
+        "pkg/__init__.py",
+        "pkg/sub/__init__.py",
+        "pkg/sub/mod.py",
+    ]
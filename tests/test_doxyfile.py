@@ -0,0 +1,113 @@
+"""Tests of the Doxyfile model"""
+
+import pytest
+
+from pydoxyuml.doxyfile import Doxyfile, parse_assignment, quote
+
+
+TEXT = r"""# Project related configuration options
+@INCLUDE               = base.cfg
+
+PROJECT_NAME           = "My Project"
+INPUT                  = src/a.py \
+                         src/b.py \
+                         "src/with space.py"
+FILE_PATTERNS          = *.py
+FILE_PATTERNS         += *.pyi
+EXCLUDE_PATTERNS      += */tests/* \
+                         */build/*
+EMPTY                  =
+"""
+
+
+def test_parse_joins_continuation_lines():
+    doxyfile = Doxyfile.parse(TEXT)
+    assert doxyfile["PROJECT_NAME"] == '"My Project"'
+    assert doxyfile["INPUT"] == 'src/a.py src/b.py "src/with space.py"'
+    assert doxyfile["EMPTY"] == ""
+    assert list(doxyfile) == ["PROJECT_NAME", "INPUT", "FILE_PATTERNS", "EMPTY"]
+
+
+def test_append_extends_set_keys():
+    doxyfile = Doxyfile.parse(TEXT)
+    assert doxyfile["FILE_PATTERNS"] == "*.py *.pyi"
+    doxyfile.assign("FILE_PATTERNS+=*.pyx")
+    assert doxyfile["FILE_PATTERNS"] == "*.py *.pyi *.pyx"
+
+
+def test_append_to_unset_key_is_rendered_as_append():
+    doxyfile = Doxyfile.parse(TEXT)
+    assert "EXCLUDE_PATTERNS" not in doxyfile
+    doxyfile.append("EXCLUDE_PATTERNS", "*/docs/*")
+    rendered = doxyfile.render()
+    assert "EXCLUDE_PATTERNS      += */tests/* */build/* */docs/*\n" in rendered
+    assert "EXCLUDE_PATTERNS       =" not in rendered
+
+
+def test_assignment_replaces_pending_append():
+    doxyfile = Doxyfile.parse(TEXT)
+    doxyfile.assign("EXCLUDE_PATTERNS=*/docs/*")
+    assert doxyfile["EXCLUDE_PATTERNS"] == "*/docs/*"
+    assert "EXCLUDE_PATTERNS      +=" not in doxyfile.render()
+
+
+def test_render_parse_round_trip():
+    doxyfile = Doxyfile.parse(TEXT)
+    rendered = doxyfile.render()
+    assert rendered.startswith("@INCLUDE = base.cfg\n")
+    reparsed = Doxyfile.parse(rendered)
+    assert reparsed.render() == rendered
+    assert {key: reparsed[key] for key in reparsed} == {
+        key: doxyfile[key] for key in doxyfile
+    }
+
+
+def test_round_trip_through_file(tmp_path):
+    path = str(tmp_path / "Doxyfile")
+    doxyfile = Doxyfile.parse(TEXT)
+    doxyfile.write(path)
+    assert Doxyfile.load(path).render() == doxyfile.render()
+
+
+def test_remove_unsets_entries_and_appends():
+    doxyfile = Doxyfile.parse(TEXT)
+    doxyfile.remove("INPUT")
+    doxyfile.remove("EXCLUDE_PATTERNS")
+    doxyfile.remove("UNKNOWN")
+    rendered = doxyfile.render()
+    assert "INPUT" not in rendered
+    assert "EXCLUDE_PATTERNS" not in rendered
+
+
+def test_template_returns_independent_copies():
+    first = Doxyfile.template()
+    first["PROJECT_NAME"] = "changed"
+    first.append("INPUT", "extra.py")
+    second = Doxyfile.template()
+    assert second.get("PROJECT_NAME") != "changed"
+    assert "extra.py" not in second.get("INPUT")
+
+
+def test_quote():
+    assert quote("plain") == "plain"
+    assert quote("with space") == '"with space"'
+    assert quote('"already quoted"') == '"already quoted"'
+
+
+@pytest.mark.parametrize(
+    "assignment, expected",
+    [
+        ("KEY=VALUE", ("KEY", "=", "VALUE")),
+        ("KEY+=VALUE", ("KEY", "+=", "VALUE")),
+        (" KEY = a b ", ("KEY", "=", "a b")),
+        ("KEY=", ("KEY", "=", "")),
+    ],
+)
+def test_parse_assignment(assignment, expected):
+    assert parse_assignment(assignment) == expected
+
+
+@pytest.mark.parametrize("assignment", ["KEY", "=VALUE", "A KEY=VALUE", "+=VALUE"])
+def test_parse_assignment_rejects_malformed(assignment):
+    with pytest.raises(ValueError):
+        parse_assignment(assignment)
@@ -0,0 +1,182 @@
+"""Tests of the module resolution and the import graph"""
+
+import os
+
+import pytest
+
+from pydoxyuml.import_graph import (
+    ImportGraph,
+    ModuleResolver,
+    absolute_module,
+    package_of,
+    strongly_connected_components,
+)
+from pydoxyuml.utils.cache import SourceCache
+
+
+def write(path, content=""):
+    """writes a file and creates its parent directories
+
+    Args:
+        path (pathlib.Path): path of the file
+        content (str, optional): content of the file. Defaults to "".
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="UTF-8")
+
+
+@pytest.fixture
+def project(tmp_path):
+    """regular package 'pkg' with a subpackage and a namespace package 'ns'
+
+    Returns:
+        pathlib.Path: directory containing both packages
+    """
+    write(tmp_path / "pkg" / "__init__.py")
+    write(tmp_path / "pkg" / "core.py")
+    write(tmp_path / "pkg" / "sub" / "__init__.py")
+    write(tmp_path / "pkg" / "sub" / "helpers.py")
+    write(tmp_path / "ns" / "part" / "mod.py")
+    write(tmp_path / "single.py")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "package, module, level, expected",
+    [
+        ("pkg.sub", "os", 0, "os"),
+        ("pkg.sub", "helpers", 1, "pkg.sub.helpers"),
+        ("pkg.sub", "core", 2, "pkg.core"),
+        ("pkg.sub", None, 2, "pkg"),
+        ("pkg", None, 1, "pkg"),
+        ("pkg", "core", 3, None),
+        ("", "mod", 1, "mod"),
+    ],
+)
+def test_absolute_module(package, module, level, expected):
+    assert absolute_module(package, module, level) == expected
+
+
+def test_package_of():
+    assert package_of("pkg.sub", os.path.join("pkg", "sub", "__init__.py")) == (
+        "pkg.sub"
+    )
+    assert package_of("pkg.sub.helpers", os.path.join("pkg", "sub", "helpers.py")) == (
+        "pkg.sub"
+    )
+
+
+def test_resolver_finds_absolute_and_relative_imports(project):
+    resolver = ModuleResolver([str(project)])
+    core = os.path.normpath(str(project / "pkg" / "core.py"))
+    assert resolver.find("pkg.core") == core
+    assert resolver.find("core", package="pkg.sub", level=2) == core
+    assert resolver.find("helpers", package="pkg.sub", level=1) == os.path.normpath(
+        str(project / "pkg" / "sub" / "helpers.py")
+    )
+    assert resolver.find(None, package="pkg.sub", level=1) == os.path.normpath(
+        str(project / "pkg" / "sub" / "__init__.py")
+    )
+    assert resolver.find("core", package="pkg", level=3) is None
+    assert resolver.find("single") == os.path.normpath(str(project / "single.py"))
+    assert resolver.find("os") is None
+
+
+def test_resolver_namespace_packages(project):
+    resolver = ModuleResolver([str(project)])
+    assert resolver.find("ns") is None
+    assert resolver.find("ns.part") is None
+    assert resolver.is_package("ns")
+    assert resolver.is_package("ns.part")
+    assert resolver.is_local("ns.part.mod")
+    assert resolver.find("ns.part.mod") == os.path.normpath(
+        str(project / "ns" / "part" / "mod.py")
+    )
+    assert not resolver.is_package("single")
+
+
+def test_resolver_order_of_search_paths(tmp_path):
+    write(tmp_path / "first" / "pkg" / "__init__.py")
+    write(tmp_path / "second" / "pkg" / "__init__.py")
+    write(tmp_path / "second" / "pkg" / "extra.py")
+    write(tmp_path / "second" / "mod" / "__init__.py")
+    write(tmp_path / "second" / "mod.py")
+    resolver = ModuleResolver([str(tmp_path / "first"), str(tmp_path / "second")])
+    assert resolver.find("pkg") == str(tmp_path / "first" / "pkg" / "__init__.py")
+    assert resolver.find("pkg.extra") == str(tmp_path / "second" / "pkg" / "extra.py")
+    # regular packages shadow modules of the same name
+    assert resolver.find("mod") == str(tmp_path / "second" / "mod" / "__init__.py")
+
+
+def test_resolver_clear_finds_added_files(project):
+    resolver = ModuleResolver([str(project)])
+    assert resolver.find("pkg.new") is None
+    write(project / "pkg" / "new.py")
+    assert resolver.find("pkg.new") is None
+    resolver.clear()
+    assert resolver.find("pkg.new") is not None
+
+
+def test_strongly_connected_components_cycle():
+    edges = {"a": ["b"], "b": ["c"], "c": ["a", "d"], "d": [], "e": ["a"]}
+    components = strongly_connected_components(["a", "b", "c", "d", "e"], edges)
+    assert [sorted(component) for component in components] == [
+        ["d"],
+        ["a", "b", "c"],
+        ["e"],
+    ]
+
+
+def test_strongly_connected_components_without_cycles():
+    edges = {"a": ["b", "c"], "b": ["c"]}
+    components = strongly_connected_components(["a", "b", "c"], edges)
+    assert components == [["c"], ["b"], ["a"]]
+
+
+def test_strongly_connected_components_long_chain():
+    nodes = [str(x) for x in range(5000)]
+    edges = {
+        node: [nodes[(index + 1) % len(nodes)]] for index, node in enumerate(nodes)
+    }
+    components = strongly_connected_components(nodes, edges)
+    assert len(components) == 1
+    assert sorted(components[0]) == sorted(nodes)
+
+
+def test_import_graph_edges_and_cycles(tmp_path, monkeypatch):
+    write(tmp_path / "pkg" / "__init__.py", "from .a import A\n")
+    write(tmp_path / "pkg" / "a.py", "from . import b\nclass A:\n    pass\n")
+    write(tmp_path / "pkg" / "b.py", "from pkg.c import C\nimport os\n")
+    write(tmp_path / "pkg" / "c.py", "from .a import A\nclass C(A):\n    pass\n")
+    monkeypatch.chdir(tmp_path)
+
+    graph = ImportGraph(["."], SourceCache())
+    modules = [
+        graph.add_file(os.path.join("pkg", name))
+        for name in ["__init__.py", "a.py", "b.py", "c.py"]
+    ]
+    assert modules == ["pkg", "pkg.a", "pkg.b", "pkg.c"]
+    assert graph.imports("pkg") == ["pkg.a"]
+    assert graph.imports("pkg.a") == ["pkg.b"]
+    assert graph.imports("pkg.b") == ["pkg.c"]
+    assert graph.closure(["pkg"], 2) == ["pkg.a", "pkg.b"]
+    # only modules whose imports were requested take part in cycles
+    assert graph.cycles() == []
+    assert graph.imports("pkg.c") == ["pkg.a"]
+    assert graph.cycles() == [["pkg.a", "pkg.b", "pkg.c"]]
+    assert graph.module_of(str(tmp_path / "pkg" / "a.py")) == "pkg.a"
+
+
+def test_import_graph_invalidate(tmp_path, monkeypatch):
+    write(tmp_path / "pkg" / "__init__.py")
+    write(tmp_path / "pkg" / "a.py", "from pkg import b\n")
+    write(tmp_path / "pkg" / "b.py")
+    monkeypatch.chdir(tmp_path)
+
+    graph = ImportGraph(["."], SourceCache())
+    graph.add_file(os.path.join("pkg", "a.py"))
+    assert graph.imports("pkg.a") == ["pkg.b"]
+    write(tmp_path / "pkg" / "a.py", "import pkg\n")
+    # absolute and relative paths of a file invalidate the same module
+    graph.invalidate([str(tmp_path / "pkg" / "a.py")])
+    assert graph.imports("pkg.a") == ["pkg"]